@@ -1,12 +1,121 @@
 from __future__ import annotations
 
-from collections.abc import Generator
+import asyncio
+from collections.abc import AsyncGenerator, Callable
+from contextlib import asynccontextmanager
+from contextvars import ContextVar
+from typing import Concatenate, ParamSpec, TypeVar
+from weakref import WeakKeyDictionary
 
+from fastapi import Request
+from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import Session
+from starlette.concurrency import run_in_threadpool
 
-from db.session import get_db
+from core.config import settings
+from db.pool import InstrumentedQueuePool
+from db.session import SessionLocal, engine, get_async_db
+from engines.ai.cache import ResponseCache
+from engines.ai.client import GeminiClient
+from engines.ai.context import ContextBuilder
+from engines.trading.backtest_jobs import BacktestRunner
+from engines.trading.portfolio import Portfolio
+from engines.trading.prices import PriceStore
+from engines.trading.snapshot import MarketSnapshot
 
+P = ParamSpec("P")
+T = TypeVar("T")
 
-def db_session() -> Generator[Session, None, None]:
-    yield from get_db()
+DbSession = Session | AsyncSession
 
+# Sync path: a session keeps its pooled connection from its first query until it closes,
+# including while it waits for a threadpool thread between run_db calls. With more
+# threads than connections, threads blocked on an empty pool can take every thread the
+# connection holders need, and nothing moves until pool_timeout. So sessions are
+# admitted on the event loop, at most one per pooled connection. A session opened
+# inside an admitted one (db_scope within a request) is not counted again, and a wait
+# that outlasts pool_timeout goes ahead unadmitted rather than failing here.
+_admitted: ContextVar[bool] = ContextVar("db_session_admitted", default=False)
+_session_slots: WeakKeyDictionary[asyncio.AbstractEventLoop, asyncio.Semaphore] = (
+    WeakKeyDictionary()
+)
+
+
+def _slots() -> asyncio.Semaphore | None:
+    if _admitted.get() or not isinstance(engine.pool, InstrumentedQueuePool):
+        return None
+    loop = asyncio.get_running_loop()
+    slots = _session_slots.get(loop)
+    if slots is None:
+        slots = asyncio.Semaphore(settings.db_pool_size + settings.db_max_overflow)
+        _session_slots[loop] = slots
+    return slots
+
+
+async def _admit(slots: asyncio.Semaphore) -> bool:
+    try:
+        await asyncio.wait_for(slots.acquire(), settings.db_pool_timeout)
+    except TimeoutError:
+        return False
+    return True
+
+
+async def db_session() -> AsyncGenerator[DbSession, None]:
+    if settings.database_async:
+        async for db in get_async_db():
+            yield db
+        return
+
+    slots = _slots()
+    admitted = slots is not None and await _admit(slots)
+    # Left set: the context belongs to this request (or to a task it spawned).
+    _admitted.set(True)
+    db = SessionLocal()
+    try:
+        yield db
+    finally:
+        db.close()
+        if admitted:
+            slots.release()
+
+
+# For code that outlives the request's dependencies, e.g. a streaming response body.
+db_scope = asynccontextmanager(db_session)
+
+
+async def run_db(
+    db: DbSession, fn: Callable[Concatenate[Session, P], T], *args: P.args, **kwargs: P.kwargs
+) -> T:
+    # Services are written once against a sync Session. On the async path they run on
+    # the AsyncSession's greenlet (no thread); otherwise they go to the threadpool.
+    if isinstance(db, AsyncSession):
+        return await db.run_sync(fn, *args, **kwargs)
+    return await run_in_threadpool(fn, db, *args, **kwargs)
+
+
+def gemini_client(request: Request) -> GeminiClient:
+    return request.app.state.gemini
+
+
+def ai_cache(request: Request) -> ResponseCache:
+    return request.app.state.ai_cache
+
+
+def ai_context(request: Request) -> ContextBuilder:
+    return request.app.state.ai_context
+
+
+def price_store(request: Request) -> PriceStore:
+    return request.app.state.prices
+
+
+def portfolio(request: Request) -> Portfolio:
+    return request.app.state.portfolio
+
+
+def market_snapshot(request: Request) -> MarketSnapshot:
+    return request.app.state.market
+
+
+def backtests(request: Request) -> BacktestRunner:
+    return request.app.state.backtests
@@ -0,0 +1,108 @@
+from __future__ import annotations
+
+import csv
+import io
+import json
+import zlib
+from collections.abc import Iterable, Iterator, Sequence
+from datetime import date, datetime
+from typing import Any
+
+from sqlalchemy import Row
+from starlette.responses import Response, StreamingResponse
+
+try:
+    import orjson
+except ImportError:  # optional: the stdlib encoder writes the same bytes, slower
+    orjson = None
+
+
+EXPORT_FORMATS = {"ndjson": "application/x-ndjson", "csv": "text/csv; charset=utf-8"}
+EXPORT_FORMAT_PATTERN = r"^(ndjson|csv)$"
+
+
+def _default(value: Any) -> Any:
+    if isinstance(value, datetime):
+        text = value.isoformat()
+        return text[:-6] + "Z" if text.endswith("+00:00") else text
+    if isinstance(value, date):
+        return value.isoformat()
+    raise TypeError(f"{type(value).__name__} is not JSON serializable")
+
+
+def dumps(content: Any) -> bytes:
+    # Same output as a pydantic response model for str/int/float/None/date/datetime values:
+    # compact, UTF-8, ISO datetimes with "Z" for UTC.
+    if orjson is not None:
+        return orjson.dumps(content, option=orjson.OPT_UTC_Z)
+    return json.dumps(
+        content, default=_default, ensure_ascii=False, allow_nan=False, separators=(",", ":")
+    ).encode()
+
+
+def row_dicts(rows: Sequence[Row]) -> list[dict[str, Any]]:
+    if not rows:
+        return []
+    fields = rows[0]._fields
+    return [dict(zip(fields, row, strict=True)) for row in rows]
+
+
+class RowsResponse(Response):
+    # For list endpoints that select plain columns: the rows go straight to JSON bytes,
+    # skipping the ORM and the pydantic models. The route's response_model still
+    # documents the shape, so whatever is passed here must already match it.
+    media_type = "application/json"
+
+    def render(self, content: Any) -> bytes:
+        return dumps(content)
+
+
+def _export_ndjson(rows: Iterable[Sequence[Any]], fields: Sequence[str]) -> Iterator[bytes]:
+    lines: list[bytes] = []
+    for row in rows:
+        lines.append(dumps(dict(zip(fields, row, strict=True))))
+        if len(lines) == 1000:
+            yield b"\n".join(lines) + b"\n"
+            lines = []
+    if lines:
+        yield b"\n".join(lines) + b"\n"
+
+
+def _export_csv(rows: Iterable[Sequence[Any]], fields: Sequence[str]) -> Iterator[bytes]:
+    # Dates and datetimes are written the way the JSON endpoints write them.
+    buffer = io.StringIO()
+    writer = csv.writer(buffer)
+    writer.writerow(fields)
+    for n, row in enumerate(rows, 1):
+        writer.writerow([_default(v) if isinstance(v, date) else v for v in row])
+        if n % 1000 == 0:
+            yield buffer.getvalue().encode()
+            buffer.seek(0)
+            buffer.truncate()
+    yield buffer.getvalue().encode()
+
+
+def _gzip(chunks: Iterable[bytes]) -> Iterator[bytes]:
+    compressor = zlib.compressobj(6, zlib.DEFLATED, 16 + zlib.MAX_WBITS)
+    for chunk in chunks:
+        out = compressor.compress(chunk)
+        if out:
+            yield out
+    yield compressor.flush()
+
+
+def export_response(
+    rows: Iterable[Sequence[Any]], fields: Sequence[str], name: str, fmt: str, gzip: bool
+) -> StreamingResponse:
+    # A download of every row, encoded ~1000 rows per chunk as `rows` is consumed, so
+    # memory stays flat if `rows` is streamed too (yield_per). gzip gives a .gz file
+    # rather than a Content-Encoding, so clients save it as is.
+    chunks = (_export_ndjson if fmt == "ndjson" else _export_csv)(rows, fields)
+    filename, media_type = f"{name}.{fmt}", EXPORT_FORMATS[fmt]
+    if gzip:
+        chunks, filename, media_type = _gzip(chunks), f"{filename}.gz", "application/gzip"
+    return StreamingResponse(
+        chunks,
+        media_type=media_type,
+        headers={"Content-Disposition": f'attachment; filename="{filename}"'},
+    )
@@ -1,11 +1,33 @@
 from __future__ import annotations
 
+import asyncio
 import json
+from collections.abc import AsyncIterator
+
 import httpx
-from fastapi import APIRouter
+from fastapi import APIRouter, Depends
+from fastapi.responses import StreamingResponse
 from pydantic import BaseModel
 
+from api.deps import (
+    DbSession,
+    ai_cache,
+    ai_context,
+    db_scope,
+    db_session,
+    gemini_client,
+    market_snapshot,
+    portfolio,
+    run_db,
+)
 from core.config import settings
+from engines.ai import tools
+from engines.ai.cache import ResponseCache, cache_key
+from engines.ai.client import GeminiClient, GeminiError, response_text
+from engines.ai.context import ContextBuilder
+from engines.ai.streaming import ToolCallSniffer
+from engines.trading.portfolio import Portfolio
+from engines.trading.snapshot import MarketSnapshot
 
 # --- IMPORT THE EYES (Data Sources) ---
 from api.routers.finance import finance_summary
@@ -17,24 +39,52 @@ class ChatRequest(BaseModel):
     message: str
 
 @router.get("/status")
-def ai_status() -> dict:
+def ai_status(
+    gemini: GeminiClient = Depends(gemini_client),
+    cache: ResponseCache = Depends(ai_cache),
+    context: ContextBuilder = Depends(ai_context),
+) -> dict:
     return {
         "assistant": "online",
-        "model": "gemini-flash-latest",
-        "capabilities": ["financial_vision", "task_creation"]
+        "model": settings.gemini_model,
+        "capabilities": ["financial_vision", "task_creation"],
+        "tools": tools.registry.names(),
+        "client": gemini.stats(),
+        "cache": cache.stats(),
+        "context": context.stats(),
     }
 
-@router.post("/chat")
-async def chat(payload: ChatRequest) -> dict:
-    if not settings.google_api_key:
-        return {"response": "System Error: API Key is missing in .env file."}
-
+async def _live_snapshot(
+    message: str, context: ContextBuilder, db: DbSession, book: Portfolio, market: MarketSnapshot
+) -> dict:
     # 1. FETCH LIVE DATA (The AI "Looks" at your dashboard)
-    try:
-        fin_data = finance_summary()
-        trad_data = positions()
-    except Exception as e:
-        return {"response": f"Internal Error reading financial data: {e}"}
+    # Finance and trading are read concurrently, trading on a session of its own.
+    async def trading() -> dict:
+        async with db_scope() as trading_db:
+            return (await positions(trading_db, book, market)).model_dump()
+
+    finance, trading_data = await asyncio.gather(finance_summary(db), trading())
+    # Only the tasks/projects relevant to this message, within the token budget. Writes
+    # made through other worker processes are pulled in from the change feed first.
+    await run_db(db, context.catch_up)
+    return {
+        "finance": finance,
+        "trading": trading_data,
+        "context": context.build(message).lines,
+    }
+
+
+def _build_request_body(message: str, snapshot: dict) -> dict:
+    fin_data = snapshot["finance"]
+    portfolio = ", ".join(
+        f"{p['symbol']} {p['qty']} @ {p['avg_price']}" for p in snapshot["trading"]["positions"]
+    )
+    related = "\n".join(f"    {line}" for line in snapshot["context"]) or "    (none)"
+    batch_example = (
+        '[{"tool": "create_task", "title": "Buy milk", "priority": 1}, '
+        '{"tool": "create_task", "title": "Book flights", "priority": 1}, '
+        '{"tool": "complete_task", "title": "Call Mom"}]'
+    )
 
     # 2. CREATE THE SYSTEM BRAIN
     # We teach it two things: 1) Read Data, 2) Use Tools
@@ -44,68 +94,175 @@ async def chat(payload: ChatRequest) -> dict:
     [LIVE DATA]
     - Cash: {fin_data['cash']['currency']} {fin_data['cash']['amount']}
     - Net Worth: {fin_data['net_worth']['currency']} {fin_data['net_worth']['amount']}
-    - Portfolio: {trad_data['positions']}
+    - Portfolio: {portfolio or "empty"}
+
+    [RELATED TASKS & PROJECTS]
+{related}
     
     [YOUR TOOLKIT]
     You can now ACTUALLY perform actions.
     
-    1. IF the user asks to "create", "add", "remind", or "schedule" a task:
-       You MUST reply with ONLY a JSON object (no other text).
-       Format: {{"tool": "create_task", "title": "The Task Title", "priority": 1}}
+    1. IF the user asks to create, add, remind, schedule, change or complete tasks:
+       You MUST reply with ONLY JSON (no other text): one tool object, or a JSON
+       array of tool objects when several actions are asked for.
+{tools.registry.prompt()}
        
     2. IF the user asks a question:
        Just answer normally using the live data.
        
     Example 1 User: "Add a task to call mom"
     Example 1 You: {{"tool": "create_task", "title": "Call Mom", "priority": 1}}
+    Example 2 User: "Add tasks to buy milk and book flights, and mark call mom as done"
+    Example 2 You: {batch_example}
     """
 
-    final_prompt = f"{system_context}\n\nUSER QUESTION: {payload.message}"
+    final_prompt = f"{system_context}\n\nUSER QUESTION: {message}"
 
-    api_key = settings.google_api_key.strip()
-    model_name = "gemini-flash-latest"
-    url = f"https://generativelanguage.googleapis.com/v1beta/models/{model_name}:generateContent?key={api_key}"
-    
-    request_body = {
+    return {
         "contents": [{
             "parts": [{"text": final_prompt}]
         }]
     }
 
+
+def _tool_summary(results: list[tools.ToolResult]) -> str:
+    if len(results) == 1:
+        return f"✅ Done! {results[0].message}"
+    lines = "\n".join(f"✅ {r.message}" for r in results)
+    return f"Done!\n{lines}"
+
+
+def _is_cacheable(answer: str) -> bool:
+    # Tool calls are actions, never answers to replay.
+    return not tools.parse_tool_calls(answer)
+
+
+@router.post("/chat")
+async def chat(
+    payload: ChatRequest,
+    gemini: GeminiClient = Depends(gemini_client),
+    cache: ResponseCache = Depends(ai_cache),
+    context: ContextBuilder = Depends(ai_context),
+    db: DbSession = Depends(db_session),
+    book: Portfolio = Depends(portfolio),
+    market: MarketSnapshot = Depends(market_snapshot),
+) -> dict:
+    if not gemini.configured:
+        return {"response": "System Error: API Key is missing in .env file."}
+
     try:
-        async with httpx.AsyncClient() as client:
-            response = await client.post(url, json=request_body, timeout=30.0)
-            
-            if response.status_code != 200:
-                return {"response": f"Google Error ({response.status_code}): {response.text}"}
-            
-            data = response.json()
-            answer_text = data["candidates"][0]["content"]["parts"][0]["text"].strip()
-
-            # --- THE AGENT LOGIC ---
-            # We check: Did the AI give us a JSON command?
-            if answer_text.startswith("{") and "create_task" in answer_text:
+        snapshot = await _live_snapshot(payload.message, context, db, book, market)
+        request_body = _build_request_body(payload.message, snapshot)
+    except Exception as e:
+        return {"response": f"Internal Error reading financial data: {e}"}
+
+    async def generate() -> str:
+        # Shared, pooled client from the app lifespan (retries + concurrency limit inside).
+        return response_text(await gemini.generate(request_body)).strip()
+
+    try:
+        # Same question + same live data: answered from cache, or joined onto an
+        # identical request that is already waiting on Gemini.
+        try:
+            answer_text = await cache.get_or_compute(
+                cache_key(payload.message, snapshot), generate, _is_cacheable
+            )
+        except GeminiError as e:
+            return {"response": f"Google Error ({e.status_code}): {e.body}"}
+
+        # --- THE AGENT LOGIC ---
+        # We check: Did the AI give us tool calls? They run in-process, in one transaction.
+        calls = tools.parse_tool_calls(answer_text)
+        if calls:
+            try:
+                results = await run_db(db, tools.registry.run, calls)
+            except tools.ToolError as e:
+                return {"response": f"I couldn't do that: {e}"}
+            return {"response": _tool_summary(results)}
+
+        # If no tool was used, just return the normal answer
+        return {"response": answer_text}
+
+    except Exception as e:
+        return {"response": f"Connection Error: {str(e)}"}
+
+
+def _sse(event: str, data: dict) -> str:
+    return f"event: {event}\ndata: {json.dumps(data)}\n\n"
+
+
+async def _stream_chat(
+    gemini: GeminiClient, cache: ResponseCache, key: str, request_body: dict
+) -> AsyncIterator[str]:
+    # Events: "delta" {text} as tokens arrive, "tool" {tool, message, task_id} per executed
+    # tool call, then "done" {response} or "error" {message}. If the client disconnects,
+    # Starlette cancels this generator and the upstream Gemini stream is closed with it.
+    # Cached answers replay instantly; streamed misses are not coalesced (each client
+    # gets its own token stream) but do fill the cache for the next asker.
+    cached = cache.lookup(key)
+    if cached is not None:
+        yield _sse("delta", {"text": cached})
+        yield _sse("done", {"response": cached})
+        return
+
+    sniffer = ToolCallSniffer()
+    answer = []
+    try:
+        async for chunk in gemini.stream_generate(request_body):
+            text = sniffer.feed(chunk)
+            if text:
+                answer.append(text)
+                yield _sse("delta", {"text": text})
+
+        calls, rest = sniffer.finish()
+        if calls:
+            # The request's own session is gone by the time the body streams.
+            async with db_scope() as db:
                 try:
-                    tool_cmd = json.loads(answer_text)
-                    
-                    # If valid command, let's EXECUTE it by calling our own API
-                    if tool_cmd.get("tool") == "create_task":
-                        new_task = {
-                            "title": tool_cmd["title"],
-                            "status": "todo",
-                            "priority": tool_cmd.get("priority", 1)
-                        }
-                        
-                        # Call the Productivity API (Loopback)
-                        await client.post("http://127.0.0.1:8000/productivity/tasks", json=new_task)
-                        
-                        return {"response": f"✅ Done! I have added '{tool_cmd['title']}' to your task list."}
-                except Exception as e:
-                    # If parsing failed, just return the text
-                    print(f"Tool execution failed: {e}")
-            
-            # If no tool was used, just return the normal answer
-            return {"response": answer_text}
+                    results = await run_db(db, tools.registry.run, calls)
+                except tools.ToolError as e:
+                    yield _sse("error", {"message": f"I couldn't do that: {e}"})
+                    return
+            for r in results:
+                yield _sse("tool", {"tool": r.name, "message": r.message, "task_id": r.task_id})
+            yield _sse("done", {"response": _tool_summary(results)})
+            return
+
+        if rest:
+            answer.append(rest)
+            yield _sse("delta", {"text": rest})
+        response = "".join(answer).strip()
+        cache.put(key, response)
+        yield _sse("done", {"response": response})
+    except GeminiError as e:
+        yield _sse("error", {"message": f"Google Error ({e.status_code}): {e.body}"})
+    except (httpx.HTTPError, ValueError) as e:
+        yield _sse("error", {"message": f"Connection Error: {e}"})
 
+
+@router.post("/chat/stream")
+async def chat_stream(
+    payload: ChatRequest,
+    gemini: GeminiClient = Depends(gemini_client),
+    cache: ResponseCache = Depends(ai_cache),
+    context: ContextBuilder = Depends(ai_context),
+    db: DbSession = Depends(db_session),
+    book: Portfolio = Depends(portfolio),
+    market: MarketSnapshot = Depends(market_snapshot),
+) -> StreamingResponse:
+    headers = {"Cache-Control": "no-cache", "X-Accel-Buffering": "no"}
+    if not gemini.configured:
+        error = _sse("error", {"message": "System Error: API Key is missing in .env file."})
+        return StreamingResponse(iter([error]), media_type="text/event-stream", headers=headers)
+    try:
+        snapshot = await _live_snapshot(payload.message, context, db, book, market)
+        request_body = _build_request_body(payload.message, snapshot)
     except Exception as e:
-        return {"response": f"Connection Error: {str(e)}"}
\ No newline at end of file
+        error = _sse("error", {"message": f"Internal Error reading financial data: {e}"})
+        return StreamingResponse(iter([error]), media_type="text/event-stream", headers=headers)
+    key = cache_key(payload.message, snapshot)
+    return StreamingResponse(
+        _stream_chat(gemini, cache, key, request_body),
+        media_type="text/event-stream",
+        headers=headers,
+    )
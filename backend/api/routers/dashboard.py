@@ -0,0 +1,109 @@
+from __future__ import annotations
+
+import asyncio
+import time
+from collections.abc import Awaitable, Callable
+from typing import Any
+
+from fastapi import APIRouter, Depends
+from pydantic import BaseModel
+
+from api.deps import (
+    ai_cache,
+    ai_context,
+    db_scope,
+    gemini_client,
+    market_snapshot,
+    portfolio,
+)
+from api.routers.ai import ai_status
+from api.routers.finance import finance_summary
+from api.routers.productivity import SummaryOut, productivity_summary
+from api.routers.trading import PositionsOut, positions
+from core.config import settings
+from core.logging import get_logger, log_event
+from engines.ai.cache import ResponseCache
+from engines.ai.client import GeminiClient
+from engines.ai.context import ContextBuilder
+from engines.trading.portfolio import Portfolio
+from engines.trading.snapshot import MarketSnapshot
+
+router = APIRouter(tags=["dashboard"])
+logger = get_logger("dashboard")
+
+# A section still running at its timeout is left to finish in the background, so its
+# session is closed by the code using it rather than under it; referenced until then.
+_stragglers: set[asyncio.Task] = set()
+
+
+class DashboardOut(BaseModel):
+    # A section that failed or timed out is null here and named in `errors`.
+    finance: dict[str, Any] | None = None
+    trading: PositionsOut | None = None
+    productivity: SummaryOut | None = None
+    ai: dict[str, Any] | None = None
+    errors: dict[str, str]
+    timings_ms: dict[str, float]
+
+
+def _finished(task: asyncio.Task) -> None:
+    _stragglers.discard(task)
+    if not task.cancelled() and task.exception() is not None:
+        logger.error("dashboard section failed after timeout", exc_info=task.exception())
+
+
+async def _section(
+    name: str, work: Callable[[], Awaitable[Any]], timeout: float
+) -> tuple[Any, str | None, float]:
+    started = time.perf_counter()
+    task = asyncio.ensure_future(work())
+    done, _ = await asyncio.wait({task}, timeout=timeout)
+    elapsed = round((time.perf_counter() - started) * 1000, 1)
+    if not done:
+        _stragglers.add(task)
+        task.add_done_callback(_finished)
+        log_event(logger, "dashboard_section_timeout", section=name, timeout=timeout)
+        return None, "timeout", elapsed
+    if task.exception() is not None:
+        logger.error("dashboard section %s failed", name, exc_info=task.exception())
+        return None, "error", elapsed
+    return task.result(), None, elapsed
+
+
+@router.get("/dashboard", response_model=DashboardOut)
+async def dashboard(
+    book: Portfolio = Depends(portfolio),
+    market: MarketSnapshot = Depends(market_snapshot),
+    gemini: GeminiClient = Depends(gemini_client),
+    cache: ResponseCache = Depends(ai_cache),
+    context: ContextBuilder = Depends(ai_context),
+) -> DashboardOut:
+    # Everything the page needs for first paint in one round trip. Sections run
+    # concurrently on their own sessions, so this takes as long as the slowest one (at
+    # most the section timeout), and one failing section does not fail the others.
+    async def finance() -> dict:
+        async with db_scope() as db:
+            return await finance_summary(db)
+
+    async def trading() -> PositionsOut:
+        async with db_scope() as db:
+            return await positions(db, book, market)
+
+    async def productivity() -> SummaryOut:
+        async with db_scope() as db:
+            return await productivity_summary(db)
+
+    async def ai() -> dict:
+        return ai_status(gemini, cache, context)
+
+    sections = {"finance": finance, "trading": trading, "productivity": productivity, "ai": ai}
+    timeout = settings.dashboard_section_timeout_seconds
+    results = await asyncio.gather(
+        *(_section(name, work, timeout) for name, work in sections.items())
+    )
+    out = dict(zip(sections, results, strict=True))
+    return DashboardOut(
+        **{name: value for name, (value, _, _) in out.items()},
+        errors={name: error for name, (_, error, _) in out.items() if error is not None},
+        timings_ms={name: elapsed for name, (_, _, elapsed) in out.items()},
+    )
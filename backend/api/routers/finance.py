@@ -1,24 +1,410 @@
 from __future__ import annotations
 
-import random
-from fastapi import APIRouter
+import io
+import json
+from collections.abc import Iterator
+from dataclasses import asdict
+from datetime import date, datetime
+from decimal import Decimal
+
+from fastapi import APIRouter, Depends, File, HTTPException, Query, Response, UploadFile, status
+from fastapi.responses import StreamingResponse
+from pydantic import BaseModel, Field
+
+from api.deps import DbSession, db_session, run_db
+from api.responses import EXPORT_FORMAT_PATTERN, export_response
+from core.config import settings
+from db.session import SessionLocal
+from engines.finance.imports import service as import_service
+from engines.finance.ledger import service as ledger_service
+from engines.finance.rollups import service as rollup_service
+from models.account import Account, AccountKind
+from models.transaction import Transaction
 
 router = APIRouter(prefix="/finance", tags=["finance"])
 
 
+class AccountOut(BaseModel):
+    id: str
+    name: str
+    kind: str
+    currency: str
+    balance: float
+    created_at: datetime | None = None
+    updated_at: datetime | None = None
+
+
+class AccountCreateIn(BaseModel):
+    name: str = Field(min_length=1, max_length=255)
+    kind: AccountKind = AccountKind.CASH
+    currency: str = Field(default=settings.finance_base_currency, min_length=3, max_length=3)
+    opening_balance: Decimal = Field(default=Decimal(0), max_digits=15, decimal_places=2)
+    opened_on: date | None = None
+
+
+class TransactionOut(BaseModel):
+    id: str
+    account_id: str
+    posted_on: date
+    amount: float
+    description: str | None = None
+    category: str | None = None
+    created_at: datetime | None = None
+    updated_at: datetime | None = None
+
+
+class TransactionCreateIn(BaseModel):
+    account_id: str
+    posted_on: date
+    amount: Decimal = Field(max_digits=15, decimal_places=2)
+    description: str | None = Field(default=None, max_length=500)
+    category: str | None = Field(default=None, max_length=64)
+
+
+class TransactionUpdateIn(BaseModel):
+    posted_on: date | None = None
+    amount: Decimal | None = Field(default=None, max_digits=15, decimal_places=2)
+    description: str | None = Field(default=None, max_length=500)
+    category: str | None = Field(default=None, max_length=64)
+
+
+class AccountBalanceOut(BaseModel):
+    id: str
+    name: str
+    kind: str
+    currency: str
+    balance: float
+
+
+class BalancesOut(BaseModel):
+    as_of: date
+    currency: str
+    cash: float
+    net_worth: float
+    accounts: list[AccountBalanceOut]
+
+
+class RollupOut(BaseModel):
+    month: str
+    category: str | None = None
+    inflow: float
+    outflow: float
+    net: float
+    count: int
+
+
+class RollupDriftOut(BaseModel):
+    account_id: str
+    category: str | None = None
+    month: str
+    expected: RollupOut
+    actual: RollupOut
+
+
+class RollupCheckOut(BaseModel):
+    ok: bool
+    groups: int
+    drift: list[RollupDriftOut]
+
+
+MONTH_PATTERN = r"^\d{4}-(0[1-9]|1[0-2])$"
+
+
+def _account_to_out(a: Account) -> AccountOut:
+    return AccountOut(
+        id=a.id,
+        name=a.name,
+        kind=a.kind,
+        currency=a.currency,
+        balance=ledger_service.from_cents(a.balance_cents),
+        created_at=a.created_at,
+        updated_at=a.updated_at,
+    )
+
+
+def _transaction_to_out(t: Transaction) -> TransactionOut:
+    return TransactionOut(
+        id=t.id,
+        account_id=t.account_id,
+        posted_on=t.posted_on,
+        amount=ledger_service.from_cents(t.amount_cents),
+        description=t.description,
+        category=t.category,
+        created_at=t.created_at,
+        updated_at=t.updated_at,
+    )
+
+
 @router.get("/summary")
-def finance_summary() -> dict:
-    # Base values
-    base_cash = 1250.75
-    base_nw = 15250.12
-    
-    # Create a random fluctuation between -2% and +2%
-    # This simulates "market movement" every time you load the page
-    market_mood = random.uniform(0.98, 1.02)
-    
+async def finance_summary(db: DbSession = Depends(db_session)) -> dict:
+    s = await run_db(db, ledger_service.summary, settings.finance_base_currency)
     return {
-        "cash": {"currency": "USD", "amount": round(base_cash, 2)},
-        # Net worth changes with the market!
-        "net_worth": {"currency": "USD", "amount": round(base_nw * market_mood, 2)},
-        "updated_at": None,
-    }
\ No newline at end of file
+        "cash": {"currency": s.currency, "amount": ledger_service.from_cents(s.cash_cents)},
+        "net_worth": {
+            "currency": s.currency,
+            "amount": ledger_service.from_cents(s.net_worth_cents),
+        },
+        "updated_at": s.updated_at.isoformat() if s.updated_at else None,
+    }
+
+
+@router.get("/balances", response_model=BalancesOut)
+async def balances(
+    as_of: date = Query(default_factory=date.today), db: DbSession = Depends(db_session)
+) -> BalancesOut:
+    b = await run_db(db, ledger_service.balances_as_of, as_of, settings.finance_base_currency)
+    return BalancesOut(
+        as_of=b.as_of,
+        currency=b.currency,
+        cash=ledger_service.from_cents(b.cash_cents),
+        net_worth=ledger_service.from_cents(b.net_worth_cents),
+        accounts=[
+            AccountBalanceOut(
+                id=a.account_id,
+                name=a.name,
+                kind=a.kind,
+                currency=a.currency,
+                balance=ledger_service.from_cents(a.balance_cents),
+            )
+            for a in b.accounts
+        ],
+    )
+
+
+def _rollup_out(
+    month: str, category: str | None, inflow: int, outflow: int, count: int
+) -> RollupOut:
+    return RollupOut(
+        month=month,
+        category=category,
+        inflow=ledger_service.from_cents(inflow),
+        outflow=ledger_service.from_cents(outflow),
+        net=ledger_service.from_cents(inflow + outflow),
+        count=count,
+    )
+
+
+@router.get("/rollups", response_model=list[RollupOut])
+async def rollups(
+    start: str | None = Query(default=None, pattern=MONTH_PATTERN),
+    end: str | None = Query(default=None, pattern=MONTH_PATTERN),
+    account_id: str | None = None,
+    category: str | None = None,
+    db: DbSession = Depends(db_session),
+) -> list[RollupOut]:
+    # Spend/income by category and month (YYYY-MM, inclusive), from the rollup table.
+    # category="" selects uncategorised transactions.
+    rows = await run_db(
+        db,
+        rollup_service.query_rollups,
+        start=start,
+        end=end,
+        account_id=account_id,
+        category=category,
+        currency=settings.finance_base_currency,
+    )
+    return [
+        _rollup_out(r.month, r.category, r.inflow_cents, r.outflow_cents, r.txn_count)
+        for r in rows
+    ]
+
+
+@router.post("/rollups/rebuild")
+async def rebuild_rollups(
+    account_id: str | None = None, db: DbSession = Depends(db_session)
+) -> dict:
+    groups = await run_db(db, rollup_service.rebuild, account_id)
+    return {"groups": groups}
+
+
+@router.get("/rollups/check", response_model=RollupCheckOut)
+async def check_rollups(
+    account_id: str | None = None, db: DbSession = Depends(db_session)
+) -> RollupCheckOut:
+    result = await run_db(db, rollup_service.check, account_id)
+    return RollupCheckOut(
+        ok=not result.drift,
+        groups=result.groups,
+        drift=[
+            RollupDriftOut(
+                account_id=d.account_id,
+                category=d.category,
+                month=d.month,
+                expected=_rollup_out(d.month, d.category, *d.expected),
+                actual=_rollup_out(d.month, d.category, *d.actual),
+            )
+            for d in result.drift
+        ],
+    )
+
+
+@router.post("/snapshots", status_code=status.HTTP_204_NO_CONTENT)
+async def take_snapshots(
+    as_of: date | None = None, db: DbSession = Depends(db_session)
+) -> None:
+    await run_db(db, ledger_service.take_snapshots, as_of)
+    return None
+
+
+@router.get("/accounts", response_model=list[AccountOut])
+async def list_accounts(db: DbSession = Depends(db_session)) -> list[AccountOut]:
+    items = await run_db(db, ledger_service.list_accounts)
+    return [_account_to_out(a) for a in items]
+
+
+@router.post("/accounts", response_model=AccountOut, status_code=status.HTTP_201_CREATED)
+async def create_account(
+    payload: AccountCreateIn, db: DbSession = Depends(db_session)
+) -> AccountOut:
+    item = await run_db(
+        db,
+        ledger_service.create_account,
+        ledger_service.AccountCreate(
+            name=payload.name,
+            kind=payload.kind.value,
+            currency=payload.currency.upper(),
+            opening_balance_cents=ledger_service.to_cents(payload.opening_balance),
+            opened_on=payload.opened_on,
+        ),
+    )
+    return _account_to_out(item)
+
+
+@router.get("/transactions", response_model=list[TransactionOut])
+async def list_transactions(
+    account_id: str | None = None,
+    limit: int = Query(default=100, ge=1, le=1000),
+    offset: int = Query(default=0, ge=0),
+    db: DbSession = Depends(db_session),
+) -> list[TransactionOut]:
+    items = await run_db(
+        db, ledger_service.list_transactions, account_id=account_id, limit=limit, offset=offset
+    )
+    return [_transaction_to_out(t) for t in items]
+
+
+def _transaction_export_rows(account_id: str | None) -> Iterator[tuple]:
+    # Opens its own session, like _import_stream; values in TransactionOut field order.
+    with SessionLocal() as db:
+        for t in ledger_service.export_transactions(db, account_id, settings.export_batch_size):
+            yield (
+                t.id,
+                t.account_id,
+                t.posted_on,
+                ledger_service.from_cents(t.amount_cents),
+                t.description,
+                t.category,
+                t.created_at,
+                t.updated_at,
+            )
+
+
+@router.get("/transactions/export")
+async def export_transactions(
+    account_id: str | None = None,
+    format: str = Query(default="ndjson", pattern=EXPORT_FORMAT_PATTERN),
+    gzip: bool = False,
+    db: DbSession = Depends(db_session),
+) -> Response:
+    if account_id is not None and not await run_db(db, ledger_service.get_account, account_id):
+        raise HTTPException(status_code=404, detail="account_not_found")
+    return export_response(
+        _transaction_export_rows(account_id),
+        tuple(TransactionOut.model_fields),
+        "transactions",
+        format,
+        gzip,
+    )
+
+
+@router.post("/transactions", response_model=TransactionOut, status_code=status.HTTP_201_CREATED)
+async def create_transaction(
+    payload: TransactionCreateIn, db: DbSession = Depends(db_session)
+) -> TransactionOut:
+    try:
+        item = await run_db(
+            db,
+            ledger_service.create_transaction,
+            ledger_service.TransactionCreate(
+                account_id=payload.account_id,
+                posted_on=payload.posted_on,
+                amount_cents=ledger_service.to_cents(payload.amount),
+                description=payload.description,
+                category=payload.category,
+            ),
+        )
+    except ledger_service.UnknownAccount:
+        raise HTTPException(status_code=404, detail="account_not_found") from None
+    return _transaction_to_out(item)
+
+
+@router.patch("/transactions/{transaction_id}", response_model=TransactionOut)
+async def update_transaction(
+    transaction_id: str, payload: TransactionUpdateIn, db: DbSession = Depends(db_session)
+) -> TransactionOut:
+    item = await run_db(db, ledger_service.get_transaction, transaction_id)
+    if not item:
+        raise HTTPException(status_code=404, detail="transaction_not_found")
+    updated = await run_db(
+        db,
+        ledger_service.update_transaction,
+        item,
+        ledger_service.TransactionUpdate(
+            posted_on=payload.posted_on,
+            amount_cents=(
+                ledger_service.to_cents(payload.amount) if payload.amount is not None else None
+            ),
+            description=payload.description,
+            category=payload.category,
+        ),
+    )
+    return _transaction_to_out(updated)
+
+
+@router.delete("/transactions/{transaction_id}", status_code=status.HTTP_204_NO_CONTENT)
+async def delete_transaction(transaction_id: str, db: DbSession = Depends(db_session)) -> None:
+    item = await run_db(db, ledger_service.get_transaction, transaction_id)
+    if not item:
+        raise HTTPException(status_code=404, detail="transaction_not_found")
+    await run_db(db, ledger_service.delete_transaction, item)
+    return None
+
+
+def _import_stream(
+    account_id: str, rows: Iterator, upload: UploadFile
+) -> Iterator[str]:
+    # NDJSON progress lines, one per committed-to-be chunk and a final {"done": true}.
+    # The request's session is closed by the time the body streams, so this opens its own.
+    try:
+        with SessionLocal() as db:
+            for progress in import_service.import_rows(
+                db, account_id, rows, settings.finance_import_chunk_size
+            ):
+                yield json.dumps(asdict(progress)) + "\n"
+    except Exception as e:
+        yield json.dumps({"done": True, "error": str(e)}) + "\n"
+    finally:
+        upload.file.close()
+
+
+@router.post("/import")
+async def import_statement(
+    account_id: str,
+    file: UploadFile = File(...),
+    date_format: str | None = None,
+    db: DbSession = Depends(db_session),
+) -> StreamingResponse:
+    if not await run_db(db, ledger_service.get_account, account_id):
+        raise HTTPException(status_code=404, detail="account_not_found")
+    # The upload is spooled to a temp file by the multipart parser; rows are read from it
+    # lazily, so memory stays flat however large the statement is.
+    lines = io.TextIOWrapper(file.file, encoding="utf-8-sig", newline="")
+    try:
+        rows = import_service.parse_rows(lines, date_format)
+    except (import_service.ImportFormatError, UnicodeDecodeError):
+        raise HTTPException(status_code=422, detail="invalid_csv_header") from None
+    return StreamingResponse(
+        _import_stream(account_id, rows, file),
+        media_type="application/x-ndjson",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
+    )
@@ -2,6 +2,8 @@ from __future__ import annotations
 
 from fastapi import APIRouter
 
+from db.session import pool_status
+
 router = APIRouter(tags=["health"])
 
 
@@ -9,3 +11,7 @@ router = APIRouter(tags=["health"])
 def health() -> dict:
     return {"status": "ok"}
 
+
+@router.get("/health/db")
+def health_db() -> dict:
+    return {"status": "ok", "pools": pool_status()}
@@ -1,19 +1,40 @@
 from __future__ import annotations
 
+import asyncio
+import json
+from collections.abc import AsyncIterator, Iterator
 from datetime import datetime
 
-from fastapi import APIRouter, Depends, HTTPException, status
-from pydantic import BaseModel, Field
+from fastapi import APIRouter, Depends, HTTPException, Query, Request, Response, status
+from fastapi.responses import StreamingResponse
+from pydantic import BaseModel, ConfigDict, Field
+from sqlalchemy import Row
 from sqlalchemy.orm import Session
 
-from api.deps import db_session
+from api.deps import DbSession, db_session, run_db
+from api.responses import EXPORT_FORMAT_PATTERN, RowsResponse, export_response, row_dicts
+from core.config import settings
+from db.session import SessionLocal
+from engines.productivity import events, versions
+from engines.productivity.pagination import InvalidCursor, encode_cursor
 from engines.productivity.projects import service as project_service
+from engines.productivity.search import service as search_service
+from engines.productivity.stats import service as stats_service
+from engines.productivity.sync import service as sync_service
 from engines.productivity.tasks import service as task_service
 from models.project import Project
-from models.task import Task
+from models.task import Task, TaskStatus
 
 router = APIRouter(prefix="/productivity", tags=["productivity"])
 
+NEXT_CURSOR_HEADER = "X-Next-Cursor"
+BATCH_MAX_ITEMS = 1000
+
+
+class ProjectStatsOut(BaseModel):
+    by_status: dict[str, int]
+    total: int
+
 
 class ProjectOut(BaseModel):
     id: str
@@ -21,6 +42,27 @@ class ProjectOut(BaseModel):
     description: str | None = None
     created_at: datetime | None = None
     updated_at: datetime | None = None
+    # Only with ?with_stats=1.
+    stats: ProjectStatsOut | None = None
+
+
+class StatsDriftOut(BaseModel):
+    project_id: str
+    status: str
+    expected: int
+    actual: int
+
+
+class StatsCheckOut(BaseModel):
+    ok: bool
+    groups: int
+    drift: list[StatsDriftOut]
+
+
+class SummaryOut(BaseModel):
+    tasks: dict[str, int]  # per status
+    total_tasks: int
+    projects: int
 
 
 class ProjectCreateIn(BaseModel):
@@ -45,21 +87,111 @@ class TaskOut(BaseModel):
 
 
 class TaskCreateIn(BaseModel):
+    # Unknown statuses are a 422: the board and the counters only know TaskStatus.
+    model_config = ConfigDict(use_enum_values=True)
+
     title: str = Field(min_length=1, max_length=255)
     description: str | None = Field(default=None, max_length=4000)
     project_id: str | None = None
-    status: str = Field(default="todo", max_length=32)
+    status: TaskStatus = TaskStatus.TODO
     priority: int = 0
 
 
 class TaskUpdateIn(BaseModel):
+    model_config = ConfigDict(use_enum_values=True)
+
     title: str | None = Field(default=None, min_length=1, max_length=255)
     description: str | None = Field(default=None, max_length=4000)
     project_id: str | None = None
-    status: str | None = Field(default=None, max_length=32)
+    status: TaskStatus | None = None
     priority: int | None = None
 
 
+class ProjectBatchCreateIn(BaseModel):
+    items: list[ProjectCreateIn] = Field(min_length=1, max_length=BATCH_MAX_ITEMS)
+
+
+class ProjectBatchUpdateItemIn(ProjectUpdateIn):
+    id: str
+
+
+class ProjectBatchUpdateIn(BaseModel):
+    items: list[ProjectBatchUpdateItemIn] = Field(min_length=1, max_length=BATCH_MAX_ITEMS)
+
+
+class ProjectBatchResultOut(BaseModel):
+    index: int
+    id: str | None = None
+    status: str
+    item: ProjectOut | None = None
+
+
+class ProjectBatchOut(BaseModel):
+    results: list[ProjectBatchResultOut]
+
+
+class TaskBatchCreateIn(BaseModel):
+    items: list[TaskCreateIn] = Field(min_length=1, max_length=BATCH_MAX_ITEMS)
+
+
+class TaskBatchUpdateItemIn(TaskUpdateIn):
+    id: str
+
+
+class TaskBatchUpdateIn(BaseModel):
+    items: list[TaskBatchUpdateItemIn] = Field(min_length=1, max_length=BATCH_MAX_ITEMS)
+
+
+class TaskBatchResultOut(BaseModel):
+    index: int
+    id: str | None = None
+    status: str
+    item: TaskOut | None = None
+
+
+class TaskBatchOut(BaseModel):
+    results: list[TaskBatchResultOut]
+
+
+class BatchDeleteIn(BaseModel):
+    ids: list[str] = Field(min_length=1, max_length=BATCH_MAX_ITEMS)
+
+
+class BoardColumnOut(BaseModel):
+    status: str
+    total: int
+    tasks: list[TaskOut]
+
+
+class BoardOut(BaseModel):
+    columns: list[BoardColumnOut]
+
+
+class SearchHitOut(BaseModel):
+    # title is plain text; title_html and snippet are HTML-escaped with <mark> around
+    # the matched terms.
+    kind: str
+    id: str
+    title: str
+    title_html: str
+    snippet: str | None = None
+    rank: float
+
+
+class TombstoneOut(BaseModel):
+    entity: str
+    id: str
+    deleted_at: datetime | None = None
+
+
+class ChangesOut(BaseModel):
+    tasks: list[TaskOut]
+    projects: list[ProjectOut]
+    deleted: list[TombstoneOut]
+    next_since: int
+    has_more: bool
+
+
 def _project_to_out(p: Project) -> ProjectOut:
     return ProjectOut(
         id=p.id,
@@ -70,6 +202,18 @@ def _project_to_out(p: Project) -> ProjectOut:
     )
 
 
+def _stats_to_out(s: stats_service.ProjectStats) -> ProjectStatsOut:
+    return ProjectStatsOut(by_status=s.by_status, total=s.total)
+
+
+def _list_projects(
+    db: Session, limit: int, offset: int, after: str | None, with_stats: bool
+) -> tuple[list[Row], dict[str, stats_service.ProjectStats]]:
+    items = project_service.list_projects(db, limit=limit, offset=offset, after=after)
+    stats = stats_service.stats_for(db, [p.id for p in items]) if with_stats else {}
+    return items, stats
+
+
 def _task_to_out(t: Task) -> TaskOut:
     return TaskOut(
         id=t.id,
@@ -83,58 +227,288 @@ def _task_to_out(t: Task) -> TaskOut:
     )
 
 
+def _not_modified(request: Request, etag: str) -> bool:
+    header = request.headers.get("if-none-match")
+    if not header:
+        return False
+    tags = {t.strip().removeprefix("W/") for t in header.split(",")}
+    return "*" in tags or etag in tags
+
+
+async def _check_etag(
+    db: DbSession, request: Request, tables: tuple[str, ...]
+) -> tuple[str, Response | None]:
+    # Validation costs one counter read; no task/project rows are loaded on a 304.
+    etag = await run_db(db, versions.etag, tables, f"{request.url.path}?{request.url.query}")
+    if _not_modified(request, etag):
+        headers = _cache_headers(etag)
+        return etag, Response(status_code=status.HTTP_304_NOT_MODIFIED, headers=headers)
+    return etag, None
+
+
+def _cache_headers(etag: str) -> dict[str, str]:
+    return {"ETag": etag, "Cache-Control": "no-cache"}
+
+
+def _set_next_cursor(
+    response: Response, items: list[Project] | list[Task] | list[Row], limit: int
+) -> None:
+    if items and len(items) == limit:
+        last = items[-1]
+        cursor = encode_cursor(last.updated_at, last.created_at, last.id)
+        response.headers[NEXT_CURSOR_HEADER] = cursor
+
+
 @router.get("/projects", response_model=list[ProjectOut])
-def list_projects(db: Session = Depends(db_session), limit: int = 100, offset: int = 0) -> list[ProjectOut]:
-    items = project_service.list_projects(db, limit=limit, offset=offset)
-    return [_project_to_out(p) for p in items]
+async def list_projects(
+    request: Request,
+    db: DbSession = Depends(db_session),
+    limit: int = Query(default=100, ge=1, le=500),
+    offset: int = Query(default=0, ge=0),
+    after: str | None = None,
+    with_stats: bool = False,
+) -> Response:
+    # with_stats adds per-status task counts from the counters table: one primary-key
+    # lookup for the whole page, no task rows loaded.
+    tables = (versions.PROJECTS, versions.TASKS) if with_stats else (versions.PROJECTS,)
+    etag, not_modified = await _check_etag(db, request, tables)
+    if not_modified is not None:
+        return not_modified
+    try:
+        items, stats = await run_db(db, _list_projects, limit, offset, after, with_stats)
+    except InvalidCursor:
+        raise HTTPException(status_code=400, detail="invalid_cursor") from None
+    out = row_dicts(items)
+    if with_stats:
+        for item in out:
+            s = stats[item["id"]]
+            item["stats"] = {"by_status": s.by_status, "total": s.total}
+    page = RowsResponse(out, headers=_cache_headers(etag))
+    _set_next_cursor(page, items, limit)
+    return page
 
 
 @router.post("/projects", response_model=ProjectOut, status_code=status.HTTP_201_CREATED)
-def create_project(payload: ProjectCreateIn, db: Session = Depends(db_session)) -> ProjectOut:
-    item = project_service.create_project(
-        db, project_service.ProjectCreate(name=payload.name, description=payload.description)
+async def create_project(
+    payload: ProjectCreateIn, db: DbSession = Depends(db_session)
+) -> ProjectOut:
+    item = await run_db(
+        db,
+        project_service.create_project,
+        project_service.ProjectCreate(name=payload.name, description=payload.description),
     )
     return _project_to_out(item)
 
 
+@router.post("/projects:batch", response_model=ProjectBatchOut)
+async def create_projects(
+    payload: ProjectBatchCreateIn, db: DbSession = Depends(db_session)
+) -> ProjectBatchOut:
+    rows = await run_db(
+        db,
+        project_service.create_projects,
+        [
+            project_service.ProjectCreate(name=i.name, description=i.description)
+            for i in payload.items
+        ],
+    )
+    return ProjectBatchOut(
+        results=[
+            ProjectBatchResultOut(index=n, id=row["id"], status="created", item=ProjectOut(**row))
+            for n, row in enumerate(rows)
+        ]
+    )
+
+
+@router.patch("/projects:batch", response_model=ProjectBatchOut)
+async def update_projects(
+    payload: ProjectBatchUpdateIn, db: DbSession = Depends(db_session)
+) -> ProjectBatchOut:
+    rows = await run_db(
+        db,
+        project_service.update_projects,
+        [
+            (i.id, project_service.ProjectUpdate(name=i.name, description=i.description))
+            for i in payload.items
+        ],
+    )
+    return ProjectBatchOut(
+        results=[
+            ProjectBatchResultOut(index=n, id=i.id, status="updated", item=ProjectOut(**row))
+            if row is not None
+            else ProjectBatchResultOut(index=n, id=i.id, status="not_found")
+            for n, (i, row) in enumerate(zip(payload.items, rows, strict=True))
+        ]
+    )
+
+
+@router.delete("/projects:batch", response_model=ProjectBatchOut)
+async def delete_projects(
+    payload: BatchDeleteIn, db: DbSession = Depends(db_session)
+) -> ProjectBatchOut:
+    deleted = await run_db(db, project_service.delete_projects, payload.ids)
+    return ProjectBatchOut(
+        results=[
+            ProjectBatchResultOut(index=n, id=pid, status="deleted" if ok else "not_found")
+            for n, (pid, ok) in enumerate(zip(payload.ids, deleted, strict=True))
+        ]
+    )
+
+
 @router.get("/projects/{project_id}", response_model=ProjectOut)
-def get_project(project_id: str, db: Session = Depends(db_session)) -> ProjectOut:
-    item = project_service.get_project(db, project_id)
+async def get_project(
+    project_id: str, request: Request, response: Response, db: DbSession = Depends(db_session)
+) -> ProjectOut | Response:
+    etag, not_modified = await _check_etag(db, request, (versions.PROJECTS,))
+    if not_modified is not None:
+        return not_modified
+    response.headers.update(_cache_headers(etag))
+    item = await run_db(db, project_service.get_project, project_id)
     if item is None:
         raise HTTPException(status_code=404, detail="project_not_found")
     return _project_to_out(item)
 
 
+@router.get("/projects/{project_id}/stats", response_model=ProjectStatsOut)
+async def get_project_stats(
+    project_id: str, request: Request, response: Response, db: DbSession = Depends(db_session)
+) -> ProjectStatsOut | Response:
+    etag, not_modified = await _check_etag(db, request, (versions.PROJECTS, versions.TASKS))
+    if not_modified is not None:
+        return not_modified
+    response.headers.update(_cache_headers(etag))
+    item = await run_db(db, project_service.get_project, project_id)
+    if item is None:
+        raise HTTPException(status_code=404, detail="project_not_found")
+    stats = await run_db(db, stats_service.stats_for, [project_id])
+    return _stats_to_out(stats[project_id])
+
+
+@router.post("/stats/rebuild")
+async def rebuild_stats(
+    project_id: str | None = None, db: DbSession = Depends(db_session)
+) -> dict:
+    groups = await run_db(db, stats_service.rebuild, project_id)
+    return {"groups": groups}
+
+
+@router.get("/stats/check", response_model=StatsCheckOut)
+async def check_stats(
+    project_id: str | None = None, db: DbSession = Depends(db_session)
+) -> StatsCheckOut:
+    result = await run_db(db, stats_service.check, project_id)
+    return StatsCheckOut(
+        ok=not result.drift,
+        groups=result.groups,
+        drift=[
+            StatsDriftOut(
+                project_id=d.project_id, status=d.status, expected=d.expected, actual=d.actual
+            )
+            for d in result.drift
+        ],
+    )
+
+
+def _summary(db: Session) -> SummaryOut:
+    # The total counts every row, not just the statuses listed in `tasks`.
+    return SummaryOut(
+        tasks=task_service.status_counts(db),
+        total_tasks=task_service.count_tasks(db),
+        projects=project_service.count_projects(db),
+    )
+
+
+@router.get("/summary", response_model=SummaryOut)
+async def productivity_summary(db: DbSession = Depends(db_session)) -> SummaryOut:
+    return await run_db(db, _summary)
+
+
 @router.patch("/projects/{project_id}", response_model=ProjectOut)
-def update_project(project_id: str, payload: ProjectUpdateIn, db: Session = Depends(db_session)) -> ProjectOut:
-    item = project_service.get_project(db, project_id)
+async def update_project(
+    project_id: str, payload: ProjectUpdateIn, db: DbSession = Depends(db_session)
+) -> ProjectOut:
+    item = await run_db(db, project_service.get_project, project_id)
     if item is None:
         raise HTTPException(status_code=404, detail="project_not_found")
-    updated = project_service.update_project(
-        db, item, project_service.ProjectUpdate(name=payload.name, description=payload.description)
+    updated = await run_db(
+        db,
+        project_service.update_project,
+        item,
+        project_service.ProjectUpdate(name=payload.name, description=payload.description),
     )
     return _project_to_out(updated)
 
 
 @router.delete("/projects/{project_id}", status_code=status.HTTP_204_NO_CONTENT)
-def delete_project(project_id: str, db: Session = Depends(db_session)) -> None:
-    item = project_service.get_project(db, project_id)
+async def delete_project(project_id: str, db: DbSession = Depends(db_session)) -> None:
+    item = await run_db(db, project_service.get_project, project_id)
     if item is None:
         raise HTTPException(status_code=404, detail="project_not_found")
-    project_service.delete_project(db, item)
+    await run_db(db, project_service.delete_project, item)
     return None
 
 
 @router.get("/tasks", response_model=list[TaskOut])
-def list_tasks(db: Session = Depends(db_session), limit: int = 100, offset: int = 0) -> list[TaskOut]:
-    items = task_service.list_tasks(db, limit=limit, offset=offset)
-    return [_task_to_out(t) for t in items]
+async def list_tasks(
+    request: Request,
+    db: DbSession = Depends(db_session),
+    limit: int = Query(default=100, ge=1, le=500),
+    offset: int = Query(default=0, ge=0),
+    after: str | None = None,
+) -> Response:
+    etag, not_modified = await _check_etag(db, request, (versions.TASKS,))
+    if not_modified is not None:
+        return not_modified
+    try:
+        items = await run_db(db, task_service.list_tasks, limit=limit, offset=offset, after=after)
+    except InvalidCursor:
+        raise HTTPException(status_code=400, detail="invalid_cursor") from None
+    page = RowsResponse(row_dicts(items), headers=_cache_headers(etag))
+    _set_next_cursor(page, items, limit)
+    return page
+
+
+def _task_export_rows() -> Iterator[Row]:
+    # The request's session is closed by the time the body streams, so this opens its own.
+    with SessionLocal() as db:
+        yield from task_service.export_tasks(db, settings.export_batch_size)
+
+
+@router.get("/tasks/export")
+async def export_tasks(
+    format: str = Query(default="ndjson", pattern=EXPORT_FORMAT_PATTERN),
+    gzip: bool = False,
+) -> Response:
+    # Every task as TaskOut-shaped NDJSON lines or CSV rows, streamed: memory stays flat
+    # however many tasks there are, unlike paging through /tasks.
+    return export_response(_task_export_rows(), tuple(TaskOut.model_fields), "tasks", format, gzip)
+
+
+@router.get("/board", response_model=BoardOut)
+async def get_board(
+    request: Request,
+    response: Response,
+    db: DbSession = Depends(db_session),
+    limit: int = Query(default=50, ge=1, le=500),
+) -> BoardOut | Response:
+    etag, not_modified = await _check_etag(db, request, (versions.TASKS,))
+    if not_modified is not None:
+        return not_modified
+    response.headers.update(_cache_headers(etag))
+    columns = await run_db(db, task_service.board, per_column=limit)
+    return BoardOut(
+        columns=[
+            BoardColumnOut(status=c.status, total=c.total, tasks=[_task_to_out(t) for t in c.tasks])
+            for c in columns
+        ]
+    )
 
 
 @router.post("/tasks", response_model=TaskOut, status_code=status.HTTP_201_CREATED)
-def create_task(payload: TaskCreateIn, db: Session = Depends(db_session)) -> TaskOut:
-    item = task_service.create_task(
+async def create_task(payload: TaskCreateIn, db: DbSession = Depends(db_session)) -> TaskOut:
+    item = await run_db(
         db,
+        task_service.create_task,
         task_service.TaskCreate(
             title=payload.title,
             description=payload.description,
@@ -146,21 +520,98 @@ def create_task(payload: TaskCreateIn, db: Session = Depends(db_session)) -> Tas
     return _task_to_out(item)
 
 
+@router.post("/tasks:batch", response_model=TaskBatchOut)
+async def create_tasks(
+    payload: TaskBatchCreateIn, db: DbSession = Depends(db_session)
+) -> TaskBatchOut:
+    rows = await run_db(
+        db,
+        task_service.create_tasks,
+        [
+            task_service.TaskCreate(
+                title=i.title,
+                description=i.description,
+                project_id=i.project_id,
+                status=i.status,
+                priority=i.priority,
+            )
+            for i in payload.items
+        ],
+    )
+    return TaskBatchOut(
+        results=[
+            TaskBatchResultOut(index=n, id=row["id"], status="created", item=TaskOut(**row))
+            for n, row in enumerate(rows)
+        ]
+    )
+
+
+@router.patch("/tasks:batch", response_model=TaskBatchOut)
+async def update_tasks(
+    payload: TaskBatchUpdateIn, db: DbSession = Depends(db_session)
+) -> TaskBatchOut:
+    rows = await run_db(
+        db,
+        task_service.update_tasks,
+        [
+            (
+                i.id,
+                task_service.TaskUpdate(
+                    title=i.title,
+                    description=i.description,
+                    project_id=i.project_id,
+                    status=i.status,
+                    priority=i.priority,
+                ),
+            )
+            for i in payload.items
+        ],
+    )
+    return TaskBatchOut(
+        results=[
+            TaskBatchResultOut(index=n, id=i.id, status="updated", item=TaskOut(**row))
+            if row is not None
+            else TaskBatchResultOut(index=n, id=i.id, status="not_found")
+            for n, (i, row) in enumerate(zip(payload.items, rows, strict=True))
+        ]
+    )
+
+
+@router.delete("/tasks:batch", response_model=TaskBatchOut)
+async def delete_tasks(payload: BatchDeleteIn, db: DbSession = Depends(db_session)) -> TaskBatchOut:
+    deleted = await run_db(db, task_service.delete_tasks, payload.ids)
+    return TaskBatchOut(
+        results=[
+            TaskBatchResultOut(index=n, id=tid, status="deleted" if ok else "not_found")
+            for n, (tid, ok) in enumerate(zip(payload.ids, deleted, strict=True))
+        ]
+    )
+
+
 @router.get("/tasks/{task_id}", response_model=TaskOut)
-def get_task(task_id: str, db: Session = Depends(db_session)) -> TaskOut:
-    item = task_service.get_task(db, task_id)
+async def get_task(
+    task_id: str, request: Request, response: Response, db: DbSession = Depends(db_session)
+) -> TaskOut | Response:
+    etag, not_modified = await _check_etag(db, request, (versions.TASKS,))
+    if not_modified is not None:
+        return not_modified
+    response.headers.update(_cache_headers(etag))
+    item = await run_db(db, task_service.get_task, task_id)
     if item is None:
         raise HTTPException(status_code=404, detail="task_not_found")
     return _task_to_out(item)
 
 
 @router.patch("/tasks/{task_id}", response_model=TaskOut)
-def update_task(task_id: str, payload: TaskUpdateIn, db: Session = Depends(db_session)) -> TaskOut:
-    item = task_service.get_task(db, task_id)
+async def update_task(
+    task_id: str, payload: TaskUpdateIn, db: DbSession = Depends(db_session)
+) -> TaskOut:
+    item = await run_db(db, task_service.get_task, task_id)
     if item is None:
         raise HTTPException(status_code=404, detail="task_not_found")
-    updated = task_service.update_task(
+    updated = await run_db(
         db,
+        task_service.update_task,
         item,
         task_service.TaskUpdate(
             title=payload.title,
@@ -174,10 +625,95 @@ def update_task(task_id: str, payload: TaskUpdateIn, db: Session = Depends(db_se
 
 
 @router.delete("/tasks/{task_id}", status_code=status.HTTP_204_NO_CONTENT)
-def delete_task(task_id: str, db: Session = Depends(db_session)) -> None:
-    item = task_service.get_task(db, task_id)
+async def delete_task(task_id: str, db: DbSession = Depends(db_session)) -> None:
+    item = await run_db(db, task_service.get_task, task_id)
     if item is None:
         raise HTTPException(status_code=404, detail="task_not_found")
-    task_service.delete_task(db, item)
+    await run_db(db, task_service.delete_task, item)
+    return None
+
+
+@router.get("/search", response_model=list[SearchHitOut])
+async def search(
+    q: str = Query(min_length=1, max_length=200),
+    limit: int = Query(default=20, ge=1, le=100),
+    offset: int = Query(default=0, ge=0),
+    db: DbSession = Depends(db_session),
+) -> list[SearchHitOut]:
+    try:
+        hits = await run_db(db, search_service.search, q, limit=limit, offset=offset)
+    except search_service.SearchUnavailable:
+        raise HTTPException(status_code=501, detail="search_unavailable") from None
+    return [
+        SearchHitOut(
+            kind=h.kind,
+            id=h.id,
+            title=h.title,
+            title_html=h.title_html,
+            snippet=h.snippet,
+            rank=h.rank,
+        )
+        for h in hits
+    ]
+
+
+@router.post("/search:rebuild", status_code=status.HTTP_204_NO_CONTENT)
+async def rebuild_search_index(db: DbSession = Depends(db_session)) -> None:
+    await run_db(db, search_service.rebuild_index)
     return None
 
+
+@router.get("/changes", response_model=ChangesOut)
+async def list_changes(
+    since: int = Query(default=0, ge=0),
+    limit: int = Query(default=500, ge=1, le=BATCH_MAX_ITEMS),
+    db: DbSession = Depends(db_session),
+) -> ChangesOut:
+    changes = await run_db(db, sync_service.changes_since, since=since, limit=limit)
+    return ChangesOut(
+        tasks=[_task_to_out(t) for t in changes.tasks],
+        projects=[_project_to_out(p) for p in changes.projects],
+        deleted=[
+            TombstoneOut(entity=d.entity, id=d.entity_id, deleted_at=d.deleted_at)
+            for d in changes.deleted
+        ],
+        next_since=changes.next_since,
+        has_more=changes.has_more,
+    )
+
+
+def _sse(event: events.ChangeEvent) -> str:
+    payload = json.dumps(
+        {"entity": event.entity, "op": event.op, "id": event.id, "data": event.data}
+    )
+    return f"id: {event.seq}\nevent: {event.entity}.{event.op}\ndata: {payload}\n\n"
+
+
+async def _stream_changes(sub: events.Subscription) -> AsyncIterator[str]:
+    try:
+        yield ": connected\n\n"
+        while True:
+            try:
+                item = await asyncio.wait_for(
+                    sub.queue.get(), timeout=settings.events_keepalive_seconds
+                )
+            except TimeoutError:
+                yield ": keepalive\n\n"
+                continue
+            if item is None:
+                # Fell too far behind and was dropped; the client should resync and reconnect.
+                yield "event: overflow\ndata: {}\n\n"
+                return
+            yield _sse(item)
+    finally:
+        events.bus.unsubscribe(sub)
+
+
+@router.get("/stream")
+async def stream_changes() -> StreamingResponse:
+    sub = events.bus.subscribe()
+    return StreamingResponse(
+        _stream_changes(sub),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
+    )
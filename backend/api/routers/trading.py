@@ -1,22 +1,404 @@
 from __future__ import annotations
 
-import random
-from fastapi import APIRouter
+import time
+from datetime import datetime, timezone
+from typing import Any
+
+import numpy as np
+from fastapi import APIRouter, Depends, HTTPException, Query, status
+from pydantic import BaseModel, Field
+from starlette.concurrency import run_in_threadpool
+
+from api.deps import (
+    DbSession,
+    backtests,
+    db_session,
+    market_snapshot,
+    portfolio,
+    price_store,
+    run_db,
+)
+from core.config import settings
+from engines.trading import backtest
+from engines.trading import backtest_jobs as backtest_service
+from engines.trading import portfolio as portfolio_engine
+from engines.trading import trades as trade_service
+from engines.trading.portfolio import Portfolio
+from engines.trading.prices import OutOfOrder, PriceStore, normalize_symbol, parse_interval
+from engines.trading.snapshot import MarketSnapshot
+from models.backtest_job import BacktestJob
+from models.trade import Trade
 
 router = APIRouter(prefix="/trading", tags=["trading"])
 
 
-@router.get("/positions")
-def positions() -> dict:
-    # Simulate live tickers moving
-    spy_price = 420.50 + random.uniform(-5.0, 5.0)  # Moves up/down by $5
-    aapl_price = 185.10 + random.uniform(-2.0, 2.0) # Moves up/down by $2
-    
-    return {
-        "positions": [
-            {"symbol": "SPY", "qty": 10, "avg_price": round(spy_price, 2)},
-            {"symbol": "AAPL", "qty": 5, "avg_price": round(aapl_price, 2)},
-            # Let's add a wild crypto coin just for fun
-            {"symbol": "BTC", "qty": 0.5, "avg_price": round(45000 + random.uniform(-500, 500), 2)},
-        ]
-    }
\ No newline at end of file
+class TicksIn(BaseModel):
+    symbol: str
+    # Parallel columns; ts in epoch seconds. Any order within a batch, but not before
+    # the last stored tick of the symbol.
+    ts: list[int] = Field(max_length=1_000_000)
+    price: list[float]
+    volume: list[float] | None = None
+
+
+class BarsOut(BaseModel):
+    # Columnar: bar i is (t[i], open[i], high[i], low[i], close[i], volume[i]).
+    symbol: str
+    interval: str
+    t: list[int]
+    open: list[float]
+    high: list[float]
+    low: list[float]
+    close: list[float]
+    volume: list[float]
+
+
+class TradeIn(BaseModel):
+    symbol: str
+    qty: float = Field(description="positive to buy, negative to sell")
+    price: float = Field(gt=0)
+    executed_at: datetime | None = None
+
+
+class TradeOut(BaseModel):
+    id: str
+    symbol: str
+    qty: float
+    price: float
+    executed_at: datetime
+    created_at: datetime | None = None
+
+
+class PositionOut(BaseModel):
+    symbol: str
+    qty: float
+    avg_price: float
+    last_price: float
+    market_value: float
+    cost_basis: float
+    unrealized_pnl: float
+    realized_pnl: float
+    weight: float
+
+
+class PositionsOut(BaseModel):
+    total_value: float
+    unrealized_pnl: float
+    realized_pnl: float
+    positions: list[PositionOut]
+
+
+class PositionRiskOut(BaseModel):
+    symbol: str
+    weight: float
+    volatility: float | None = None
+
+
+class RiskOut(BaseModel):
+    total_value: float
+    days: int
+    observations: int
+    confidence: float
+    volatility: float
+    value_at_risk: float
+    positions: list[PositionRiskOut]
+
+
+class BacktestIn(BaseModel):
+    strategy: str
+    symbols: list[str] = Field(min_length=1, max_length=500)
+    interval: str = "1d"
+    # [start, end); defaults to the most recent trading_max_bars intervals.
+    start: datetime | None = None
+    end: datetime | None = None
+    # Strategy keyword arguments; a list sweeps every value (the grid is the product).
+    params: dict[str, int | float | list[int | float]] = Field(default_factory=dict)
+    fee_bps: float = Field(default=1.0, ge=0)
+    slippage_bps: float = Field(default=2.0, ge=0)
+    bars_per_year: float | None = Field(default=None, gt=0)
+
+
+class BacktestOut(BaseModel):
+    id: str
+    strategy: str
+    status: str
+    request: dict[str, Any]
+    result: dict[str, Any] | None = None
+    error: str | None = None
+    created_at: datetime | None = None
+    started_at: datetime | None = None
+    finished_at: datetime | None = None
+
+
+def _trade_to_out(t: Trade) -> TradeOut:
+    return TradeOut(
+        id=t.id,
+        symbol=t.symbol,
+        qty=t.qty,
+        price=t.price,
+        executed_at=trade_service.as_utc(t.executed_at),
+        created_at=t.created_at,
+    )
+
+
+def _backtest_to_out(job: BacktestJob) -> BacktestOut:
+    return BacktestOut(
+        id=job.id,
+        strategy=job.strategy,
+        status=job.status,
+        request=job.request,
+        result=job.result,
+        error=job.error,
+        created_at=job.created_at,
+        started_at=job.started_at,
+        finished_at=job.finished_at,
+    )
+
+
+def _epoch(value: datetime) -> int:
+    if value.tzinfo is None:
+        value = value.replace(tzinfo=timezone.utc)
+    return int(value.timestamp())
+
+
+async def _valuation(
+    db: DbSession, book: Portfolio, market: MarketSnapshot
+) -> portfolio_engine.Valuation:
+    # Book version and prices come from the shared snapshot, so every worker agrees.
+    b = await run_db(db, book.book, market.book_version())
+    return portfolio_engine.value(b, market.latest(b.symbols))
+
+
+@router.get("/positions", response_model=PositionsOut)
+async def positions(
+    db: DbSession = Depends(db_session),
+    book: Portfolio = Depends(portfolio),
+    market: MarketSnapshot = Depends(market_snapshot),
+) -> PositionsOut:
+    # Open positions marked to the latest stored price (last trade price if none).
+    v = await _valuation(db, book, market)
+    b = v.book
+    held = np.flatnonzero(b.qty > 0)
+    rows = zip(
+        held.tolist(),
+        b.qty[held].tolist(),
+        (b.cost[held] / b.qty[held]).tolist(),
+        v.price[held].tolist(),
+        v.market_value[held].tolist(),
+        b.cost[held].tolist(),
+        v.unrealized[held].tolist(),
+        b.realized[held].tolist(),
+        v.weight[held].tolist(),
+        strict=True,
+    )
+    return PositionsOut(
+        total_value=round(v.total_value, 2),
+        unrealized_pnl=round(float(v.unrealized.sum()), 2),
+        realized_pnl=round(float(b.realized.sum()), 2),
+        positions=[
+            PositionOut(
+                symbol=b.symbols[i],
+                qty=qty,
+                avg_price=round(avg, 4),
+                last_price=round(last, 4),
+                market_value=round(mv, 2),
+                cost_basis=round(cost, 2),
+                unrealized_pnl=round(upnl, 2),
+                realized_pnl=round(rpnl, 2),
+                weight=round(weight, 6),
+            )
+            for i, qty, avg, last, mv, cost, upnl, rpnl, weight in rows
+        ],
+    )
+
+
+@router.get("/risk", response_model=RiskOut)
+async def risk(
+    days: int = Query(default=252, ge=2, le=2520),
+    confidence: float = Query(default=0.95, gt=0.5, lt=1.0),
+    db: DbSession = Depends(db_session),
+    book: Portfolio = Depends(portfolio),
+    market: MarketSnapshot = Depends(market_snapshot),
+) -> RiskOut:
+    v = await _valuation(db, book, market)
+    r = await run_in_threadpool(portfolio_engine.risk, v, market.store, days, confidence)
+    held = np.flatnonzero(v.book.qty > 0)
+    return RiskOut(
+        total_value=round(r.total_value, 2),
+        days=days,
+        observations=r.observations,
+        confidence=r.confidence,
+        volatility=round(r.volatility, 6),
+        value_at_risk=round(r.value_at_risk, 2),
+        positions=[
+            PositionRiskOut(
+                symbol=r.symbols[i],
+                weight=round(float(r.weight[i]), 6),
+                volatility=(
+                    None
+                    if np.isnan(r.symbol_volatility[i])
+                    else round(float(r.symbol_volatility[i]), 6)
+                ),
+            )
+            for i in held.tolist()
+        ],
+    )
+
+
+@router.get("/trades", response_model=list[TradeOut])
+async def list_trades(
+    symbol: str | None = None,
+    limit: int = Query(default=100, ge=1, le=1000),
+    db: DbSession = Depends(db_session),
+) -> list[TradeOut]:
+    if symbol is not None:
+        symbol = symbol.strip().upper()
+    items = await run_db(db, trade_service.list_trades, symbol, limit)
+    return [_trade_to_out(t) for t in items]
+
+
+@router.post("/trades", response_model=TradeOut, status_code=status.HTTP_201_CREATED)
+async def record_trade(
+    payload: TradeIn,
+    db: DbSession = Depends(db_session),
+    book: Portfolio = Depends(portfolio),
+) -> TradeOut:
+    if payload.qty == 0:
+        raise HTTPException(status_code=422, detail="zero_quantity")
+    try:
+        symbol = normalize_symbol(payload.symbol)
+    except ValueError:
+        raise HTTPException(status_code=422, detail="invalid_symbol") from None
+    try:
+        item = await run_db(
+            db,
+            trade_service.record_trade,
+            trade_service.TradeCreate(
+                symbol=symbol,
+                qty=payload.qty,
+                price=payload.price,
+                executed_at=payload.executed_at,
+            ),
+        )
+    except trade_service.InsufficientPosition:
+        raise HTTPException(status_code=422, detail="insufficient_position") from None
+    book.invalidate()
+    return _trade_to_out(item)
+
+
+@router.post("/prices")
+def ingest_prices(payload: TicksIn, store: PriceStore = Depends(price_store)) -> dict:
+    if len(payload.price) != len(payload.ts) or (
+        payload.volume is not None and len(payload.volume) != len(payload.ts)
+    ):
+        raise HTTPException(status_code=422, detail="column_length_mismatch")
+    try:
+        symbol = normalize_symbol(payload.symbol)
+        appended = store.append(
+            symbol,
+            np.fromiter(payload.ts, dtype=np.int64, count=len(payload.ts)),
+            np.fromiter(payload.price, dtype=np.float64, count=len(payload.price)),
+            None if payload.volume is None else np.asarray(payload.volume, dtype=np.float64),
+        )
+    except OutOfOrder:
+        raise HTTPException(status_code=409, detail="ticks_out_of_order") from None
+    except ValueError:
+        raise HTTPException(status_code=422, detail="invalid_ticks") from None
+    return {"symbol": symbol, "appended": appended}
+
+
+@router.get("/bars", response_model=BarsOut)
+def bars(
+    symbol: str,
+    interval: str = "1m",
+    start: datetime | None = Query(default=None, alias="from"),
+    end: datetime | None = Query(default=None, alias="to"),
+    store: PriceStore = Depends(price_store),
+) -> BarsOut:
+    try:
+        symbol = normalize_symbol(symbol)
+    except ValueError:
+        raise HTTPException(status_code=422, detail="invalid_symbol") from None
+    try:
+        seconds = parse_interval(interval)
+    except ValueError:
+        raise HTTPException(status_code=422, detail="invalid_interval") from None
+    # [from, to), defaulting to the most recent trading_default_bars intervals.
+    to_ts = _epoch(end) if end is not None else int(time.time()) + 1
+    from_ts = (
+        _epoch(start) if start is not None else to_ts - seconds * settings.trading_default_bars
+    )
+    if (to_ts - from_ts) // seconds > settings.trading_max_bars:
+        raise HTTPException(status_code=422, detail="too_many_bars")
+    b = store.bars(symbol, seconds, from_ts, to_ts)
+    return BarsOut(
+        symbol=symbol,
+        interval=interval,
+        t=b.ts.tolist(),
+        open=b.open.tolist(),
+        high=b.high.tolist(),
+        low=b.low.tolist(),
+        close=b.close.tolist(),
+        volume=b.volume.tolist(),
+    )
+
+
+@router.post("/backtest", response_model=BacktestOut, status_code=status.HTTP_202_ACCEPTED)
+async def create_backtest(
+    payload: BacktestIn,
+    db: DbSession = Depends(db_session),
+    runner: backtest_service.BacktestRunner = Depends(backtests),
+) -> BacktestOut:
+    # Queues a parameter sweep; poll GET /trading/backtest/{id} for the result.
+    if payload.strategy not in backtest.STRATEGIES:
+        raise HTTPException(status_code=422, detail="unknown_strategy")
+    try:
+        symbols = list(dict.fromkeys(normalize_symbol(s) for s in payload.symbols))
+    except ValueError:
+        raise HTTPException(status_code=422, detail="invalid_symbol") from None
+    try:
+        seconds = parse_interval(payload.interval)
+    except ValueError:
+        raise HTTPException(status_code=422, detail="invalid_interval") from None
+    end = _epoch(payload.end) if payload.end is not None else int(time.time()) + 1
+    start = (
+        _epoch(payload.start)
+        if payload.start is not None
+        else end - seconds * settings.trading_max_bars
+    )
+    if start >= end:
+        raise HTTPException(status_code=422, detail="invalid_range")
+    if (end - start) // seconds > settings.trading_max_bars:
+        raise HTTPException(status_code=422, detail="too_many_bars")
+    if len(backtest.grid(payload.params)) > settings.trading_backtest_max_runs:
+        raise HTTPException(status_code=422, detail="too_many_runs")
+    try:
+        backtest.validate_params(payload.strategy, payload.params)
+    except backtest.InvalidParams:
+        raise HTTPException(status_code=422, detail="invalid_params") from None
+    job = await run_db(
+        db,
+        backtest_service.create_job,
+        backtest_service.BacktestCreate(
+            strategy=payload.strategy,
+            symbols=symbols,
+            interval=seconds,
+            start=start,
+            end=end,
+            params=payload.params,
+            fee_bps=payload.fee_bps,
+            slippage_bps=payload.slippage_bps,
+            bars_per_year=payload.bars_per_year,
+        ),
+        runner.owner,
+    )
+    runner.submit(job.id)
+    return _backtest_to_out(job)
+
+
+@router.get("/backtest/{job_id}", response_model=BacktestOut)
+async def get_backtest(job_id: str, db: DbSession = Depends(db_session)) -> BacktestOut:
+    job = await run_db(db, backtest_service.get_job, job_id)
+    if job is None:
+        raise HTTPException(status_code=404, detail="backtest_not_found")
+    return _backtest_to_out(job)
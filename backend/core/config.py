@@ -11,18 +11,94 @@ class Settings(BaseSettings):
     
     # Database
     database_url: str = "sqlite:///./data/command_centre.db"
+    # Serve the productivity API from an AsyncSession (aiosqlite / asyncpg) instead of
+    # the sync engine + threadpool. The async URL is derived from the sync one if unset.
+    database_async: bool = False
+    database_async_url: str | None = None
+
+    # Connection pool (QueuePool for file SQLite and Postgres). Use /health/db to size these.
+    db_pool_size: int = 5
+    db_max_overflow: int = 10
+    db_pool_timeout: float = 30.0
+    # Postgres only
+    db_pool_recycle: int = 1800
+    db_pool_pre_ping: bool = True
+
+    # SQLite pragmas, applied on every new connection
+    sqlite_journal_mode: str = "WAL"
+    sqlite_synchronous: str = "NORMAL"
+    sqlite_busy_timeout_ms: int = 5000
+    sqlite_mmap_size: int = 256 * 1024 * 1024
+    sqlite_cache_size: int = -64_000  # negative = KiB, i.e. ~64 MB page cache
 
     # CORS - Allow all connections so your phone can connect
     cors_allow_origins: list[str] = ["*"]
     cors_allow_credentials: bool = True
     cors_allow_methods: list[str] = ["*"]
     cors_allow_headers: list[str] = ["*"]
+    cors_expose_headers: list[str] = ["X-Next-Cursor", "ETag"]
+
+    # Productivity change feed (/productivity/stream)
+    events_queue_size: int = 256
+    events_keepalive_seconds: float = 15.0
+
+    # Finance ledger
+    finance_base_currency: str = "USD"
+    # How often today's balance snapshot is refreshed; 0 disables the background task
+    finance_snapshot_interval_seconds: float = 3600.0
+    # Rows per INSERT batch in statement imports (/finance/import)
+    finance_import_chunk_size: int = 1000
+
+    # Trading price history (engines.trading.prices): one directory of memmapped columns
+    # per symbol. /trading/bars defaults to the last `trading_default_bars` bars.
+    trading_price_dir: str = "./data/prices"
+    trading_default_bars: int = 500
+    trading_max_bars: int = 20_000
+    # Backtest sweeps (POST /trading/backtest): worker processes per job (0: one per CPU)
+    # and the largest parameter grid accepted.
+    trading_backtest_workers: int = 0
+    trading_backtest_max_runs: int = 10_000
+    # Latest prices + book version shared by all workers (engines.trading.snapshot): a
+    # shared-memory segment refreshed by one elected worker every interval (0 disables).
+    trading_snapshot_name: str = "command_centre_market"
+    trading_snapshot_capacity: int = 16_384
+    trading_snapshot_interval_seconds: float = 1.0
+
+    # /dashboard: each section (finance, trading, productivity, ai) is given this long
+    # before it is reported as timed out and the rest is returned without it
+    dashboard_section_timeout_seconds: float = 2.0
+
+    # Streaming exports (/productivity/tasks/export, /finance/transactions/export): rows
+    # fetched per round trip from the server-side cursor
+    export_batch_size: int = 1000
 
     # Logging
     log_level: str = "INFO"
 
     # AI
     google_api_key: str | None = None
+    gemini_model: str = "gemini-flash-latest"
+    gemini_base_url: str = "https://generativelanguage.googleapis.com/v1beta"
+    # Shared outbound client (engines.ai.client), created once in the app lifespan
+    gemini_http2: bool = True
+    gemini_max_connections: int = 20
+    gemini_max_keepalive_connections: int = 10
+    gemini_keepalive_expiry: float = 60.0
+    gemini_connect_timeout: float = 5.0
+    gemini_read_timeout: float = 30.0
+    gemini_write_timeout: float = 10.0
+    gemini_pool_timeout: float = 5.0
+    # Retries on 429/5xx and transport errors, with jittered exponential backoff
+    gemini_max_retries: int = 2
+    gemini_backoff_base: float = 0.5
+    gemini_backoff_max: float = 8.0
+    gemini_max_concurrency: int = 8
+    # Chat answer cache (engines.ai.cache); 0 entries or 0 TTL disables it
+    ai_cache_max_entries: int = 256
+    ai_cache_ttl_seconds: float = 60.0
+    # Task/project retrieval for the chat prompt (engines.ai.context)
+    ai_context_top_k: int = 20
+    ai_context_token_budget: int = 800
 
 
 settings = Settings()
\ No newline at end of file
@@ -0,0 +1,28 @@
+from __future__ import annotations
+
+from datetime import datetime
+
+from sqlalchemy import DateTime, String, Table, literal
+from sqlalchemy.dialects import postgresql, sqlite
+from sqlalchemy.orm import Session
+from sqlalchemy.sql.elements import ColumnElement
+
+
+def upsert_insert(db: Session, table: Table):
+    # INSERT with on_conflict_do_nothing / on_conflict_do_update for the bound dialect;
+    # both SQLite and PostgreSQL spell ON CONFLICT the same way.
+    dialect = db.get_bind().dialect.name
+    return (postgresql if dialect == "postgresql" else sqlite).insert(table)
+
+
+def stored_datetime(db: Session, value: datetime) -> ColumnElement:
+    # A timestamp to compare against a DateTime column that was read back earlier.
+    # SQLite keeps timestamps as text and compares them as text: CURRENT_TIMESTAMP
+    # writes "YYYY-MM-DD HH:MM:SS" while a bound datetime renders with ".ffffff", so
+    # equal values would compare unequal. Bind the text the way it was stored instead.
+    if db.get_bind().dialect.name == "sqlite":
+        text = value.strftime("%Y-%m-%d %H:%M:%S")
+        if value.microsecond:
+            text += f".{value.microsecond:06d}"
+        return literal(text, String)
+    return literal(value, DateTime(timezone=True))
@@ -0,0 +1,89 @@
+from __future__ import annotations
+
+import threading
+import time
+from typing import Any
+
+from sqlalchemy import exc
+from sqlalchemy.pool import AsyncAdaptedQueuePool, PoolProxiedConnection, QueuePool
+
+_WAIT_BUCKETS_MS = (1, 10, 100, 1000)
+
+
+class PoolStats:
+    def __init__(self) -> None:
+        self._lock = threading.Lock()
+        self.checkouts = 0
+        self.timeouts = 0
+        self.wait_total_s = 0.0
+        self.wait_max_s = 0.0
+        self.peak_checked_out = 0
+        self.wait_buckets = [0] * (len(_WAIT_BUCKETS_MS) + 1)
+
+    def record(self, waited_s: float, checked_out: int) -> None:
+        waited_ms = waited_s * 1000
+        bucket = next(
+            (i for i, limit in enumerate(_WAIT_BUCKETS_MS) if waited_ms <= limit),
+            len(_WAIT_BUCKETS_MS),
+        )
+        with self._lock:
+            self.checkouts += 1
+            self.wait_total_s += waited_s
+            self.wait_max_s = max(self.wait_max_s, waited_s)
+            self.peak_checked_out = max(self.peak_checked_out, checked_out)
+            self.wait_buckets[bucket] += 1
+
+    def record_timeout(self) -> None:
+        with self._lock:
+            self.timeouts += 1
+
+    def as_dict(self) -> dict[str, Any]:
+        with self._lock:
+            labels = [f"le_{ms}ms" for ms in _WAIT_BUCKETS_MS] + ["gt_1000ms"]
+            return {
+                "checkouts": self.checkouts,
+                "timeouts": self.timeouts,
+                "wait_avg_ms": round(self.wait_total_s * 1000 / self.checkouts, 3)
+                if self.checkouts
+                else 0.0,
+                "wait_max_ms": round(self.wait_max_s * 1000, 3),
+                "peak_checked_out": self.peak_checked_out,
+                "wait_histogram": dict(zip(labels, self.wait_buckets, strict=True)),
+            }
+
+
+class InstrumentedQueuePool(QueuePool):
+    # Times Pool.connect() (queue wait + connect + pre-ping), i.e. what a request
+    # actually waits for before it can run its first statement.
+
+    def __init__(self, *args: Any, **kwargs: Any) -> None:
+        super().__init__(*args, **kwargs)
+        self.stats = PoolStats()
+
+    def connect(self) -> PoolProxiedConnection:
+        start = time.perf_counter()
+        try:
+            conn = super().connect()
+        except exc.TimeoutError:
+            self.stats.record_timeout()
+            raise
+        self.stats.record(time.perf_counter() - start, self.checkedout())
+        return conn
+
+    def recreate(self) -> QueuePool:
+        pool = super().recreate()
+        if isinstance(pool, InstrumentedQueuePool):
+            pool.stats = self.stats
+        return pool
+
+    def status_dict(self) -> dict[str, Any]:
+        return {
+            "size": self.size(),
+            "checked_out": self.checkedout(),
+            "overflow": self.overflow(),
+            **self.stats.as_dict(),
+        }
+
+
+class InstrumentedAsyncQueuePool(InstrumentedQueuePool, AsyncAdaptedQueuePool):
+    pass
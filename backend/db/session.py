@@ -1,19 +1,74 @@
-import os
-from sqlalchemy import create_engine
+from __future__ import annotations
+
+from typing import Any
+
+from sqlalchemy import create_engine, event, make_url
+from sqlalchemy.engine import URL, Engine
+from sqlalchemy.ext.asyncio import async_sessionmaker, create_async_engine
 from sqlalchemy.orm import sessionmaker
-from dotenv import load_dotenv
 
-load_dotenv()
+from core.config import settings
+from db.pool import InstrumentedAsyncQueuePool, InstrumentedQueuePool
 
-SQLALCHEMY_DATABASE_URL = os.getenv("DATABASE_URL", "sqlite:///./data/command_centre.db")
+SQLALCHEMY_DATABASE_URL = settings.database_url
+
+
+def _is_memory_sqlite(url: URL) -> bool:
+    return url.get_backend_name() == "sqlite" and url.database in (None, "", ":memory:")
+
+
+def _engine_kwargs(url: URL, poolclass: type[InstrumentedQueuePool]) -> dict[str, Any]:
+    if url.get_backend_name() == "sqlite":
+        if _is_memory_sqlite(url):
+            # One shared in-memory database; pooling settings don't apply.
+            return {"connect_args": {"check_same_thread": False}}
+        return {
+            "connect_args": {"check_same_thread": False},
+            "poolclass": poolclass,
+            "pool_size": settings.db_pool_size,
+            "max_overflow": settings.db_max_overflow,
+            "pool_timeout": settings.db_pool_timeout,
+        }
+    return {
+        "poolclass": poolclass,
+        "pool_size": settings.db_pool_size,
+        "max_overflow": settings.db_max_overflow,
+        "pool_timeout": settings.db_pool_timeout,
+        "pool_recycle": settings.db_pool_recycle,
+        "pool_pre_ping": settings.db_pool_pre_ping,
+    }
 
-if SQLALCHEMY_DATABASE_URL.startswith("sqlite"):
-    engine = create_engine(
-        SQLALCHEMY_DATABASE_URL, 
-        connect_args={"check_same_thread": False}
-    )
-else:
-    engine = create_engine(SQLALCHEMY_DATABASE_URL)
+
+def _install_sqlite_pragmas(engine: Engine) -> None:
+    pragmas = [
+        f"PRAGMA busy_timeout = {int(settings.sqlite_busy_timeout_ms)}",
+        f"PRAGMA synchronous = {settings.sqlite_synchronous}",
+        f"PRAGMA cache_size = {int(settings.sqlite_cache_size)}",
+        f"PRAGMA mmap_size = {int(settings.sqlite_mmap_size)}",
+    ]
+    if not _is_memory_sqlite(engine.url):
+        # journal_mode is persistent in the file but cheap to re-assert per connection.
+        pragmas.insert(0, f"PRAGMA journal_mode = {settings.sqlite_journal_mode}")
+
+    @event.listens_for(engine, "connect")
+    def _on_connect(dbapi_connection, connection_record) -> None:
+        cursor = dbapi_connection.cursor()
+        try:
+            for pragma in pragmas:
+                cursor.execute(pragma)
+        finally:
+            cursor.close()
+
+
+def build_engine(database_url: str) -> Engine:
+    url = make_url(database_url)
+    engine = create_engine(url, **_engine_kwargs(url, InstrumentedQueuePool))
+    if url.get_backend_name() == "sqlite":
+        _install_sqlite_pragmas(engine)
+    return engine
+
+
+engine = build_engine(SQLALCHEMY_DATABASE_URL)
 
 SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
 
@@ -23,4 +78,52 @@ def get_db():
     try:
         yield db
     finally:
-        db.close()
\ No newline at end of file
+        db.close()
+
+
+# Optional async path (settings.database_async). Needs aiosqlite / asyncpg installed.
+_ASYNC_DRIVERS = {"sqlite": "sqlite+aiosqlite", "postgresql": "postgresql+asyncpg"}
+
+
+def async_database_url(url: str) -> str:
+    parsed = make_url(url)
+    backend = parsed.get_backend_name()
+    if backend not in _ASYNC_DRIVERS:
+        raise ValueError(f"no async driver configured for {backend!r}")
+    return parsed.set(drivername=_ASYNC_DRIVERS[backend]).render_as_string(hide_password=False)
+
+
+async_engine = None
+AsyncSessionLocal = None
+
+if settings.database_async:
+    _async_url = make_url(
+        settings.database_async_url or async_database_url(SQLALCHEMY_DATABASE_URL)
+    )
+    async_engine = create_async_engine(
+        _async_url, **_engine_kwargs(_async_url, InstrumentedAsyncQueuePool)
+    )
+    if _async_url.get_backend_name() == "sqlite":
+        _install_sqlite_pragmas(async_engine.sync_engine)
+    AsyncSessionLocal = async_sessionmaker(async_engine, autoflush=False)
+
+
+async def get_async_db():
+    if AsyncSessionLocal is None:
+        raise RuntimeError("async database path is disabled (set DATABASE_ASYNC=true)")
+    async with AsyncSessionLocal() as db:
+        yield db
+
+
+def pool_status() -> dict[str, Any]:
+    status: dict[str, Any] = {}
+    for name, eng in (("sync", engine), ("async", async_engine and async_engine.sync_engine)):
+        if eng is None:
+            continue
+        pool = eng.pool
+        status[name] = (
+            pool.status_dict()
+            if isinstance(pool, InstrumentedQueuePool)
+            else {"pool": type(pool).__name__}
+        )
+    return status
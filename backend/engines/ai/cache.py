@@ -0,0 +1,125 @@
+from __future__ import annotations
+
+import asyncio
+import hashlib
+import json
+import re
+import time
+from collections import OrderedDict
+from collections.abc import Awaitable, Callable
+from typing import Any
+
+_WHITESPACE = re.compile(r"\s+")
+
+
+def cache_key(message: str, snapshot: Any) -> str:
+    # Same question against the same live data -> same key. Case, surrounding
+    # whitespace and trailing punctuation do not change the answer.
+    normalized = _WHITESPACE.sub(" ", message.casefold()).strip().rstrip("?!. ")
+    fingerprint = hashlib.blake2b(
+        json.dumps(snapshot, sort_keys=True, default=str).encode(), digest_size=12
+    ).hexdigest()
+    return f"{fingerprint}:{normalized}"
+
+
+class ResponseCache:
+    # LRU + TTL cache of chat answers with single-flight: concurrent misses for one key
+    # share a single upstream call. Only values accepted by `cacheable` are stored.
+
+    def __init__(
+        self,
+        max_entries: int,
+        ttl_seconds: float,
+        clock: Callable[[], float] = time.monotonic,
+    ) -> None:
+        self.max_entries = max_entries
+        self.ttl_seconds = ttl_seconds
+        self._clock = clock
+        self._entries: OrderedDict[str, tuple[float, str]] = OrderedDict()
+        self._inflight: dict[str, asyncio.Task[str]] = {}
+        self.hits = 0
+        self.misses = 0
+        self.coalesced = 0
+        self.evictions = 0
+
+    @property
+    def enabled(self) -> bool:
+        return self.max_entries > 0 and self.ttl_seconds > 0
+
+    def get(self, key: str) -> str | None:
+        entry = self._entries.get(key)
+        if entry is None:
+            return None
+        expires_at, value = entry
+        if expires_at <= self._clock():
+            del self._entries[key]
+            return None
+        self._entries.move_to_end(key)
+        return value
+
+    def lookup(self, key: str) -> str | None:
+        # get() plus hit/miss accounting, for callers that fill the entry themselves.
+        if not self.enabled:
+            return None
+        value = self.get(key)
+        if value is None:
+            self.misses += 1
+        else:
+            self.hits += 1
+        return value
+
+    def put(self, key: str, value: str) -> None:
+        if not self.enabled:
+            return
+        self._entries[key] = (self._clock() + self.ttl_seconds, value)
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+            self.evictions += 1
+
+    async def get_or_compute(
+        self,
+        key: str,
+        compute: Callable[[], Awaitable[str]],
+        cacheable: Callable[[str], bool] = lambda _: True,
+    ) -> str:
+        if not self.enabled:
+            return await compute()
+        value = self.get(key)
+        if value is not None:
+            self.hits += 1
+            return value
+        task = self._inflight.get(key)
+        if task is not None:
+            self.coalesced += 1
+        else:
+            self.misses += 1
+            task = asyncio.ensure_future(self._compute(key, compute, cacheable))
+            self._inflight[key] = task
+        # shield: one waiter disconnecting must not cancel the call the others share.
+        return await asyncio.shield(task)
+
+    async def _compute(
+        self, key: str, compute: Callable[[], Awaitable[str]], cacheable: Callable[[str], bool]
+    ) -> str:
+        try:
+            value = await compute()
+            if cacheable(value):
+                self.put(key, value)
+            return value
+        finally:
+            self._inflight.pop(key, None)
+
+    def stats(self) -> dict[str, Any]:
+        lookups = self.hits + self.misses + self.coalesced
+        return {
+            "entries": len(self._entries),
+            "max_entries": self.max_entries,
+            "ttl_seconds": self.ttl_seconds,
+            "hits": self.hits,
+            "misses": self.misses,
+            "coalesced": self.coalesced,
+            "evictions": self.evictions,
+            "in_flight": len(self._inflight),
+            "hit_rate": round((self.hits + self.coalesced) / lookups, 4) if lookups else 0.0,
+        }
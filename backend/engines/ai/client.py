@@ -0,0 +1,180 @@
+from __future__ import annotations
+
+import asyncio
+import importlib.util
+import json
+import random
+from collections.abc import AsyncIterator
+from typing import Any
+
+import httpx
+
+from core.config import Settings
+from core.logging import get_logger, log_event
+
+logger = get_logger("ai.client")
+
+RETRY_STATUSES = frozenset({429, 500, 502, 503, 504})
+
+
+class GeminiError(Exception):
+    def __init__(self, status_code: int, body: str) -> None:
+        super().__init__(f"gemini returned {status_code}")
+        self.status_code = status_code
+        self.body = body
+
+
+def response_text(data: dict[str, Any]) -> str:
+    candidates = data.get("candidates") or [{}]
+    parts = (candidates[0].get("content") or {}).get("parts") or []
+    return "".join(part.get("text", "") for part in parts)
+
+
+def build_http_client(settings: Settings) -> httpx.AsyncClient:
+    # h2 is optional; without it httpx refuses http2=True, so fall back to HTTP/1.1
+    # keep-alive rather than failing at startup.
+    http2 = settings.gemini_http2 and importlib.util.find_spec("h2") is not None
+    return httpx.AsyncClient(
+        base_url=settings.gemini_base_url,
+        http2=http2,
+        limits=httpx.Limits(
+            max_connections=settings.gemini_max_connections,
+            max_keepalive_connections=settings.gemini_max_keepalive_connections,
+            keepalive_expiry=settings.gemini_keepalive_expiry,
+        ),
+        timeout=httpx.Timeout(
+            connect=settings.gemini_connect_timeout,
+            read=settings.gemini_read_timeout,
+            write=settings.gemini_write_timeout,
+            pool=settings.gemini_pool_timeout,
+        ),
+    )
+
+
+class GeminiClient:
+    # One per process, created in the app lifespan: every chat turn reuses the warm
+    # connection pool instead of paying DNS + TCP + TLS per request.
+
+    def __init__(self, settings: Settings, http: httpx.AsyncClient | None = None) -> None:
+        self.http = http or build_http_client(settings)
+        self.model = settings.gemini_model
+        self._api_key = (settings.google_api_key or "").strip()
+        self._max_retries = settings.gemini_max_retries
+        self._backoff_base = settings.gemini_backoff_base
+        self._backoff_max = settings.gemini_backoff_max
+        self._semaphore = asyncio.Semaphore(settings.gemini_max_concurrency)
+        self.requests = 0
+        self.retries = 0
+        self.failures = 0
+        self.in_flight = 0
+
+    @property
+    def configured(self) -> bool:
+        return bool(self._api_key)
+
+    async def aclose(self) -> None:
+        await self.http.aclose()
+
+    def stats(self) -> dict[str, Any]:
+        return {
+            "requests": self.requests,
+            "retries": self.retries,
+            "failures": self.failures,
+            "in_flight": self.in_flight,
+        }
+
+    def _headers(self) -> dict[str, str]:
+        return {"x-goog-api-key": self._api_key}
+
+    def _retryable(self, attempt: int, status_code: int) -> bool:
+        return status_code in RETRY_STATUSES and attempt < self._max_retries
+
+    async def _sleep_before_retry(
+        self, attempt: int, status_code: int | None, retry_after: str | None
+    ) -> None:
+        delay = self._backoff(attempt, retry_after)
+        log_event(
+            logger, "gemini_retry", attempt=attempt + 1, status=status_code, delay=round(delay, 3)
+        )
+        self.retries += 1
+        await asyncio.sleep(delay)
+
+    def _backoff(self, attempt: int, retry_after: str | None) -> float:
+        # Full jitter, so clients throttled together do not retry in lockstep.
+        delay = random.uniform(0, min(self._backoff_max, self._backoff_base * 2**attempt))
+        if retry_after is not None:
+            try:
+                delay = max(delay, min(float(retry_after), self._backoff_max))
+            except ValueError:
+                pass
+        return delay
+
+    async def generate(self, body: dict[str, Any], model: str | None = None) -> dict[str, Any]:
+        path = f"/models/{model or self.model}:generateContent"
+        self.requests += 1
+        attempt = 0
+        while True:
+            # The slot is held for the request only, not across the backoff sleep.
+            async with self._semaphore:
+                self.in_flight += 1
+                try:
+                    response = await self.http.post(path, json=body, headers=self._headers())
+                except httpx.TransportError:
+                    if attempt >= self._max_retries:
+                        self.failures += 1
+                        raise
+                    response = None
+                finally:
+                    self.in_flight -= 1
+            if response is not None:
+                if response.status_code == 200:
+                    return response.json()
+                if not self._retryable(attempt, response.status_code):
+                    self.failures += 1
+                    raise GeminiError(response.status_code, response.text)
+            status_code = response.status_code if response is not None else None
+            retry_after = response.headers.get("retry-after") if response is not None else None
+            await self._sleep_before_retry(attempt, status_code, retry_after)
+            attempt += 1
+
+    async def stream_generate(
+        self, body: dict[str, Any], model: str | None = None
+    ) -> AsyncIterator[str]:
+        # Relays text chunks from streamGenerateContent (SSE framing) as they arrive.
+        # Retries apply only before the first chunk; closing the iterator (e.g. the
+        # browser went away) closes the upstream response too.
+        path = f"/models/{model or self.model}:streamGenerateContent"
+        self.requests += 1
+        attempt = 0
+        started = False
+        while True:
+            status_code = retry_after = None
+            async with self._semaphore:
+                self.in_flight += 1
+                try:
+                    async with self.http.stream(
+                        "POST", path, params={"alt": "sse"}, json=body, headers=self._headers()
+                    ) as response:
+                        if response.status_code == 200:
+                            async for line in response.aiter_lines():
+                                if not line.startswith("data:"):
+                                    continue
+                                text = response_text(json.loads(line[5:]))
+                                if text:
+                                    started = True
+                                    yield text
+                            return
+                        await response.aread()
+                        if not self._retryable(attempt, response.status_code):
+                            self.failures += 1
+                            raise GeminiError(response.status_code, response.text)
+                        status_code = response.status_code
+                        retry_after = response.headers.get("retry-after")
+                except httpx.TransportError:
+                    if started or attempt >= self._max_retries:
+                        self.failures += 1
+                        raise
+                finally:
+                    self.in_flight -= 1
+            await self._sleep_before_retry(attempt, status_code, retry_after)
+            attempt += 1
@@ -0,0 +1,255 @@
+from __future__ import annotations
+
+import heapq
+import math
+import re
+import threading
+import time
+import zlib
+from collections import Counter
+from collections.abc import Iterable, Mapping, Sequence
+from dataclasses import dataclass
+from operator import itemgetter
+from typing import Any
+
+from sqlalchemy import select
+from sqlalchemy.orm import Session
+
+from engines.productivity import versions
+from engines.productivity.events import ChangeEvent
+from engines.productivity.sync import service as sync_service
+from models.project import Project
+from models.task import Task
+
+_TOKEN = re.compile(r"[a-z0-9]+")
+# Function words carry no topic, and as shared terms they would make nearly every item
+# a match.
+_STOPWORDS = frozenset(
+    "a about all am an and any are as at be been but by can could did do does for from "
+    "had has have how i if in into is it its me my need no not of on or our should so "
+    "than that the their them then there these they this to up us was we were what when "
+    "where which who why will with would you your".split()
+)
+
+
+def estimate_tokens(text: str) -> int:
+    # ~4 characters per token for English prose; close enough for budgeting.
+    return len(text) // 4 + 1
+
+
+class HashingVectorizer:
+    # Stateless bag-of-words (unigrams + bigrams), each feature hashed to a 32-bit id and
+    # L2 normalised. No vocabulary to fit, so documents can be added one at a time.
+
+    def features(self, text: str) -> list[int]:
+        words = [w for w in _TOKEN.findall(text.lower()) if w not in _STOPWORDS]
+        grams = words + [f"{a} {b}" for a, b in zip(words, words[1:], strict=False)]
+        return [zlib.crc32(g.encode()) for g in grams]
+
+    def vector(self, text: str) -> dict[int, float]:
+        counts = Counter(self.features(text))
+        norm = math.sqrt(sum(c * c for c in counts.values()))
+        return {f: c / norm for f, c in counts.items()}
+
+
+@dataclass(frozen=True)
+class ContextItem:
+    kind: str  # "task" | "project"
+    id: str
+    line: str  # rendered into the prompt
+    text: str  # what gets vectorised
+
+
+@dataclass(frozen=True)
+class ContextResult:
+    lines: list[str]
+    tokens: int
+    candidates: int
+
+
+class TermIndex:
+    # Inverted index: feature -> {item: weight}. A query only walks the postings of its
+    # own features, so every item sharing a term with it is scored (no candidate cut-off
+    # to lose real matches in) and nothing else is. Scores are cosine with IDF-weighted
+    # query terms, so a rare shared term outranks a common one.
+
+    def __init__(self) -> None:
+        self._items: dict[tuple[str, str], ContextItem] = {}
+        self._vectors: dict[tuple[str, str], dict[int, float]] = {}
+        self._postings: dict[int, dict[tuple[str, str], float]] = {}
+
+    def __len__(self) -> int:
+        return len(self._items)
+
+    def terms(self) -> int:
+        return len(self._postings)
+
+    def upsert(self, items: Sequence[ContextItem], vectors: Sequence[dict[int, float]]) -> None:
+        for item, vector in zip(items, vectors, strict=True):
+            key = (item.kind, item.id)
+            self._unlink(key)
+            self._items[key] = item
+            self._vectors[key] = vector
+            for feature, weight in vector.items():
+                self._postings.setdefault(feature, {})[key] = weight
+
+    def delete(self, kind: str, item_id: str) -> None:
+        key = (kind, item_id)
+        self._unlink(key)
+        self._items.pop(key, None)
+
+    def _unlink(self, key: tuple[str, str]) -> None:
+        for feature in self._vectors.pop(key, ()):
+            posting = self._postings[feature]
+            del posting[key]
+            if not posting:
+                del self._postings[feature]
+
+    def search(self, query: dict[int, float], k: int) -> list[tuple[float, ContextItem]]:
+        n = len(self._items)
+        if n == 0 or k <= 0:
+            return []
+        scores: dict[tuple[str, str], float] = {}
+        for feature, weight in query.items():
+            posting = self._postings.get(feature)
+            if not posting:
+                continue
+            weight *= math.log(1 + n / len(posting))
+            for key, value in posting.items():
+                scores[key] = scores.get(key, 0.0) + weight * value
+        top = heapq.nlargest(k, scores.items(), key=itemgetter(1))
+        return [(score, self._items[key]) for key, score in top]
+
+
+def _task_item(row: Mapping[str, Any]) -> ContextItem:
+    description = row.get("description") or ""
+    line = f"- task \"{row['title']}\" ({row['status']}, priority {row['priority']})"
+    if description:
+        line += f": {description[:200]}"
+    return ContextItem("task", row["id"], line, f"{row['title']} {description}")
+
+
+def _project_item(row: Mapping[str, Any]) -> ContextItem:
+    description = row.get("description") or ""
+    line = f"- project \"{row['name']}\""
+    if description:
+        line += f": {description[:200]}"
+    return ContextItem("project", row["id"], line, f"{row['name']} {description}")
+
+
+_ITEM_BUILDERS = {"task": _task_item, "project": _project_item}
+_TASK_FIELDS = ("id", "title", "description", "status", "priority")
+_PROJECT_FIELDS = ("id", "name", "description")
+
+
+def _columns(row: Any, fields: tuple[str, ...]) -> dict[str, Any]:
+    return {f: getattr(row, f) for f in fields}
+
+
+class ContextBuilder:
+    # Keeps a local retrieval index of tasks and projects and picks the items most
+    # relevant to a chat message, stopping at a token budget instead of dumping
+    # everything into the prompt. The index is loaded once, then updated from this
+    # process's event bus and, for writes made by other worker processes, from the
+    # change feed (catch_up) before each use.
+
+    def __init__(self, top_k: int = 20, token_budget: int = 800) -> None:
+        self.vectorizer = HashingVectorizer()
+        self.top_k = top_k
+        self.token_budget = token_budget
+        self._index = TermIndex()
+        self._lock = threading.Lock()
+        self._loading = False
+        self._backlog: list[ChangeEvent] = []
+        self._since = 0
+        self.build_seconds = 0.0
+
+    def load(self, db: Session) -> None:
+        # Build a fresh index off to the side; events that arrive meanwhile are replayed
+        # on top of it so nothing committed during the load is lost or overwritten.
+        with self._lock:
+            self._loading = True
+            self._backlog = []
+        try:
+            started = time.perf_counter()
+            since = versions.current(db, versions.CHANGE_SEQ).get(versions.CHANGE_SEQ, 0)
+            task_cols = (Task.id, Task.title, Task.description, Task.status, Task.priority)
+            project_cols = (Project.id, Project.name, Project.description)
+            items = [_task_item(r) for r in db.execute(select(*task_cols)).mappings()]
+            items += [_project_item(r) for r in db.execute(select(*project_cols)).mappings()]
+            index = TermIndex()
+            index.upsert(items, [self.vectorizer.vector(i.text) for i in items])
+            with self._lock:
+                self._index = index
+                self._since = since
+                self._apply(self._backlog)
+            self.build_seconds = time.perf_counter() - started
+        finally:
+            with self._lock:
+                self._loading = False
+                self._backlog = []
+
+    def catch_up(self, db: Session) -> int:
+        # Applies everything committed since the last load/catch_up, whichever process
+        # wrote it; an up-to-date index costs three empty index range scans.
+        applied = 0
+        while True:
+            with self._lock:
+                since = self._since
+            changes = sync_service.changes_since(db, since)
+            events = [
+                ChangeEvent("task", "updated", t.id, _columns(t, _TASK_FIELDS))
+                for t in changes.tasks
+            ]
+            events += [
+                ChangeEvent("project", "updated", p.id, _columns(p, _PROJECT_FIELDS))
+                for p in changes.projects
+            ]
+            events += [ChangeEvent(d.entity, "deleted", d.entity_id, None) for d in changes.deleted]
+            with self._lock:
+                self._apply(events)
+                self._since = max(self._since, changes.next_since)
+            applied += len(events)
+            if not changes.has_more:
+                return applied
+
+    def on_events(self, events: list[ChangeEvent]) -> None:
+        with self._lock:
+            if self._loading:
+                self._backlog.extend(events)
+            self._apply(events)
+
+    def _apply(self, events: Iterable[ChangeEvent]) -> None:
+        # Last event per item wins, so a create + delete in one batch leaves nothing.
+        latest = {(e.entity, e.id): e for e in events if e.entity in _ITEM_BUILDERS}
+        upserts = []
+        for (entity, item_id), e in latest.items():
+            if e.op == "deleted" or e.data is None:
+                self._index.delete(entity, item_id)
+            else:
+                upserts.append(_ITEM_BUILDERS[entity](e.data))
+        if upserts:
+            self._index.upsert(upserts, [self.vectorizer.vector(i.text) for i in upserts])
+
+    def build(self, message: str, token_budget: int | None = None) -> ContextResult:
+        budget = self.token_budget if token_budget is None else token_budget
+        query = self.vectorizer.vector(message)
+        with self._lock:
+            hits = self._index.search(query, self.top_k)
+        lines, tokens = [], 0
+        for _, item in hits:
+            cost = estimate_tokens(item.line)
+            if tokens + cost > budget:
+                break
+            lines.append(item.line)
+            tokens += cost
+        return ContextResult(lines=lines, tokens=tokens, candidates=len(hits))
+
+    def stats(self) -> dict[str, Any]:
+        return {
+            "items": len(self._index),
+            "terms": self._index.terms(),
+            "top_k": self.top_k,
+            "token_budget": self.token_budget,
+            "build_seconds": round(self.build_seconds, 3),
+        }
@@ -0,0 +1,39 @@
+from __future__ import annotations
+
+from engines.ai.tools import ToolCall, parse_tool_calls
+
+
+class ToolCallSniffer:
+    # Decides from the first non-blank characters of a streamed reply whether it is a
+    # plain answer (relay every chunk immediately) or a tool-call payload (JSON or a
+    # fenced block; buffer it until the stream ends, then parse it once).
+
+    def __init__(self) -> None:
+        self._buffer: list[str] = []
+        self.mode: str | None = None
+
+    def feed(self, chunk: str) -> str:
+        if self.mode == "text":
+            return chunk
+        self._buffer.append(chunk)
+        if self.mode == "tool":
+            return ""
+        head = "".join(self._buffer).lstrip()
+        if not head or (head.startswith("`") and len(head) < 3):
+            return ""
+        if head.startswith(("{", "[", "```")):
+            self.mode = "tool"
+            return ""
+        self.mode = "text"
+        return self._drain()
+
+    def finish(self) -> tuple[list[ToolCall], str]:
+        # Returns parsed tool calls, or the buffered text if it was not a tool payload.
+        text = self._drain()
+        calls = parse_tool_calls(text) if self.mode == "tool" else []
+        return calls, "" if calls else text
+
+    def _drain(self) -> str:
+        text = "".join(self._buffer)
+        self._buffer.clear()
+        return text
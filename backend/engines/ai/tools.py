@@ -0,0 +1,190 @@
+from __future__ import annotations
+
+import json
+from collections.abc import Callable, Sequence
+from dataclasses import dataclass, field
+from typing import Any
+
+from sqlalchemy.orm import Session
+
+from engines.productivity.tasks import service as task_service
+from models.task import Task, TaskStatus
+
+
+class ToolError(ValueError):
+    pass
+
+
+@dataclass(frozen=True)
+class ToolCall:
+    name: str
+    args: dict[str, Any] = field(default_factory=dict)
+
+
+@dataclass(frozen=True)
+class ToolResult:
+    name: str
+    message: str
+    task_id: str | None = None
+
+
+@dataclass(frozen=True)
+class Tool:
+    name: str
+    description: str
+    example: dict[str, Any]
+    handler: Callable[[Session, dict[str, Any]], ToolResult]
+
+
+class ToolRegistry:
+    def __init__(self) -> None:
+        self._tools: dict[str, Tool] = {}
+
+    def register(
+        self, name: str, description: str, example: dict[str, Any]
+    ) -> Callable[[Callable[[Session, dict[str, Any]], ToolResult]], Tool]:
+        def decorator(fn: Callable[[Session, dict[str, Any]], ToolResult]) -> Tool:
+            tool = Tool(name=name, description=description, example=example, handler=fn)
+            self._tools[name] = tool
+            return tool
+
+        return decorator
+
+    def names(self) -> list[str]:
+        return list(self._tools)
+
+    def prompt(self) -> str:
+        lines = []
+        for tool in self._tools.values():
+            example = json.dumps({"tool": tool.name, **tool.example})
+            lines.append(f"- {tool.name}: {tool.description} Format: {example}")
+        return "\n".join(lines)
+
+    def run(self, db: Session, calls: Sequence[ToolCall]) -> list[ToolResult]:
+        # Every call in one model response shares a single transaction: either all of
+        # "add these five tasks" lands (one commit, one event batch) or none of it does.
+        for call in calls:
+            if call.name not in self._tools:
+                raise ToolError(f"unknown tool {call.name!r}")
+        try:
+            results = [self._tools[call.name].handler(db, call.args) for call in calls]
+            db.commit()
+        except Exception:
+            db.rollback()
+            raise
+        return results
+
+
+def parse_tool_calls(text: str) -> list[ToolCall]:
+    # Accepts a single {"tool": ...} object, a JSON array of them, or {"tools": [...]}.
+    # Anything that is not a tool-call payload is treated as a plain answer.
+    text = text.strip()
+    if text.startswith("```"):
+        text = text.strip("`").removeprefix("json").strip()
+    if not text.startswith(("{", "[")):
+        return []
+    try:
+        data = json.loads(text)
+    except ValueError:
+        return []
+    if isinstance(data, dict):
+        data = data.get("tools", [data])
+    if not isinstance(data, list):
+        return []
+    calls = []
+    for item in data:
+        if not isinstance(item, dict) or not isinstance(item.get("tool"), str):
+            return []
+        args = {k: v for k, v in item.items() if k != "tool"}
+        calls.append(ToolCall(name=item["tool"], args=args))
+    return calls
+
+
+registry = ToolRegistry()
+
+
+def _str_arg(args: dict[str, Any], key: str, required: bool = False) -> str | None:
+    value = args.get(key)
+    if value is None or (isinstance(value, str) and not value.strip()):
+        if required:
+            raise ToolError(f"missing argument {key!r}")
+        return None
+    if not isinstance(value, str):
+        raise ToolError(f"argument {key!r} must be a string")
+    return value.strip()
+
+
+def _int_arg(args: dict[str, Any], key: str) -> int | None:
+    value = args.get(key)
+    if value is None:
+        return None
+    try:
+        return int(value)
+    except (TypeError, ValueError):
+        raise ToolError(f"argument {key!r} must be an integer") from None
+
+
+def _status_arg(args: dict[str, Any]) -> str | None:
+    value = _str_arg(args, "status")
+    if value is not None and value not in {s.value for s in TaskStatus}:
+        raise ToolError(f"unknown status {value!r}")
+    return value
+
+
+def _resolve_task(db: Session, args: dict[str, Any]) -> Task:
+    # The model rarely knows ids, so a task can also be addressed by its title.
+    task_id = _str_arg(args, "id")
+    if task_id is not None:
+        task = task_service.get_task(db, task_id)
+    else:
+        task = task_service.find_task_by_title(db, _str_arg(args, "title", required=True))
+    if task is None:
+        raise ToolError("task not found")
+    return task
+
+
+@registry.register(
+    "create_task",
+    "Create a task when the user asks to create, add, remind or schedule something.",
+    {"title": "Call Mom", "priority": 1},
+)
+def _create_task(db: Session, args: dict[str, Any]) -> ToolResult:
+    priority = _int_arg(args, "priority")
+    payload = task_service.TaskCreate(
+        title=_str_arg(args, "title", required=True),
+        description=_str_arg(args, "description"),
+        project_id=_str_arg(args, "project_id"),
+        status=_status_arg(args) or TaskStatus.TODO.value,
+        priority=1 if priority is None else priority,
+    )
+    task = task_service.create_task(db, payload, commit=False)
+    return ToolResult("create_task", f"Added '{task.title}' to your task list.", task.id)
+
+
+@registry.register(
+    "update_task",
+    "Change an existing task (looked up by title) - rename it or set status/priority.",
+    {"title": "Call Mom", "new_title": "Call Mom and Dad", "priority": 2},
+)
+def _update_task(db: Session, args: dict[str, Any]) -> ToolResult:
+    task = _resolve_task(db, args)
+    payload = task_service.TaskUpdate(
+        title=_str_arg(args, "new_title"),
+        description=_str_arg(args, "description"),
+        status=_status_arg(args),
+        priority=_int_arg(args, "priority"),
+    )
+    task = task_service.update_task(db, task, payload, commit=False)
+    return ToolResult("update_task", f"Updated '{task.title}'.", task.id)
+
+
+@registry.register(
+    "complete_task",
+    "Mark an existing task (looked up by title) as done.",
+    {"title": "Call Mom"},
+)
+def _complete_task(db: Session, args: dict[str, Any]) -> ToolResult:
+    task = _resolve_task(db, args)
+    payload = task_service.TaskUpdate(status=TaskStatus.DONE.value)
+    task = task_service.update_task(db, task, payload, commit=False)
+    return ToolResult("complete_task", f"Marked '{task.title}' as done.", task.id)
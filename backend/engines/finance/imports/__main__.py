@@ -0,0 +1,48 @@
+from __future__ import annotations
+
+import argparse
+import sys
+
+from db.session import SessionLocal
+from engines.finance.imports import service
+from engines.finance.ledger.service import UnknownAccount
+
+
+def main(argv: list[str] | None = None) -> int:
+    parser = argparse.ArgumentParser(
+        prog="python -m engines.finance.imports",
+        description="Import a bank/broker CSV statement into a ledger account.",
+    )
+    parser.add_argument("path", help="CSV file, or - for stdin")
+    parser.add_argument("--account", required=True, help="ledger account id")
+    parser.add_argument("--date-format", default=None, help="strptime format, e.g. %%d/%%m/%%Y")
+    parser.add_argument("--chunk-size", type=int, default=1000)
+    args = parser.parse_args(argv)
+
+    stream = (
+        sys.stdin
+        if args.path == "-"
+        else open(args.path, newline="", encoding="utf-8-sig")  # noqa: SIM115
+    )
+    try:
+        with SessionLocal() as db:
+            rows = service.parse_rows(stream, args.date_format)
+            for p in service.import_rows(db, args.account, rows, args.chunk_size):
+                print(
+                    f"rows={p.rows} inserted={p.inserted} duplicates={p.duplicates} "
+                    f"rejected={p.rejected}" + (" done" if p.done else "")
+                )
+            for e in p.errors:
+                print(f"line {e.line}: {e.error}", file=sys.stderr)
+    except service.ImportFormatError as exc:
+        parser.error(str(exc))
+    except UnknownAccount:
+        parser.error(f"unknown account {args.account!r}")
+    finally:
+        if stream is not sys.stdin:
+            stream.close()
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -0,0 +1,236 @@
+from __future__ import annotations
+
+import csv
+import hashlib
+import re
+from collections import Counter, defaultdict
+from collections.abc import Iterable, Iterator
+from dataclasses import dataclass, field
+from datetime import date, datetime
+from decimal import Decimal, InvalidOperation
+from itertools import islice
+
+from sqlalchemy.orm import Session
+
+from db.dialect import upsert_insert
+from engines.finance.ledger import service as ledger_service
+from engines.finance.rollups import service as rollups
+from models.account import Account
+from models.transaction import Transaction
+
+# Header aliases seen in common bank/broker exports (compared case-insensitively).
+DATE_COLUMNS = ("date", "posted_on", "posted", "posting date", "transaction date", "booking date")
+AMOUNT_COLUMNS = ("amount", "value", "net amount")
+DEBIT_COLUMNS = ("debit", "withdrawal", "money out", "paid out")
+CREDIT_COLUMNS = ("credit", "deposit", "money in", "paid in")
+DESCRIPTION_COLUMNS = ("description", "memo", "payee", "details", "narrative", "name")
+CATEGORY_COLUMNS = ("category",)
+
+DATE_FORMATS = ("%Y-%m-%d", "%m/%d/%Y", "%d.%m.%Y", "%Y/%m/%d", "%d %b %Y", "%b %d, %Y")
+MAX_REPORTED_ERRORS = 20
+
+_NOT_AMOUNT = re.compile(r"[^0-9.\-]")
+
+
+class ImportFormatError(ValueError):
+    pass
+
+
+@dataclass(frozen=True)
+class ParsedRow:
+    line: int
+    posted_on: date
+    amount_cents: int
+    description: str | None
+    category: str | None
+
+
+@dataclass(frozen=True)
+class RowError:
+    line: int
+    error: str
+
+
+@dataclass(frozen=True)
+class ImportProgress:
+    rows: int = 0
+    inserted: int = 0
+    duplicates: int = 0
+    rejected: int = 0
+    done: bool = False
+    errors: list[RowError] = field(default_factory=list)
+
+
+def _pick(header: list[str], aliases: tuple[str, ...]) -> str | None:
+    lowered = {h.strip().lower(): h for h in header if h}
+    return next((lowered[a] for a in aliases if a in lowered), None)
+
+
+def _parse_date(value: str, date_format: str | None) -> date:
+    value = value.strip()
+    for fmt in (date_format,) if date_format else DATE_FORMATS:
+        try:
+            return datetime.strptime(value, fmt).date()
+        except ValueError:
+            continue
+    raise ValueError(f"unrecognised date {value!r}")
+
+
+def _parse_amount(value: str) -> int:
+    # "$1,234.50", "(12.00)" and "12.00-" are all accepted.
+    value = value.strip()
+    negative = value.startswith("(") and value.endswith(")") or value.endswith("-")
+    digits = _NOT_AMOUNT.sub("", value.strip("()").rstrip("-"))
+    try:
+        cents = ledger_service.to_cents(Decimal(digits))
+    except InvalidOperation:
+        raise ValueError(f"unrecognised amount {value!r}") from None
+    return -abs(cents) if negative else cents
+
+
+@dataclass(frozen=True)
+class _Columns:
+    date: str | None
+    amount: str | None
+    debit: str | None
+    credit: str | None
+    description: str | None
+    category: str | None
+
+
+def parse_rows(
+    lines: Iterable[str], date_format: str | None = None
+) -> Iterator[ParsedRow | RowError]:
+    # The header is checked right away so a bad file fails before anything streams;
+    # the rows are then parsed lazily, one in memory at a time, whatever the file size.
+    reader = csv.DictReader(lines)
+    header = reader.fieldnames or []
+    columns = _Columns(
+        date=_pick(header, DATE_COLUMNS),
+        amount=_pick(header, AMOUNT_COLUMNS),
+        debit=_pick(header, DEBIT_COLUMNS),
+        credit=_pick(header, CREDIT_COLUMNS),
+        description=_pick(header, DESCRIPTION_COLUMNS),
+        category=_pick(header, CATEGORY_COLUMNS),
+    )
+    if columns.date is None or not (columns.amount or columns.debit or columns.credit):
+        raise ImportFormatError("csv needs a date column and an amount or debit/credit column")
+    return _parse_records(reader, columns, date_format)
+
+
+def _field(record: dict[str, str | None], column: str | None) -> str:
+    return (record.get(column) or "").strip() if column else ""
+
+
+def _parse_records(
+    reader: csv.DictReader, columns: _Columns, date_format: str | None
+) -> Iterator[ParsedRow | RowError]:
+    for record in reader:
+        try:
+            posted_on = _parse_date(_field(record, columns.date), date_format)
+            if columns.amount:
+                amount = _parse_amount(_field(record, columns.amount))
+            else:
+                debit = _field(record, columns.debit)
+                credit = _field(record, columns.credit)
+                amount = (abs(_parse_amount(credit)) if credit else 0) - (
+                    abs(_parse_amount(debit)) if debit else 0
+                )
+        except ValueError as exc:
+            yield RowError(reader.line_num, str(exc))
+            continue
+        yield ParsedRow(
+            line=reader.line_num,
+            posted_on=posted_on,
+            amount_cents=amount,
+            description=_field(record, columns.description)[:500] or None,
+            category=_field(record, columns.category)[:64] or None,
+        )
+
+
+def _hashed(account_id: str, rows: Iterable[ParsedRow]) -> Iterator[tuple[str, ParsedRow]]:
+    # Identical rows on one day (two coffees) are told apart by their occurrence number,
+    # so re-importing the same or an overlapping statement hashes them the same way.
+    # Statements are date-ordered, so the counter only spans the current day's run.
+    seen: Counter[tuple] = Counter()
+    current_day = None
+    for row in rows:
+        if row.posted_on != current_day:
+            seen.clear()
+            current_day = row.posted_on
+        key = (row.posted_on, row.amount_cents, " ".join((row.description or "").lower().split()))
+        seen[key] += 1
+        raw = f"{account_id}|{key[0].isoformat()}|{key[1]}|{key[2]}|{seen[key]}"
+        yield hashlib.blake2b(raw.encode(), digest_size=32).hexdigest(), row
+
+
+def import_rows(
+    db: Session,
+    account_id: str,
+    rows: Iterable[ParsedRow | RowError],
+    chunk_size: int = 1000,
+) -> Iterator[ImportProgress]:
+    # One transaction for the whole file; a progress record after every chunk. Each
+    # chunk is a single executemany INSERT ... ON CONFLICT (import_hash) DO NOTHING
+    # RETURNING, so duplicates cost nothing and only new rows move the balances
+    # and category rollups.
+    if db.get(Account, account_id) is None:
+        raise ledger_service.UnknownAccount(account_id)
+    table = Transaction.__table__
+    stmt = (
+        upsert_insert(db, table)
+        .on_conflict_do_nothing(index_elements=["import_hash"])
+        .returning(table.c.posted_on, table.c.amount_cents, table.c.category)
+    )
+    progress = ImportProgress()
+    rejected: list[RowError] = []
+
+    def valid() -> Iterator[ParsedRow]:
+        for row in rows:
+            if isinstance(row, RowError):
+                rejected.append(row)
+            else:
+                yield row
+
+    def advance(seen: int, inserted: int, done: bool = False) -> ImportProgress:
+        errors = (progress.errors + rejected)[:MAX_REPORTED_ERRORS]
+        advanced = ImportProgress(
+            rows=progress.rows + seen + len(rejected),
+            inserted=progress.inserted + inserted,
+            duplicates=progress.duplicates + seen - inserted,
+            rejected=progress.rejected + len(rejected),
+            done=done,
+            errors=errors,
+        )
+        rejected.clear()
+        return advanced
+
+    hashed = _hashed(account_id, valid())
+    try:
+        while chunk := list(islice(hashed, chunk_size)):
+            params = [
+                {
+                    "account_id": account_id,
+                    "posted_on": row.posted_on,
+                    "amount_cents": row.amount_cents,
+                    "description": row.description,
+                    "category": row.category,
+                    "import_hash": digest,
+                }
+                for digest, row in chunk
+            ]
+            inserted = db.execute(stmt, params).all()
+            amounts: defaultdict[date, int] = defaultdict(int)
+            deltas = rollups.new_deltas()
+            for posted_on, amount_cents, category in inserted:
+                amounts[posted_on] += amount_cents
+                rollups.add_delta(deltas, account_id, category, posted_on, amount_cents)
+            ledger_service.apply_postings(db, account_id, amounts)
+            rollups.apply_rollups(db, deltas)
+            progress = advance(len(chunk), len(inserted))
+            yield progress
+        db.commit()
+    except BaseException:
+        db.rollback()
+        raise
+    yield advance(0, 0, done=True)
@@ -0,0 +1,28 @@
+from __future__ import annotations
+
+import asyncio
+
+from starlette.concurrency import run_in_threadpool
+
+from core.logging import get_logger, log_event
+from db.session import SessionLocal
+from engines.finance.ledger import service
+
+logger = get_logger("finance.snapshots")
+
+
+def _snapshot_once() -> int:
+    with SessionLocal() as db:
+        return service.take_snapshots(db)
+
+
+async def run_snapshot_loop(interval_seconds: float) -> None:
+    # Refreshes today's balance snapshot for every account; earlier days are kept
+    # exact by apply_posting, so as_of queries only replay a bounded tail.
+    while True:
+        try:
+            count = await run_in_threadpool(_snapshot_once)
+            log_event(logger, "balance_snapshots", accounts=count)
+        except Exception:
+            logger.exception("balance snapshot failed")
+        await asyncio.sleep(interval_seconds)
@@ -0,0 +1,358 @@
+from __future__ import annotations
+
+from dataclasses import dataclass
+from datetime import date, datetime
+from decimal import ROUND_HALF_EVEN, Decimal
+
+from sqlalchemy import Result, bindparam, delete, func, insert, or_, select, update
+from sqlalchemy.orm import Session
+
+from engines.finance.rollups import service as rollups
+from models.account import Account, AccountKind
+from models.balance_snapshot import BalanceSnapshot
+from models.transaction import Transaction
+
+
+class UnknownAccount(LookupError):
+    pass
+
+
+@dataclass(frozen=True)
+class AccountCreate:
+    name: str
+    kind: str = AccountKind.CASH.value
+    currency: str = "USD"
+    opening_balance_cents: int = 0
+    opened_on: date | None = None
+
+
+@dataclass(frozen=True)
+class TransactionCreate:
+    account_id: str
+    posted_on: date
+    amount_cents: int
+    description: str | None = None
+    category: str | None = None
+
+
+@dataclass(frozen=True)
+class TransactionUpdate:
+    posted_on: date | None = None
+    amount_cents: int | None = None
+    description: str | None = None
+    category: str | None = None
+
+
+@dataclass(frozen=True)
+class Summary:
+    currency: str
+    cash_cents: int
+    net_worth_cents: int
+    updated_at: datetime | None
+
+
+@dataclass(frozen=True)
+class AccountBalance:
+    account_id: str
+    name: str
+    kind: str
+    currency: str
+    balance_cents: int
+
+
+@dataclass(frozen=True)
+class BalancesAsOf:
+    as_of: date
+    currency: str
+    accounts: list[AccountBalance]
+    cash_cents: int
+    net_worth_cents: int
+
+
+def to_cents(amount: Decimal | int | float | str) -> int:
+    return int((Decimal(str(amount)) * 100).to_integral_value(ROUND_HALF_EVEN))
+
+
+def from_cents(cents: int) -> float:
+    return cents / 100
+
+
+def apply_posting(db: Session, account_id: str, posted_on: date, amount_cents: int) -> None:
+    # The one place running aggregates move: the account balance, and every snapshot
+    # taken on or after the posting date (so backdated postings keep history exact).
+    # Callers pass the reversed amount to undo a posting.
+    if amount_cents == 0:
+        return
+    db.execute(
+        update(Account)
+        .where(Account.id == account_id)
+        .values(balance_cents=Account.balance_cents + amount_cents)
+        .execution_options(synchronize_session=False)
+    )
+    db.execute(
+        update(BalanceSnapshot)
+        .where(BalanceSnapshot.account_id == account_id, BalanceSnapshot.as_of >= posted_on)
+        .values(balance_cents=BalanceSnapshot.balance_cents + amount_cents)
+        .execution_options(synchronize_session=False)
+    )
+
+
+def apply_postings(db: Session, account_id: str, amounts_by_date: dict[date, int]) -> None:
+    # Bulk form of apply_posting for many postings to one account: one balance update,
+    # and each affected snapshot is moved once by the sum of postings dated on or before it.
+    if not amounts_by_date:
+        return
+    total = sum(amounts_by_date.values())
+    if total:
+        db.execute(
+            update(Account)
+            .where(Account.id == account_id)
+            .values(balance_cents=Account.balance_cents + total)
+            .execution_options(synchronize_session=False)
+        )
+    first = min(amounts_by_date)
+    snapshot_dates = db.scalars(
+        select(BalanceSnapshot.as_of)
+        .where(BalanceSnapshot.account_id == account_id, BalanceSnapshot.as_of >= first)
+        .order_by(BalanceSnapshot.as_of)
+    ).all()
+    if not snapshot_dates:
+        return
+    postings = sorted(amounts_by_date.items())
+    params, running, i = [], 0, 0
+    for as_of in snapshot_dates:
+        while i < len(postings) and postings[i][0] <= as_of:
+            running += postings[i][1]
+            i += 1
+        if running:
+            params.append({"b_account_id": account_id, "b_as_of": as_of, "delta": running})
+    if params:
+        table = BalanceSnapshot.__table__
+        stmt = (
+            update(table)
+            .where(
+                table.c.account_id == bindparam("b_account_id"),
+                table.c.as_of == bindparam("b_as_of"),
+            )
+            .values(balance_cents=table.c.balance_cents + bindparam("delta"))
+        )
+        db.execute(stmt, params)
+
+
+def list_accounts(db: Session) -> list[Account]:
+    return list(db.scalars(select(Account).order_by(Account.name, Account.id)).all())
+
+
+def get_account(db: Session, account_id: str) -> Account | None:
+    return db.get(Account, account_id)
+
+
+def create_account(db: Session, payload: AccountCreate) -> Account:
+    account = Account(name=payload.name, kind=payload.kind, currency=payload.currency)
+    db.add(account)
+    db.flush()
+    if payload.opening_balance_cents:
+        # Opening balances are ordinary postings, so balance == sum(transactions) holds.
+        _post(
+            db,
+            TransactionCreate(
+                account_id=account.id,
+                posted_on=payload.opened_on or date.today(),
+                amount_cents=payload.opening_balance_cents,
+                description="Opening balance",
+                category="opening",
+            ),
+        )
+    db.commit()
+    db.refresh(account)
+    return account
+
+
+def list_transactions(
+    db: Session, account_id: str | None = None, limit: int = 100, offset: int = 0
+) -> list[Transaction]:
+    stmt = (
+        select(Transaction)
+        .order_by(Transaction.posted_on.desc(), Transaction.created_at.desc(), Transaction.id)
+        .limit(limit)
+        .offset(offset)
+    )
+    if account_id is not None:
+        stmt = stmt.where(Transaction.account_id == account_id)
+    return list(db.scalars(stmt).all())
+
+
+def export_transactions(
+    db: Session, account_id: str | None = None, batch_size: int = 1000
+) -> Result:
+    # Streamed like tasks.service.export_tasks, in (account_id, posted_on) index order.
+    stmt = (
+        select(
+            Transaction.id,
+            Transaction.account_id,
+            Transaction.posted_on,
+            Transaction.amount_cents,
+            Transaction.description,
+            Transaction.category,
+            Transaction.created_at,
+            Transaction.updated_at,
+        )
+        .order_by(Transaction.account_id, Transaction.posted_on, Transaction.id)
+        .execution_options(yield_per=batch_size)
+    )
+    if account_id is not None:
+        stmt = stmt.where(Transaction.account_id == account_id)
+    return db.execute(stmt)
+
+
+def get_transaction(db: Session, transaction_id: str) -> Transaction | None:
+    return db.get(Transaction, transaction_id)
+
+
+def _post(db: Session, payload: TransactionCreate) -> Transaction:
+    txn = Transaction(
+        account_id=payload.account_id,
+        posted_on=payload.posted_on,
+        amount_cents=payload.amount_cents,
+        description=payload.description,
+        category=payload.category,
+    )
+    db.add(txn)
+    db.flush()
+    apply_posting(db, txn.account_id, txn.posted_on, txn.amount_cents)
+    rollups.apply_rollup(db, txn.account_id, txn.category, txn.posted_on, txn.amount_cents)
+    return txn
+
+
+def create_transaction(db: Session, payload: TransactionCreate) -> Transaction:
+    if db.get(Account, payload.account_id) is None:
+        raise UnknownAccount(payload.account_id)
+    txn = _post(db, payload)
+    db.commit()
+    db.refresh(txn)
+    return txn
+
+
+def update_transaction(db: Session, txn: Transaction, payload: TransactionUpdate) -> Transaction:
+    before = (txn.account_id, txn.posted_on, txn.amount_cents, txn.category)
+    if payload.posted_on is not None:
+        txn.posted_on = payload.posted_on
+    if payload.amount_cents is not None:
+        txn.amount_cents = payload.amount_cents
+    if payload.description is not None:
+        txn.description = payload.description
+    if payload.category is not None:
+        txn.category = payload.category
+    db.add(txn)
+    if db.is_modified(txn):
+        db.flush()
+        after = (txn.account_id, txn.posted_on, txn.amount_cents, txn.category)
+        if before[:3] != after[:3]:
+            apply_posting(db, before[0], before[1], -before[2])
+            apply_posting(db, txn.account_id, txn.posted_on, txn.amount_cents)
+        if before != after:
+            deltas = rollups.new_deltas()
+            rollups.add_delta(deltas, before[0], before[3], before[1], before[2], sign=-1)
+            rollups.add_delta(deltas, after[0], after[3], after[1], after[2])
+            rollups.apply_rollups(db, deltas)
+    db.commit()
+    db.refresh(txn)
+    return txn
+
+
+def delete_transaction(db: Session, txn: Transaction) -> None:
+    apply_posting(db, txn.account_id, txn.posted_on, -txn.amount_cents)
+    rollups.apply_rollup(db, txn.account_id, txn.category, txn.posted_on, txn.amount_cents, sign=-1)
+    db.delete(txn)
+    db.commit()
+
+
+def summary(db: Session, currency: str = "USD") -> Summary:
+    # O(accounts): reads the running balances, never the transactions.
+    stmt = (
+        select(Account.kind, func.sum(Account.balance_cents), func.max(Account.updated_at))
+        .where(Account.currency == currency)
+        .group_by(Account.kind)
+    )
+    rows = db.execute(stmt).all()
+    stamps = [updated_at for _, _, updated_at in rows if updated_at is not None]
+    return Summary(
+        currency=currency,
+        cash_cents=sum(total for kind, total, _ in rows if kind == AccountKind.CASH.value),
+        net_worth_cents=sum(total for _, total, _ in rows),
+        updated_at=max(stamps) if stamps else None,
+    )
+
+
+def balances_as_of(db: Session, as_of: date, currency: str = "USD") -> BalancesAsOf:
+    # Nearest snapshot on or before `as_of`, plus only the postings between the two
+    # (an index range scan on (account_id, posted_on) per account).
+    latest = (
+        select(BalanceSnapshot.account_id, func.max(BalanceSnapshot.as_of).label("as_of"))
+        .where(BalanceSnapshot.as_of <= as_of)
+        .group_by(BalanceSnapshot.account_id)
+        .subquery()
+    )
+    snapshots = dict(
+        db.execute(
+            select(BalanceSnapshot.account_id, BalanceSnapshot.balance_cents).join(
+                latest,
+                (latest.c.account_id == BalanceSnapshot.account_id)
+                & (latest.c.as_of == BalanceSnapshot.as_of),
+            )
+        ).all()
+    )
+    deltas = dict(
+        db.execute(
+            select(Transaction.account_id, func.sum(Transaction.amount_cents))
+            .outerjoin(latest, latest.c.account_id == Transaction.account_id)
+            .where(
+                Transaction.posted_on <= as_of,
+                or_(latest.c.as_of.is_(None), Transaction.posted_on > latest.c.as_of),
+            )
+            .group_by(Transaction.account_id)
+        ).all()
+    )
+    accounts = [
+        AccountBalance(
+            account_id=a.id,
+            name=a.name,
+            kind=a.kind,
+            currency=a.currency,
+            balance_cents=snapshots.get(a.id, 0) + deltas.get(a.id, 0),
+        )
+        for a in list_accounts(db)
+    ]
+    in_currency = [a for a in accounts if a.currency == currency]
+    return BalancesAsOf(
+        as_of=as_of,
+        currency=currency,
+        accounts=accounts,
+        cash_cents=sum(a.balance_cents for a in in_currency if a.kind == AccountKind.CASH.value),
+        net_worth_cents=sum(a.balance_cents for a in in_currency),
+    )
+
+
+def take_snapshots(db: Session, as_of: date | None = None) -> int:
+    # End-of-day balance = running balance minus anything posted after that day. The
+    # write and the account row locks come first, so a posting racing this either lands
+    # before the read or adjusts the new snapshot rows after commit.
+    as_of = as_of or date.today()
+    db.execute(delete(BalanceSnapshot).where(BalanceSnapshot.as_of == as_of))
+    accounts = select(Account.id, Account.balance_cents).with_for_update()
+    balances = db.execute(accounts).all()
+    later = dict(
+        db.execute(
+            select(Transaction.account_id, func.sum(Transaction.amount_cents))
+            .where(Transaction.posted_on > as_of)
+            .group_by(Transaction.account_id)
+        ).all()
+    )
+    rows = [
+        {"account_id": a, "as_of": as_of, "balance_cents": balance - later.get(a, 0)}
+        for a, balance in balances
+    ]
+    if rows:
+        db.execute(insert(BalanceSnapshot), rows)
+    db.commit()
+    return len(rows)
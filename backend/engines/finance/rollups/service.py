@@ -0,0 +1,236 @@
+from __future__ import annotations
+
+from collections import defaultdict
+from dataclasses import dataclass
+from datetime import date
+
+from sqlalchemy import and_, bindparam, case, delete, func, insert, select
+from sqlalchemy.orm import Session
+
+from db.dialect import upsert_insert
+from models.account import Account
+from models.category_rollup import CategoryRollup
+from models.transaction import Transaction
+
+# (account_id, category, "YYYY-MM") -> (inflow_cents, outflow_cents, txn_count)
+RollupKey = tuple[str, str, str]
+RollupDeltas = dict[RollupKey, tuple[int, int, int]]
+
+
+@dataclass(frozen=True)
+class RollupRow:
+    month: str
+    category: str | None
+    inflow_cents: int
+    outflow_cents: int
+    txn_count: int
+
+
+@dataclass(frozen=True)
+class RollupDrift:
+    account_id: str
+    category: str | None
+    month: str
+    expected: tuple[int, int, int]
+    actual: tuple[int, int, int]
+
+
+@dataclass(frozen=True)
+class RollupCheck:
+    groups: int
+    drift: list[RollupDrift]
+
+
+def month_key(d: date) -> str:
+    return f"{d.year:04d}-{d.month:02d}"
+
+
+def _month_expr(db: Session, column):
+    if db.get_bind().dialect.name == "postgresql":
+        return func.to_char(column, "YYYY-MM")
+    return func.strftime("%Y-%m", column)
+
+
+def new_deltas() -> defaultdict[RollupKey, tuple[int, int, int]]:
+    return defaultdict(lambda: (0, 0, 0))
+
+
+def add_delta(
+    deltas: defaultdict[RollupKey, tuple[int, int, int]],
+    account_id: str,
+    category: str | None,
+    posted_on: date,
+    amount_cents: int,
+    sign: int = 1,
+) -> None:
+    # sign=-1 takes a transaction back out (delete, or the old side of an update).
+    key = (account_id, category or "", month_key(posted_on))
+    inflow, outflow, count = deltas[key]
+    deltas[key] = (
+        inflow + sign * max(amount_cents, 0),
+        outflow + sign * min(amount_cents, 0),
+        count + sign,
+    )
+
+
+def apply_rollups(db: Session, deltas: RollupDeltas) -> None:
+    # One executemany upsert for the whole batch; groups whose last transaction went
+    # away are deleted so the table only ever holds what a rebuild would produce.
+    changed = [(key, d) for key, d in deltas.items() if d != (0, 0, 0)]
+    if not changed:
+        return
+    table = CategoryRollup.__table__
+    stmt = upsert_insert(db, table)
+    stmt = stmt.on_conflict_do_update(
+        index_elements=["account_id", "category", "month"],
+        set_={
+            "inflow_cents": table.c.inflow_cents + stmt.excluded.inflow_cents,
+            "outflow_cents": table.c.outflow_cents + stmt.excluded.outflow_cents,
+            "txn_count": table.c.txn_count + stmt.excluded.txn_count,
+        },
+    )
+    db.execute(
+        stmt,
+        [
+            {
+                "account_id": account_id,
+                "category": category,
+                "month": month,
+                "inflow_cents": inflow,
+                "outflow_cents": outflow,
+                "txn_count": count,
+            }
+            for (account_id, category, month), (inflow, outflow, count) in changed
+        ],
+    )
+    emptied = [key for key, (_, _, count) in changed if count < 0]
+    if emptied:
+        db.execute(
+            delete(table).where(
+                table.c.account_id == bindparam("b_account_id"),
+                table.c.category == bindparam("b_category"),
+                table.c.month == bindparam("b_month"),
+                table.c.txn_count == 0,
+            ),
+            [{"b_account_id": a, "b_category": c, "b_month": m} for a, c, m in emptied],
+        )
+
+
+def apply_rollup(
+    db: Session,
+    account_id: str,
+    category: str | None,
+    posted_on: date,
+    amount_cents: int,
+    sign: int = 1,
+) -> None:
+    deltas = new_deltas()
+    add_delta(deltas, account_id, category, posted_on, amount_cents, sign)
+    apply_rollups(db, deltas)
+
+
+def _ledger_groups(db: Session, account_id: str | None = None):
+    month = _month_expr(db, Transaction.posted_on)
+    category = func.coalesce(Transaction.category, "")
+    stmt = select(
+        Transaction.account_id,
+        category,
+        month,
+        func.sum(case((Transaction.amount_cents > 0, Transaction.amount_cents), else_=0)),
+        func.sum(case((Transaction.amount_cents < 0, Transaction.amount_cents), else_=0)),
+        func.count(),
+    ).group_by(Transaction.account_id, category, month)
+    if account_id is not None:
+        stmt = stmt.where(Transaction.account_id == account_id)
+    return stmt
+
+
+def rebuild(db: Session, account_id: str | None = None) -> int:
+    # Recomputes the rollups from the raw ledger in one INSERT ... SELECT GROUP BY.
+    table = CategoryRollup.__table__
+    wipe = delete(table)
+    if account_id is not None:
+        wipe = wipe.where(table.c.account_id == account_id)
+    db.execute(wipe)
+    columns = ["account_id", "category", "month", "inflow_cents", "outflow_cents", "txn_count"]
+    result = db.execute(insert(table).from_select(columns, _ledger_groups(db, account_id)))
+    db.commit()
+    return result.rowcount
+
+
+def check(db: Session, account_id: str | None = None) -> RollupCheck:
+    # Compares every rollup group with a fresh GROUP BY over the ledger.
+    expected = {
+        (a, c, m): (inflow, outflow, count)
+        for a, c, m, inflow, outflow, count in db.execute(_ledger_groups(db, account_id)).all()
+    }
+    stmt = select(
+        CategoryRollup.account_id,
+        CategoryRollup.category,
+        CategoryRollup.month,
+        CategoryRollup.inflow_cents,
+        CategoryRollup.outflow_cents,
+        CategoryRollup.txn_count,
+    )
+    if account_id is not None:
+        stmt = stmt.where(CategoryRollup.account_id == account_id)
+    actual = {
+        (a, c, m): (inflow, outflow, count)
+        for a, c, m, inflow, outflow, count in db.execute(stmt).all()
+    }
+    drift = [
+        RollupDrift(
+            account_id=key[0],
+            category=key[1] or None,
+            month=key[2],
+            expected=expected.get(key, (0, 0, 0)),
+            actual=actual.get(key, (0, 0, 0)),
+        )
+        for key in sorted(expected.keys() | actual.keys())
+        if expected.get(key, (0, 0, 0)) != actual.get(key, (0, 0, 0))
+    ]
+    return RollupCheck(groups=len(expected), drift=drift)
+
+
+def query_rollups(
+    db: Session,
+    start: str | None = None,
+    end: str | None = None,
+    account_id: str | None = None,
+    category: str | None = None,
+    currency: str = "USD",
+) -> list[RollupRow]:
+    # Month/category totals across the matching accounts, read from the rollups only
+    # (the accounts join is for the currency filter and touches one row per account).
+    filters = [Account.currency == currency]
+    if start is not None:
+        filters.append(CategoryRollup.month >= start)
+    if end is not None:
+        filters.append(CategoryRollup.month <= end)
+    if account_id is not None:
+        filters.append(CategoryRollup.account_id == account_id)
+    if category is not None:
+        filters.append(CategoryRollup.category == category)
+    stmt = (
+        select(
+            CategoryRollup.month,
+            CategoryRollup.category,
+            func.sum(CategoryRollup.inflow_cents),
+            func.sum(CategoryRollup.outflow_cents),
+            func.sum(CategoryRollup.txn_count),
+        )
+        .join(Account, Account.id == CategoryRollup.account_id)
+        .where(and_(*filters))
+        .group_by(CategoryRollup.month, CategoryRollup.category)
+        .order_by(CategoryRollup.month, CategoryRollup.category)
+    )
+    return [
+        RollupRow(
+            month=month,
+            category=name or None,
+            inflow_cents=inflow,
+            outflow_cents=outflow,
+            txn_count=count,
+        )
+        for month, name, inflow, outflow, count in db.execute(stmt).all()
+    ]
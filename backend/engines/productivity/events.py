@@ -0,0 +1,145 @@
+from __future__ import annotations
+
+import asyncio
+import itertools
+import threading
+from collections.abc import Callable
+from dataclasses import dataclass, field
+from datetime import datetime
+from typing import Any
+
+from sqlalchemy import event
+from sqlalchemy.orm import Session
+
+from core.config import settings
+from core.logging import get_logger
+
+logger = get_logger("productivity.events")
+
+_PENDING_KEY = "productivity.pending_events"
+
+
+@dataclass(frozen=True)
+class ChangeEvent:
+    entity: str  # "task" | "project"
+    op: str  # "created" | "updated" | "deleted"
+    id: str
+    data: dict[str, Any] | None = None
+    seq: int = 0
+
+
+@dataclass(eq=False)
+class Subscription:
+    loop: asyncio.AbstractEventLoop
+    queue: asyncio.Queue[ChangeEvent | None]
+    dropped: bool = field(default=False)
+
+
+class EventBus:
+    # In-process fan-out of committed changes. Publishing is thread-safe (services run in
+    # the threadpool or on the loop); delivery happens on each subscriber's loop. Queues
+    # are bounded: a subscriber that falls behind is dropped and sent a final None.
+
+    def __init__(self, max_queue: int = 256) -> None:
+        self.max_queue = max_queue
+        self._subs: set[Subscription] = set()
+        self._listeners: list[Callable[[list[ChangeEvent]], None]] = []
+        self._lock = threading.Lock()
+        self._seq = itertools.count(1)
+        self.published = 0
+        self.dropped_subscribers = 0
+
+    def subscribe(self) -> Subscription:
+        sub = Subscription(loop=asyncio.get_running_loop(), queue=asyncio.Queue(self.max_queue))
+        with self._lock:
+            self._subs.add(sub)
+        return sub
+
+    def unsubscribe(self, sub: Subscription) -> None:
+        with self._lock:
+            self._subs.discard(sub)
+
+    def add_listener(self, fn: Callable[[list[ChangeEvent]], None]) -> None:
+        # Listeners run synchronously on the committing thread, so they must be quick and
+        # thread-safe (e.g. updating an in-memory index).
+        with self._lock:
+            self._listeners.append(fn)
+
+    def remove_listener(self, fn: Callable[[list[ChangeEvent]], None]) -> None:
+        with self._lock:
+            if fn in self._listeners:
+                self._listeners.remove(fn)
+
+    @property
+    def subscriber_count(self) -> int:
+        return len(self._subs)
+
+    def publish(self, events: list[ChangeEvent]) -> None:
+        if not events:
+            return
+        with self._lock:
+            stamped = [
+                ChangeEvent(e.entity, e.op, e.id, e.data, seq=next(self._seq)) for e in events
+            ]
+            self.published += len(stamped)
+            subs = list(self._subs)
+            listeners = list(self._listeners)
+        for fn in listeners:
+            try:
+                fn(stamped)
+            except Exception:
+                logger.exception("event listener failed")
+        for sub in subs:
+            try:
+                sub.loop.call_soon_threadsafe(self._deliver, sub, stamped)
+            except RuntimeError:
+                # Subscriber's loop is closed.
+                self.unsubscribe(sub)
+
+    def _deliver(self, sub: Subscription, events: list[ChangeEvent]) -> None:
+        if sub.dropped:
+            return
+        for item in events:
+            try:
+                sub.queue.put_nowait(item)
+            except asyncio.QueueFull:
+                self._drop(sub)
+                return
+
+    def _drop(self, sub: Subscription) -> None:
+        sub.dropped = True
+        self.unsubscribe(sub)
+        self.dropped_subscribers += 1
+        while not sub.queue.empty():
+            sub.queue.get_nowait()
+        sub.queue.put_nowait(None)
+
+
+bus = EventBus(max_queue=settings.events_queue_size)
+
+
+def _jsonable(value: Any) -> Any:
+    return value.isoformat() if isinstance(value, datetime) else value
+
+
+def row_data(row: Any, columns: tuple[str, ...]) -> dict[str, Any]:
+    if hasattr(row, "keys"):
+        return {c: _jsonable(row[c]) for c in columns}
+    return {c: _jsonable(getattr(row, c)) for c in columns}
+
+
+def stage(db: Session, *events: ChangeEvent) -> None:
+    # Queue events on the session; they're published only if the transaction commits.
+    db.info.setdefault(_PENDING_KEY, []).extend(events)
+
+
+@event.listens_for(Session, "after_commit")
+def _publish_pending(session: Session) -> None:
+    pending = session.info.pop(_PENDING_KEY, None)
+    if pending:
+        bus.publish(pending)
+
+
+@event.listens_for(Session, "after_rollback")
+def _discard_pending(session: Session) -> None:
+    session.info.pop(_PENDING_KEY, None)
@@ -0,0 +1,39 @@
+from __future__ import annotations
+
+import base64
+import binascii
+import json
+from datetime import datetime
+
+# A cursor carries the full sort key (updated_at, created_at, id) of the last row of a
+# page, so the next page seeks on those values directly: editing or deleting that row
+# afterwards doesn't repeat rows or invalidate the cursor.
+_CURSOR_PREFIX = "k2:"
+
+
+class InvalidCursor(ValueError):
+    pass
+
+
+def encode_cursor(updated_at: datetime, created_at: datetime, item_id: str) -> str:
+    key = json.dumps([updated_at.isoformat(), created_at.isoformat(), item_id])
+    raw = f"{_CURSOR_PREFIX}{key}".encode()
+    return base64.urlsafe_b64encode(raw).decode().rstrip("=")
+
+
+def decode_cursor(cursor: str) -> tuple[datetime, datetime, str]:
+    padded = cursor + "=" * (-len(cursor) % 4)
+    try:
+        raw = base64.urlsafe_b64decode(padded.encode()).decode()
+    except (binascii.Error, UnicodeDecodeError, ValueError) as exc:
+        raise InvalidCursor(cursor) from exc
+    if not raw.startswith(_CURSOR_PREFIX):
+        raise InvalidCursor(cursor)
+    try:
+        updated_at, created_at, item_id = json.loads(raw.removeprefix(_CURSOR_PREFIX))
+        key = datetime.fromisoformat(updated_at), datetime.fromisoformat(created_at), item_id
+    except (TypeError, ValueError) as exc:
+        raise InvalidCursor(cursor) from exc
+    if not isinstance(item_id, str) or not item_id:
+        raise InvalidCursor(cursor)
+    return key
@@ -1,11 +1,18 @@
 from __future__ import annotations
 
-from dataclasses import dataclass
+from collections.abc import Sequence
+from dataclasses import asdict, dataclass
 
-from sqlalchemy import select
+from sqlalchemy import Row, RowMapping, delete, func, insert, select, tuple_, update
 from sqlalchemy.orm import Session
 
+from db.dialect import stored_datetime
+from engines.productivity import events, versions
+from engines.productivity.pagination import decode_cursor
+from engines.productivity.stats import service as stats_service
+from engines.productivity.sync import service as sync_service
 from models.project import Project
+from models.task import Task
 
 
 @dataclass(frozen=True)
@@ -20,9 +27,49 @@ class ProjectUpdate:
     description: str | None = None
 
 
-def list_projects(db: Session, limit: int = 100, offset: int = 0) -> list[Project]:
-    stmt = select(Project).order_by(Project.updated_at.desc(), Project.created_at.desc()).limit(limit).offset(offset)
-    return list(db.scalars(stmt).all())
+_PROJECT_COLUMNS = (
+    Project.id,
+    Project.name,
+    Project.description,
+    Project.created_at,
+    Project.updated_at,
+)
+
+
+_PROJECT_FIELDS = tuple(c.key for c in _PROJECT_COLUMNS)
+
+
+def _project_event(op: str, project: Project | RowMapping) -> events.ChangeEvent:
+    data = events.row_data(project, _PROJECT_FIELDS)
+    return events.ChangeEvent("project", op, data["id"], data)
+
+
+def _changes(payload: ProjectUpdate) -> dict:
+    return {k: v for k, v in asdict(payload).items() if v is not None}
+
+
+def list_projects(
+    db: Session, limit: int = 100, offset: int = 0, after: str | None = None
+) -> list[Row]:
+    # Column rows in _PROJECT_FIELDS order, like tasks.service.list_tasks.
+    stmt = (
+        select(*_PROJECT_COLUMNS)
+        .order_by(Project.updated_at.desc(), Project.created_at.desc(), Project.id.desc())
+        .limit(limit)
+    )
+    if after is None:
+        return list(db.execute(stmt.offset(offset)).all())
+
+    updated_at, created_at, anchor_id = decode_cursor(after)
+    anchor = tuple_(
+        stored_datetime(db, updated_at), stored_datetime(db, created_at), anchor_id
+    )
+    stmt = stmt.where(tuple_(Project.updated_at, Project.created_at, Project.id) < anchor)
+    return list(db.execute(stmt).all())
+
+
+def count_projects(db: Session) -> int:
+    return db.scalar(select(func.count()).select_from(Project)) or 0
 
 
 def get_project(db: Session, project_id: str) -> Project | None:
@@ -30,8 +77,13 @@ def get_project(db: Session, project_id: str) -> Project | None:
 
 
 def create_project(db: Session, payload: ProjectCreate) -> Project:
-    project = Project(name=payload.name, description=payload.description)
+    project = Project(
+        name=payload.name, description=payload.description, change_seq=versions.next_seq(db)
+    )
     db.add(project)
+    db.flush()
+    events.stage(db, _project_event("created", project))
+    versions.bump(db, versions.PROJECTS)
     db.commit()
     db.refresh(project)
     return project
@@ -43,12 +95,97 @@ def update_project(db: Session, project: Project, payload: ProjectUpdate) -> Pro
     if payload.description is not None:
         project.description = payload.description
     db.add(project)
+    if db.is_modified(project):
+        project.change_seq = versions.next_seq(db)
+        db.flush()
+        events.stage(db, _project_event("updated", project))
+        versions.bump(db, versions.PROJECTS)
     db.commit()
     db.refresh(project)
     return project
 
 
 def delete_project(db: Session, project: Project) -> None:
+    # Project.tasks cascades (delete-orphan), so its tasks go too.
+    sync_service.record_deletions(db, "task", [task.id for task in project.tasks])
+    sync_service.record_deletions(db, "project", [project.id])
+    events.stage(
+        db,
+        *(events.ChangeEvent("task", "deleted", task.id) for task in project.tasks),
+        events.ChangeEvent("project", "deleted", project.id),
+    )
+    versions.bump(db, versions.PROJECTS, *((versions.TASKS,) if project.tasks else ()))
+    stats_service.delete_for_projects(db, [project.id])
     db.delete(project)
     db.commit()
 
+
+def create_projects(db: Session, payloads: Sequence[ProjectCreate]) -> list[RowMapping]:
+    if not payloads:
+        return []
+    first = versions.next_seq(db, len(payloads))
+    params = [{**asdict(p), "change_seq": first + i} for i, p in enumerate(payloads)]
+    stmt = insert(Project).returning(*_PROJECT_COLUMNS, sort_by_parameter_order=True)
+    rows = db.execute(stmt, params).mappings().all()
+    events.stage(db, *(_project_event("created", row) for row in rows))
+    versions.bump(db, versions.PROJECTS)
+    db.commit()
+    return list(rows)
+
+
+def update_projects(
+    db: Session, updates: Sequence[tuple[str, ProjectUpdate]]
+) -> list[RowMapping | None]:
+    ids = {project_id for project_id, _ in updates}
+    existing = set(db.scalars(select(Project.id).where(Project.id.in_(ids))).all())
+    params = [
+        {"id": project_id, **changes}
+        for project_id, payload in updates
+        if project_id in existing and (changes := _changes(payload))
+    ]
+    if params:
+        first = versions.next_seq(db, len(params))
+        for i, p in enumerate(params):
+            p["change_seq"] = first + i
+        db.execute(update(Project), params)
+    stmt = select(*_PROJECT_COLUMNS).where(Project.id.in_(existing))
+    rows = db.execute(stmt).mappings().all()
+    by_id = {row["id"]: row for row in rows}
+    changed = {p["id"] for p in params}
+    events.stage(db, *(_project_event("updated", by_id[project_id]) for project_id in changed))
+    if changed:
+        versions.bump(db, versions.PROJECTS)
+    db.commit()
+    return [by_id.get(project_id) for project_id, _ in updates]
+
+
+def delete_projects(db: Session, project_ids: Sequence[str]) -> list[bool]:
+    ids = set(project_ids)
+    # Mirror the ORM delete-orphan cascade on Project.tasks used by delete_project.
+    task_ids = db.scalars(
+        delete(Task)
+        .where(Task.project_id.in_(ids))
+        .returning(Task.id)
+        .execution_options(synchronize_session=False)
+    ).all()
+    stats_service.delete_for_projects(db, ids)
+    stmt = (
+        delete(Project)
+        .where(Project.id.in_(ids))
+        .returning(Project.id)
+        .execution_options(synchronize_session=False)
+    )
+    deleted = set(db.scalars(stmt).all())
+    sync_service.record_deletions(db, "task", task_ids)
+    sync_service.record_deletions(db, "project", sorted(deleted))
+    events.stage(
+        db,
+        *(events.ChangeEvent("task", "deleted", task_id) for task_id in task_ids),
+        *(events.ChangeEvent("project", "deleted", project_id) for project_id in deleted),
+    )
+    if task_ids:
+        versions.bump(db, versions.TASKS)
+    if deleted:
+        versions.bump(db, versions.PROJECTS)
+    db.commit()
+    return [project_id in deleted for project_id in project_ids]
@@ -0,0 +1,146 @@
+from __future__ import annotations
+
+import html
+import re
+from dataclasses import dataclass
+
+from sqlalchemy import text
+from sqlalchemy.orm import Session
+
+HIGHLIGHT_START = "<mark>"
+HIGHLIGHT_END = "</mark>"
+
+# The database brackets matches with these private-use characters; the text is
+# HTML-escaped afterwards and only then are they turned into <mark> tags.
+_MATCH_START = "\ue000"
+_MATCH_END = "\ue001"
+
+_TOKEN_RE = re.compile(r"\w+", re.UNICODE)
+
+
+class SearchUnavailable(RuntimeError):
+    pass
+
+
+@dataclass(frozen=True)
+class SearchHit:
+    kind: str
+    id: str
+    title: str
+    title_html: str
+    snippet: str | None
+    rank: float
+
+
+# bm25() is "lower is better"; titles/names weigh 10x the description.
+_SQLITE_SEARCH = text(
+    """
+    SELECT 'task' AS kind, t.id AS id, t.title AS title,
+           highlight(tasks_fts, 0, :hl_start, :hl_end) AS title_html,
+           snippet(tasks_fts, 1, :hl_start, :hl_end, '…', 16) AS snippet,
+           bm25(tasks_fts, 10.0, 1.0) AS rank
+    FROM tasks_fts JOIN tasks AS t ON t.search_rowid = tasks_fts.rowid
+    WHERE tasks_fts MATCH :query
+    UNION ALL
+    SELECT 'project', p.id, p.name,
+           highlight(projects_fts, 0, :hl_start, :hl_end),
+           snippet(projects_fts, 1, :hl_start, :hl_end, '…', 16),
+           bm25(projects_fts, 10.0, 1.0)
+    FROM projects_fts JOIN projects AS p ON p.search_rowid = projects_fts.rowid
+    WHERE projects_fts MATCH :query
+    ORDER BY rank
+    LIMIT :limit OFFSET :offset
+    """
+)
+
+_PG_MARKERS = f"StartSel={_MATCH_START}, StopSel={_MATCH_END}"
+_PG_HEADLINE_TITLE = f"{_PG_MARKERS}, HighlightAll=true"
+_PG_HEADLINE_SNIPPET = f"{_PG_MARKERS}, MaxFragments=1, MaxWords=16, MinWords=6"
+
+_PG_SEARCH = text(
+    f"""
+    WITH q AS (SELECT websearch_to_tsquery('english', :query) AS query)
+    SELECT * FROM (
+        SELECT 'task' AS kind, t.id AS id, t.title AS title,
+               ts_headline('english', t.title, q.query, '{_PG_HEADLINE_TITLE}') AS title_html,
+               ts_headline('english', coalesce(t.description, ''), q.query,
+                           '{_PG_HEADLINE_SNIPPET}') AS snippet,
+               -ts_rank(t.search_vector, q.query) AS rank
+        FROM tasks AS t, q
+        WHERE t.search_vector @@ q.query
+        UNION ALL
+        SELECT 'project', p.id, p.name,
+               ts_headline('english', p.name, q.query, '{_PG_HEADLINE_TITLE}'),
+               ts_headline('english', coalesce(p.description, ''), q.query,
+                           '{_PG_HEADLINE_SNIPPET}'),
+               -ts_rank(p.search_vector, q.query)
+        FROM projects AS p, q
+        WHERE p.search_vector @@ q.query
+    ) AS hits
+    ORDER BY rank
+    LIMIT :limit OFFSET :offset
+    """
+)
+
+
+def _fts5_query(query: str) -> str | None:
+    # Quote every token so user input can't inject FTS5 syntax; trailing * gives
+    # prefix matching for search-as-you-type. Tokens are ANDed.
+    # Unlike Postgres ('english' config), SQLite does not stem: "plan" finds "planning"
+    # but "plans" does not. A porter tokenizer would fix that and break the prefixes
+    # instead, since "meeting" is indexed as "meet" and "meeti"* no longer matches it.
+    tokens = _TOKEN_RE.findall(query)
+    if not tokens:
+        return None
+    return " ".join(f'"{token}"*' for token in tokens)
+
+
+def _marked_html(value: str) -> str:
+    escaped = html.escape(value)
+    return escaped.replace(_MATCH_START, HIGHLIGHT_START).replace(_MATCH_END, HIGHLIGHT_END)
+
+
+def search(db: Session, query: str, limit: int = 20, offset: int = 0) -> list[SearchHit]:
+    dialect = db.get_bind().dialect.name
+    if dialect == "sqlite":
+        match = _fts5_query(query)
+        if match is None:
+            return []
+        rows = db.execute(
+            _SQLITE_SEARCH,
+            {
+                "query": match,
+                "hl_start": _MATCH_START,
+                "hl_end": _MATCH_END,
+                "limit": limit,
+                "offset": offset,
+            },
+        )
+    elif dialect == "postgresql":
+        if not query.strip():
+            return []
+        rows = db.execute(_PG_SEARCH, {"query": query, "limit": limit, "offset": offset})
+    else:
+        raise SearchUnavailable(f"full-text search is not available on {dialect!r}")
+
+    return [
+        SearchHit(
+            kind=row.kind,
+            id=row.id,
+            title=row.title,
+            title_html=_marked_html(row.title_html),
+            snippet=_marked_html(row.snippet) if row.snippet else None,
+            rank=-float(row.rank),
+        )
+        for row in rows
+    ]
+
+
+def rebuild_index(db: Session) -> None:
+    # SQLite only: 'rebuild' re-reads the content tables into the FTS5 indexes, e.g.
+    # after rows were written with the triggers missing. Postgres needs nothing.
+    if db.get_bind().dialect.name != "sqlite":
+        return
+    db.execute(text("INSERT INTO tasks_fts(tasks_fts) VALUES ('rebuild')"))
+    db.execute(text("INSERT INTO projects_fts(projects_fts) VALUES ('rebuild')"))
+    db.commit()
@@ -0,0 +1,34 @@
+from __future__ import annotations
+
+import argparse
+import sys
+
+from db.session import SessionLocal
+from engines.productivity.stats import service
+
+
+def main(argv: list[str] | None = None) -> int:
+    parser = argparse.ArgumentParser(
+        prog="python -m engines.productivity.stats",
+        description="Rebuild or check the per-project task counters against the tasks table.",
+    )
+    parser.add_argument("command", choices=["rebuild", "check"])
+    parser.add_argument("--project", default=None, help="limit to one project id")
+    args = parser.parse_args(argv)
+
+    with SessionLocal() as db:
+        if args.command == "rebuild":
+            print(f"groups={service.rebuild(db, args.project)}")
+            return 0
+        result = service.check(db, args.project)
+    for d in result.drift:
+        print(
+            f"{d.project_id} {d.status}: expected={d.expected} actual={d.actual}",
+            file=sys.stderr,
+        )
+    print(f"groups={result.groups} drift={len(result.drift)}")
+    return 1 if result.drift else 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
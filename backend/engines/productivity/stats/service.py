@@ -0,0 +1,159 @@
+from __future__ import annotations
+
+from collections import Counter
+from collections.abc import Iterable, Sequence
+from dataclasses import dataclass
+
+from sqlalchemy import bindparam, delete, func, insert, select
+from sqlalchemy.orm import Session
+
+from db.dialect import upsert_insert
+from models.project_task_count import ProjectTaskCount
+from models.task import Task, TaskStatus
+
+# (project_id, status) -> change in task count; tasks without a project are not counted.
+CountKey = tuple[str, str]
+CountDeltas = Counter[CountKey]
+
+
+@dataclass(frozen=True)
+class ProjectStats:
+    project_id: str
+    by_status: dict[str, int]
+
+    @property
+    def total(self) -> int:
+        return sum(self.by_status.values())
+
+
+@dataclass(frozen=True)
+class CountDrift:
+    project_id: str
+    status: str
+    expected: int
+    actual: int
+
+
+@dataclass(frozen=True)
+class CountCheck:
+    groups: int
+    drift: list[CountDrift]
+
+
+def add_delta(
+    deltas: CountDeltas, project_id: str | None, status: str, sign: int = 1
+) -> None:
+    # sign=-1 takes a task back out (delete, or the old side of a move/status change).
+    if project_id is not None:
+        deltas[(project_id, status)] += sign
+
+
+def move_deltas(
+    deltas: CountDeltas, before: tuple[str | None, str], after: tuple[str | None, str]
+) -> None:
+    if before != after:
+        add_delta(deltas, *before, sign=-1)
+        add_delta(deltas, *after)
+
+
+def apply_counts(db: Session, deltas: CountDeltas) -> None:
+    # Runs in the caller's transaction: one executemany upsert, then groups that reached
+    # zero are deleted so the table only ever holds what a rebuild would produce.
+    changed = [(key, d) for key, d in deltas.items() if d]
+    if not changed:
+        return
+    table = ProjectTaskCount.__table__
+    stmt = upsert_insert(db, table)
+    stmt = stmt.on_conflict_do_update(
+        index_elements=["project_id", "status"],
+        set_={"task_count": table.c.task_count + stmt.excluded.task_count},
+    )
+    db.execute(
+        stmt,
+        [
+            {"project_id": project_id, "status": status, "task_count": d}
+            for (project_id, status), d in changed
+        ],
+    )
+    emptied = [key for key, d in changed if d < 0]
+    if emptied:
+        db.execute(
+            delete(table).where(
+                table.c.project_id == bindparam("b_project_id"),
+                table.c.status == bindparam("b_status"),
+                table.c.task_count == 0,
+            ),
+            [{"b_project_id": p, "b_status": s} for p, s in emptied],
+        )
+
+
+def stats_for(db: Session, project_ids: Sequence[str]) -> dict[str, ProjectStats]:
+    # One primary-key IN lookup for a whole page of projects. Every status is present,
+    # zero when the project has no such tasks.
+    if not project_ids:
+        return {}
+    out = {
+        project_id: ProjectStats(project_id, {s.value: 0 for s in TaskStatus})
+        for project_id in project_ids
+    }
+    stmt = select(
+        ProjectTaskCount.project_id, ProjectTaskCount.status, ProjectTaskCount.task_count
+    ).where(ProjectTaskCount.project_id.in_(set(project_ids)))
+    for project_id, status, count in db.execute(stmt).all():
+        out[project_id].by_status[status] = count
+    return out
+
+
+def _task_groups(project_ids: Iterable[str] | None = None):
+    stmt = (
+        select(Task.project_id, Task.status, func.count())
+        .where(Task.project_id.is_not(None))
+        .group_by(Task.project_id, Task.status)
+    )
+    if project_ids is not None:
+        stmt = stmt.where(Task.project_id.in_(set(project_ids)))
+    return stmt
+
+
+def rebuild(db: Session, project_id: str | None = None) -> int:
+    # Recomputes the counters from the tasks table in one INSERT ... SELECT GROUP BY.
+    table = ProjectTaskCount.__table__
+    ids = None if project_id is None else [project_id]
+    wipe = delete(table)
+    if project_id is not None:
+        wipe = wipe.where(table.c.project_id == project_id)
+    db.execute(wipe)
+    columns = ["project_id", "status", "task_count"]
+    result = db.execute(insert(table).from_select(columns, _task_groups(ids)))
+    db.commit()
+    return result.rowcount
+
+
+def check(db: Session, project_id: str | None = None) -> CountCheck:
+    # Compares every counter with a fresh GROUP BY over the tasks.
+    ids = None if project_id is None else [project_id]
+    expected = {(p, s): n for p, s, n in db.execute(_task_groups(ids)).all()}
+    stmt = select(
+        ProjectTaskCount.project_id, ProjectTaskCount.status, ProjectTaskCount.task_count
+    )
+    if project_id is not None:
+        stmt = stmt.where(ProjectTaskCount.project_id == project_id)
+    actual = {(p, s): n for p, s, n in db.execute(stmt).all()}
+    drift = [
+        CountDrift(
+            project_id=key[0],
+            status=key[1],
+            expected=expected.get(key, 0),
+            actual=actual.get(key, 0),
+        )
+        for key in sorted(expected.keys() | actual.keys())
+        if expected.get(key, 0) != actual.get(key, 0)
+    ]
+    return CountCheck(groups=len(expected), drift=drift)
+
+
+def delete_for_projects(db: Session, project_ids: Iterable[str]) -> None:
+    # Deleting a project deletes its tasks with it (see projects.service).
+    db.execute(
+        delete(ProjectTaskCount).where(ProjectTaskCount.project_id.in_(set(project_ids)))
+    )
@@ -0,0 +1,57 @@
+from __future__ import annotations
+
+from collections.abc import Sequence
+from dataclasses import dataclass
+
+from sqlalchemy import insert, select
+from sqlalchemy.orm import Session
+
+from engines.productivity import versions
+from models.project import Project
+from models.task import Task
+from models.tombstone import Tombstone
+
+
+@dataclass(frozen=True)
+class ChangeSet:
+    tasks: list[Task]
+    projects: list[Project]
+    deleted: list[Tombstone]
+    next_since: int
+    has_more: bool
+
+
+def record_deletions(db: Session, entity: str, entity_ids: Sequence[str]) -> None:
+    if not entity_ids:
+        return
+    first = versions.next_seq(db, len(entity_ids))
+    db.execute(
+        insert(Tombstone),
+        [
+            {"entity": entity, "entity_id": entity_id, "change_seq": first + i}
+            for i, entity_id in enumerate(entity_ids)
+        ],
+    )
+
+
+def changes_since(db: Session, since: int = 0, limit: int = 500) -> ChangeSet:
+    # Each source is an index range scan on change_seq; limit + 1 rows from each is
+    # enough to fill the page and tell whether anything is left after it.
+    sources = (
+        (Task, Task.change_seq),
+        (Project, Project.change_seq),
+        (Tombstone, Tombstone.change_seq),
+    )
+    merged = []
+    for model, seq in sources:
+        stmt = select(model).where(seq > since).order_by(seq).limit(limit + 1)
+        merged.extend(db.scalars(stmt).all())
+    merged.sort(key=lambda row: row.change_seq)
+    page = merged[:limit]
+    return ChangeSet(
+        tasks=[row for row in page if isinstance(row, Task)],
+        projects=[row for row in page if isinstance(row, Project)],
+        deleted=[row for row in page if isinstance(row, Tombstone)],
+        next_since=page[-1].change_seq if page else since,
+        has_more=len(merged) > limit,
+    )
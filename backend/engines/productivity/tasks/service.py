@@ -1,11 +1,17 @@
 from __future__ import annotations
 
-from dataclasses import dataclass
+from collections.abc import Sequence
+from dataclasses import asdict, dataclass
 
-from sqlalchemy import select
+from sqlalchemy import Result, Row, RowMapping, delete, func, insert, select, tuple_, update
 from sqlalchemy.orm import Session
 
-from models.task import Task
+from db.dialect import stored_datetime
+from engines.productivity import events, versions
+from engines.productivity.pagination import decode_cursor
+from engines.productivity.stats import service as stats_service
+from engines.productivity.sync import service as sync_service
+from models.task import Task, TaskStatus
 
 
 @dataclass(frozen=True)
@@ -26,30 +32,139 @@ class TaskUpdate:
     priority: int | None = None
 
 
-def list_tasks(db: Session, limit: int = 100, offset: int = 0) -> list[Task]:
-    stmt = select(Task).order_by(Task.updated_at.desc(), Task.created_at.desc()).limit(limit).offset(offset)
-    return list(db.scalars(stmt).all())
+@dataclass(frozen=True)
+class BoardColumn:
+    status: str
+    total: int
+    tasks: list[Task]
+
+
+_TASK_COLUMNS = (
+    Task.id,
+    Task.project_id,
+    Task.title,
+    Task.description,
+    Task.status,
+    Task.priority,
+    Task.created_at,
+    Task.updated_at,
+)
+
+
+_TASK_FIELDS = tuple(c.key for c in _TASK_COLUMNS)
+
+
+def _task_event(op: str, task: Task | RowMapping) -> events.ChangeEvent:
+    data = events.row_data(task, _TASK_FIELDS)
+    return events.ChangeEvent("task", op, data["id"], data)
+
+
+def _changes(payload: TaskUpdate) -> dict:
+    return {k: v for k, v in asdict(payload).items() if v is not None}
+
+
+def list_tasks(
+    db: Session, limit: int = 100, offset: int = 0, after: str | None = None
+) -> list[Row]:
+    # Plain column rows (fields in _TASK_FIELDS order), not ORM objects: a page is
+    # serialized straight to JSON, so nothing is hydrated or tracked in the session.
+    stmt = (
+        select(*_TASK_COLUMNS)
+        .order_by(Task.updated_at.desc(), Task.created_at.desc(), Task.id.desc())
+        .limit(limit)
+    )
+    if after is None:
+        return list(db.execute(stmt.offset(offset)).all())
+
+    # Keyset mode: seek past the cursor's sort key instead of skipping `offset` rows,
+    # so every page is an index range scan on (updated_at, created_at, id).
+    updated_at, created_at, anchor_id = decode_cursor(after)
+    anchor = tuple_(
+        stored_datetime(db, updated_at), stored_datetime(db, created_at), anchor_id
+    )
+    stmt = stmt.where(tuple_(Task.updated_at, Task.created_at, Task.id) < anchor)
+    return list(db.execute(stmt).all())
+
+
+def export_tasks(db: Session, batch_size: int = 1000) -> Result:
+    # Every task, in primary-key order, through a server-side cursor (yield_per implies
+    # stream_results): only `batch_size` rows are buffered at a time.
+    stmt = select(*_TASK_COLUMNS).order_by(Task.id).execution_options(yield_per=batch_size)
+    return db.execute(stmt)
+
+
+def count_tasks(db: Session) -> int:
+    return db.scalar(select(func.count()).select_from(Task)) or 0
+
+
+def status_counts(db: Session) -> dict[str, int]:
+    counts = select(Task.status, func.count()).group_by(Task.status)
+    totals = dict(db.execute(counts).all())
+    return {task_status.value: totals.get(task_status.value, 0) for task_status in TaskStatus}
+
+
+def board(db: Session, per_column: int = 50) -> list[BoardColumn]:
+    totals = status_counts(db)
+    columns = []
+    for task_status in TaskStatus:
+        # One range scan per column on (status, priority, updated_at, id).
+        stmt = (
+            select(Task)
+            .where(Task.status == task_status.value)
+            .order_by(Task.priority.desc(), Task.updated_at.desc(), Task.id.desc())
+            .limit(per_column)
+        )
+        columns.append(
+            BoardColumn(
+                status=task_status.value,
+                total=totals[task_status.value],
+                tasks=list(db.scalars(stmt).all()),
+            )
+        )
+    return columns
 
 
 def get_task(db: Session, task_id: str) -> Task | None:
     return db.get(Task, task_id)
 
 
-def create_task(db: Session, payload: TaskCreate) -> Task:
+def find_task_by_title(db: Session, title: str) -> Task | None:
+    # Most recently touched task whose title matches case-insensitively.
+    stmt = (
+        select(Task)
+        .where(func.lower(Task.title) == title.strip().lower())
+        .order_by(Task.updated_at.desc(), Task.id.desc())
+        .limit(1)
+    )
+    return db.scalars(stmt).first()
+
+
+def create_task(db: Session, payload: TaskCreate, *, commit: bool = True) -> Task:
     task = Task(
         title=payload.title,
         description=payload.description,
         project_id=payload.project_id,
         status=payload.status,
         priority=payload.priority,
+        change_seq=versions.next_seq(db),
     )
     db.add(task)
-    db.commit()
-    db.refresh(task)
+    db.flush()
+    counts = stats_service.CountDeltas()
+    stats_service.add_delta(counts, task.project_id, task.status)
+    stats_service.apply_counts(db, counts)
+    events.stage(db, _task_event("created", task))
+    versions.bump(db, versions.TASKS)
+    # commit=False leaves the flushed row in the caller's transaction (e.g. a batch of AI
+    # tool calls); staged events are published when that transaction commits.
+    if commit:
+        db.commit()
+        db.refresh(task)
     return task
 
 
-def update_task(db: Session, task: Task, payload: TaskUpdate) -> Task:
+def update_task(db: Session, task: Task, payload: TaskUpdate, *, commit: bool = True) -> Task:
+    before = (task.project_id, task.status)
     if payload.title is not None:
         task.title = payload.title
     if payload.description is not None:
@@ -62,12 +177,105 @@ def update_task(db: Session, task: Task, payload: TaskUpdate) -> Task:
         task.priority = payload.priority
 
     db.add(task)
-    db.commit()
-    db.refresh(task)
+    if db.is_modified(task):
+        task.change_seq = versions.next_seq(db)
+        db.flush()
+        counts = stats_service.CountDeltas()
+        stats_service.move_deltas(counts, before, (task.project_id, task.status))
+        stats_service.apply_counts(db, counts)
+        events.stage(db, _task_event("updated", task))
+        versions.bump(db, versions.TASKS)
+    if commit:
+        db.commit()
+        db.refresh(task)
     return task
 
 
 def delete_task(db: Session, task: Task) -> None:
+    counts = stats_service.CountDeltas()
+    stats_service.add_delta(counts, task.project_id, task.status, sign=-1)
+    stats_service.apply_counts(db, counts)
     db.delete(task)
+    sync_service.record_deletions(db, "task", [task.id])
+    events.stage(db, events.ChangeEvent("task", "deleted", task.id))
+    versions.bump(db, versions.TASKS)
     db.commit()
 
+
+# Batch paths: one transaction and a handful of statements per batch instead of a
+# commit + refresh per row. They return plain column mappings (not ORM objects) so
+# nothing is expired and re-fetched after commit.
+
+
+def create_tasks(db: Session, payloads: Sequence[TaskCreate]) -> list[RowMapping]:
+    if not payloads:
+        return []
+    first = versions.next_seq(db, len(payloads))
+    params = [{**asdict(p), "change_seq": first + i} for i, p in enumerate(payloads)]
+    stmt = insert(Task).returning(*_TASK_COLUMNS, sort_by_parameter_order=True)
+    rows = db.execute(stmt, params).mappings().all()
+    counts = stats_service.CountDeltas()
+    for row in rows:
+        stats_service.add_delta(counts, row["project_id"], row["status"])
+    stats_service.apply_counts(db, counts)
+    events.stage(db, *(_task_event("created", row) for row in rows))
+    versions.bump(db, versions.TASKS)
+    db.commit()
+    return list(rows)
+
+
+def update_tasks(
+    db: Session, updates: Sequence[tuple[str, TaskUpdate]]
+) -> list[RowMapping | None]:
+    ids = {task_id for task_id, _ in updates}
+    before = {
+        task_id: (project_id, task_status)
+        for task_id, project_id, task_status in db.execute(
+            select(Task.id, Task.project_id, Task.status).where(Task.id.in_(ids))
+        ).all()
+    }
+    existing = set(before)
+    params = [
+        {"id": task_id, **changes}
+        for task_id, payload in updates
+        if task_id in existing and (changes := _changes(payload))
+    ]
+    if params:
+        first = versions.next_seq(db, len(params))
+        for i, p in enumerate(params):
+            p["change_seq"] = first + i
+        db.execute(update(Task), params)
+    rows = db.execute(select(*_TASK_COLUMNS).where(Task.id.in_(existing))).mappings().all()
+    by_id = {row["id"]: row for row in rows}
+    changed = {p["id"] for p in params}
+    counts = stats_service.CountDeltas()
+    for task_id in changed:
+        row = by_id[task_id]
+        stats_service.move_deltas(counts, before[task_id], (row["project_id"], row["status"]))
+    stats_service.apply_counts(db, counts)
+    events.stage(db, *(_task_event("updated", by_id[task_id]) for task_id in changed))
+    if changed:
+        versions.bump(db, versions.TASKS)
+    db.commit()
+    return [by_id.get(task_id) for task_id, _ in updates]
+
+
+def delete_tasks(db: Session, task_ids: Sequence[str]) -> list[bool]:
+    stmt = (
+        delete(Task)
+        .where(Task.id.in_(set(task_ids)))
+        .returning(Task.id, Task.project_id, Task.status)
+        .execution_options(synchronize_session=False)
+    )
+    counts = stats_service.CountDeltas()
+    deleted = set()
+    for task_id, project_id, task_status in db.execute(stmt).all():
+        deleted.add(task_id)
+        stats_service.add_delta(counts, project_id, task_status, sign=-1)
+    stats_service.apply_counts(db, counts)
+    sync_service.record_deletions(db, "task", sorted(deleted))
+    events.stage(db, *(events.ChangeEvent("task", "deleted", task_id) for task_id in deleted))
+    if deleted:
+        versions.bump(db, versions.TASKS)
+    db.commit()
+    return [task_id in deleted for task_id in task_ids]
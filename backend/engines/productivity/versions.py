@@ -0,0 +1,45 @@
+from __future__ import annotations
+
+import hashlib
+
+from sqlalchemy import select, update
+from sqlalchemy.orm import Session
+
+from models.counter import Counter
+
+TASKS = "tasks"
+PROJECTS = "projects"
+CHANGE_SEQ = "change_seq"
+
+
+def bump(db: Session, *tables: str) -> None:
+    # Called by every write path inside its transaction, so the version moves exactly
+    # when the table's committed contents do.
+    db.execute(
+        update(Counter).where(Counter.name.in_(tables)).values(value=Counter.value + 1)
+    )
+
+
+def next_seq(db: Session, count: int = 1) -> int:
+    # Reserves `count` consecutive change sequence numbers and returns the first. The
+    # counter row stays locked until commit, so sequence order matches commit order.
+    last = db.execute(
+        update(Counter)
+        .where(Counter.name == CHANGE_SEQ)
+        .values(value=Counter.value + count)
+        .returning(Counter.value)
+    ).scalar_one()
+    return last - count + 1
+
+
+def current(db: Session, *tables: str) -> dict[str, int]:
+    rows = db.execute(select(Counter.name, Counter.value).where(Counter.name.in_(tables)))
+    return {name: value for name, value in rows}
+
+
+def etag(db: Session, tables: tuple[str, ...], variant: str = "") -> str:
+    # One primary-key read per table; no rows of the tables themselves are touched.
+    versions = current(db, *tables)
+    stamp = ".".join(f"{t}{versions.get(t, 0)}" for t in tables)
+    digest = hashlib.blake2b(variant.encode(), digest_size=6).hexdigest()
+    return f'"{stamp}-{digest}"'
@@ -0,0 +1,235 @@
+from __future__ import annotations
+
+import inspect
+import itertools
+import math
+import multiprocessing
+from collections.abc import Callable, Iterable, Mapping, Sequence
+from concurrent.futures import Executor, ProcessPoolExecutor
+from dataclasses import dataclass, field
+from typing import Any
+
+import numpy as np
+
+# A strategy maps a (bars x symbols) close matrix to target weights of the same shape:
+# the weights chosen at bar t's close are held from t to t+1, so there is no lookahead.
+Strategy = Callable[..., np.ndarray]
+
+
+class UnknownStrategy(LookupError):
+    pass
+
+
+class InvalidParams(ValueError):
+    pass
+
+
+@dataclass(frozen=True)
+class Costs:
+    fee_bps: float = 1.0
+    slippage_bps: float = 2.0
+
+    @property
+    def rate(self) -> float:
+        return (self.fee_bps + self.slippage_bps) / 10_000
+
+
+@dataclass(frozen=True)
+class Stats:
+    total_return: float
+    cagr: float
+    volatility: float
+    sharpe: float
+    max_drawdown: float
+    turnover: float  # sum of one-way turnover, in multiples of equity
+    costs: float  # fees + slippage paid, as a fraction of starting equity
+    rebalances: int
+    exposure: float  # mean gross weight
+
+
+@dataclass(frozen=True)
+class Result:
+    params: dict[str, Any]
+    stats: Stats
+    equity: np.ndarray = field(repr=False)
+
+
+def _moving_average(prices: np.ndarray, window: int) -> np.ndarray:
+    # Trailing mean via cumulative sums; NaN until a full window is available.
+    csum = np.cumsum(prices, axis=0)
+    out = np.full_like(prices, np.nan)
+    if window <= len(prices):
+        out[window - 1] = csum[window - 1]
+        out[window:] = csum[window:] - csum[:-window]
+        out[window - 1 :] /= window
+    return out
+
+
+def sma_crossover(prices: np.ndarray, fast: int = 20, slow: int = 50) -> np.ndarray:
+    # Long a symbol while its fast average is above the slow one; capital is split
+    # equally across the symbols, so a symbol's sleeve sits in cash when it is flat.
+    if not 0 < fast < slow:
+        raise ValueError("need 0 < fast < slow")
+    signal = _moving_average(prices, fast) > _moving_average(prices, slow)
+    return signal / prices.shape[1]
+
+
+def rebalance(prices: np.ndarray, period: int = 21) -> np.ndarray:
+    # Equal weight, reset every `period` bars and left to drift in between. The drifted
+    # weight is w * (P_t / P_r) renormalised, r being the last rebalance bar.
+    if period < 1:
+        raise ValueError("need period >= 1")
+    anchor = np.arange(len(prices)) // period * period
+    relative = prices / prices[anchor]
+    return relative / relative.sum(axis=1, keepdims=True)
+
+
+STRATEGIES: dict[str, Strategy] = {"sma_crossover": sma_crossover, "rebalance": rebalance}
+
+
+def simulate(
+    prices: np.ndarray, weights: np.ndarray, costs: Costs, bars_per_year: float = 252
+) -> tuple[Stats, np.ndarray]:
+    # All bars at once: returns of the held weights, minus costs on the turnover needed
+    # to go from yesterday's weights (after they drifted with the market) to today's.
+    weights = np.nan_to_num(weights)
+    asset_returns = prices[1:] / prices[:-1] - 1
+    held = weights[:-1]
+    gross = (held * asset_returns).sum(axis=1)
+    drifted = held * (1 + asset_returns) / (1 + gross)[:, None]
+    turnover = np.abs(weights[1:] - drifted).sum(axis=1)
+    # The first bar's buy-in is paid on entry as well.
+    initial = np.abs(weights[0]).sum()
+    cost = turnover * costs.rate  # charged on the pre-trade equity of the bar
+    net = (1 + gross) * (1 - cost) - 1
+    equity = (1 - initial * costs.rate) * np.concatenate(([1.0], np.cumprod(1 + net)))
+    peak = np.maximum.accumulate(equity)
+    years = max(len(net) / bars_per_year, 1e-9)
+    volatility = float(net.std(ddof=1) * math.sqrt(bars_per_year)) if len(net) > 1 else 0.0
+    mean = float(net.mean()) * bars_per_year if len(net) else 0.0
+    final = float(equity[-1])
+    stats = Stats(
+        total_return=final - 1,
+        cagr=final ** (1 / years) - 1 if final > 0 else -1.0,
+        volatility=volatility,
+        sharpe=mean / volatility if volatility > 0 else 0.0,
+        max_drawdown=float((1 - equity / peak).max()),
+        turnover=float(turnover.sum() + initial),
+        costs=float((cost * equity[:-1] * (1 + gross)).sum() + initial * costs.rate),
+        rebalances=int((turnover > 1e-12).sum() + (initial > 0)),
+        exposure=float(np.abs(weights).sum(axis=1).mean()),
+    )
+    return stats, equity
+
+
+def run(
+    prices: np.ndarray,
+    strategy: str,
+    params: Mapping[str, Any],
+    costs: Costs,
+    bars_per_year: float = 252,
+) -> Result:
+    fn = STRATEGIES.get(strategy)
+    if fn is None:
+        raise UnknownStrategy(strategy)
+    params = _coerce(fn, params)
+    stats, equity = simulate(prices, fn(prices, **params), costs, bars_per_year)
+    return Result(params=params, stats=stats, equity=equity)
+
+
+def _coerce(fn: Strategy, params: Mapping[str, Any]) -> dict[str, Any]:
+    # Values of integer arguments (windows, periods) must be integral; 7.0 becomes 7.
+    arguments = inspect.signature(fn).parameters
+    out = {}
+    for name, value in params.items():
+        arg = arguments.get(name)
+        if arg is None or name == "prices":
+            raise InvalidParams(f"unknown parameter {name!r}")
+        if isinstance(arg.default, int):
+            if not float(value).is_integer():
+                raise InvalidParams(f"{name} must be an integer, got {value!r}")
+            value = int(value)
+        out[name] = value
+    return out
+
+
+def validate_params(strategy: str, params: Mapping[str, Any]) -> None:
+    # Up front, for every combination of the grid.
+    fn = STRATEGIES.get(strategy)
+    if fn is None:
+        raise UnknownStrategy(strategy)
+    for combo in grid(params):
+        _coerce(fn, combo)
+
+
+def grid(params: Mapping[str, Any]) -> list[dict[str, Any]]:
+    # {"fast": [5, 10], "slow": 50} -> [{"fast": 5, "slow": 50}, {"fast": 10, "slow": 50}]
+    names = list(params)
+    values = [v if isinstance(v, list | tuple) else [v] for v in params.values()]
+    return [dict(zip(names, combo, strict=True)) for combo in itertools.product(*values)]
+
+
+# Worker side of a sweep. The price matrix is shipped once per worker process through
+# the pool initializer (make_pool) instead of once per parameter combination.
+_worker_prices: np.ndarray | None = None
+
+
+def _init_worker(prices: np.ndarray) -> None:
+    global _worker_prices
+    _worker_prices = prices
+
+
+def _run_chunk(
+    strategy: str, chunk: Sequence[dict[str, Any]], costs: Costs, bars_per_year: float
+) -> list[Result | str]:
+    # One bad combination is reported on its own and never fails the rest of the sweep.
+    out: list[Result | str] = []
+    for params in chunk:
+        try:
+            out.append(run(_worker_prices, strategy, params, costs, bars_per_year))
+        except Exception as e:
+            out.append(f"{params}: {type(e).__name__}: {e}")
+    return out
+
+
+def make_pool(prices: np.ndarray, workers: int) -> ProcessPoolExecutor:
+    # spawn, not fork: the API process has threads (threadpool, DB pool) to not copy.
+    return ProcessPoolExecutor(
+        max_workers=workers,
+        mp_context=multiprocessing.get_context("spawn"),
+        initializer=_init_worker,
+        initargs=(prices,),
+    )
+
+
+def chunks(combos: Sequence[dict[str, Any]], parts: int) -> Iterable[Sequence[dict[str, Any]]]:
+    size = max(1, math.ceil(len(combos) / max(parts, 1)))
+    return (combos[i : i + size] for i in range(0, len(combos), size))
+
+
+def sweep(
+    prices: np.ndarray,
+    strategy: str,
+    params: Mapping[str, Any],
+    costs: Costs,
+    bars_per_year: float = 252,
+    executor: Executor | None = None,
+    parts: int = 1,
+) -> tuple[list[Result], list[str]]:
+    # In-process when no executor is given; otherwise `executor` must come from
+    # make_pool(prices, ...) and the combinations are split into `parts` chunks.
+    if strategy not in STRATEGIES:
+        raise UnknownStrategy(strategy)
+    combos = grid(params)
+    if executor is None:
+        _init_worker(prices)
+        outputs = [_run_chunk(strategy, combos, costs, bars_per_year)]
+    else:
+        futures = [
+            executor.submit(_run_chunk, strategy, chunk, costs, bars_per_year)
+            for chunk in chunks(combos, parts)
+        ]
+        outputs = [f.result() for f in futures]
+    results = [r for out in outputs for r in out if isinstance(r, Result)]
+    errors = [r for out in outputs for r in out if isinstance(r, str)]
+    return results, errors
@@ -0,0 +1,248 @@
+from __future__ import annotations
+
+import hashlib
+import os
+import socket
+import tempfile
+import time
+import uuid
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import asdict, dataclass, field
+from datetime import datetime, timezone
+from typing import Any
+
+import numpy as np
+from sqlalchemy import select, update
+from sqlalchemy.orm import Session
+
+from core.logging import get_logger, log_event
+from db.session import SessionLocal
+from engines.trading import backtest
+from engines.trading.portfolio import TRADING_DAYS
+from engines.trading.prices import PriceStore
+from models.backtest_job import BacktestJob, BacktestStatus
+
+try:
+    import fcntl
+except ImportError:  # Windows: single-process deployments only
+    fcntl = None
+
+logger = get_logger("trading.backtest")
+
+_SESSION_SECONDS = 23_400  # 6.5h regular session
+
+
+class NoPriceHistory(LookupError):
+    pass
+
+
+@dataclass(frozen=True)
+class BacktestCreate:
+    strategy: str
+    symbols: list[str]
+    interval: int  # seconds
+    start: int  # epoch seconds, [start, end)
+    end: int
+    params: dict[str, Any] = field(default_factory=dict)
+    fee_bps: float = 1.0
+    slippage_bps: float = 2.0
+    bars_per_year: float | None = None
+
+
+def bars_per_year(interval: int) -> float:
+    # Bars only exist where something traded, so intraday bars count session time only.
+    if interval < 86400:
+        return TRADING_DAYS * _SESSION_SECONDS / interval
+    if interval == 86400:
+        return TRADING_DAYS
+    return 365.25 * 86400 / interval
+
+
+def create_job(db: Session, payload: BacktestCreate, owner: str) -> BacktestJob:
+    job = BacktestJob(strategy=payload.strategy, request=asdict(payload), owner=owner)
+    db.add(job)
+    db.commit()
+    db.refresh(job)
+    return job
+
+
+def get_job(db: Session, job_id: str) -> BacktestJob | None:
+    return db.get(BacktestJob, job_id)
+
+
+def _lock_path(owner: str) -> str:
+    digest = hashlib.blake2b(owner.encode(), digest_size=8).hexdigest()
+    return os.path.join(tempfile.gettempdir(), f"command_centre_backtest_{digest}.lock")
+
+
+def _owner_gone(owner: str | None, current: str) -> bool:
+    # Every runner holds an flock on its own lock file for as long as its process lives,
+    # so a lock that can be taken belongs to a process that is gone. Owners on other
+    # hosts can't be checked from here and are left alone.
+    if owner is None:
+        return True
+    if owner == current:
+        return False
+    if owner.split("/", 1)[0] != socket.gethostname():
+        return False
+    if fcntl is None:
+        return True
+    path = _lock_path(owner)
+    try:
+        f = open(path, "rb")
+    except FileNotFoundError:
+        return True
+    with f:
+        try:
+            fcntl.flock(f.fileno(), fcntl.LOCK_EX | fcntl.LOCK_NB)
+        except BlockingIOError:
+            return False
+    os.remove(path)
+    return True
+
+
+def fail_stale(db: Session, owner: str) -> int:
+    # Jobs run in the worker process that queued them. Called at every worker's startup,
+    # this fails only the queued or running jobs whose process is gone, never those of
+    # other live workers.
+    pending = (BacktestStatus.QUEUED.value, BacktestStatus.RUNNING.value)
+    owners = db.scalars(
+        select(BacktestJob.owner).where(BacktestJob.status.in_(pending)).distinct()
+    ).all()
+    gone = [o for o in owners if _owner_gone(o, owner)]
+    if not gone:
+        return 0
+    orphaned = BacktestJob.owner.in_([o for o in gone if o is not None])
+    if None in gone:
+        orphaned = orphaned | BacktestJob.owner.is_(None)
+    result = db.execute(
+        update(BacktestJob)
+        .where(BacktestJob.status.in_(pending), orphaned)
+        .values(
+            status=BacktestStatus.FAILED.value,
+            error="interrupted by restart",
+            finished_at=datetime.now(timezone.utc),
+        )
+    )
+    db.commit()
+    return result.rowcount
+
+
+def load_prices(store: PriceStore, payload: BacktestCreate) -> tuple[np.ndarray, np.ndarray]:
+    # Close matrix on the request's grid, starting at the first bar where every symbol
+    # has a price (closes() forward-fills after a symbol's first tick).
+    grid, closes = store.closes(payload.symbols, payload.interval, payload.start, payload.end)
+    priced = (~np.isnan(closes)).any(axis=0)
+    missing = [s for s, has in zip(payload.symbols, priced, strict=True) if not has]
+    if missing or len(grid) == 0:
+        raise NoPriceHistory(", ".join(missing) or "no bars in range")
+    first = int(np.isnan(closes).any(axis=1).argmin())
+    return grid[first:], closes[first:]
+
+
+def _result(
+    grid: np.ndarray,
+    symbols: list[str],
+    results: list[backtest.Result],
+    errors: list[str],
+    seconds: float,
+) -> dict[str, Any]:
+    ranked = sorted(results, key=lambda r: r.stats.sharpe, reverse=True)
+    best = ranked[0] if ranked else None
+    return {
+        "symbols": symbols,
+        "bars": len(grid),
+        "from": int(grid[0]),
+        "to": int(grid[-1]),
+        "seconds": round(seconds, 4),
+        "bars_per_second": round(len(grid) * len(results) / seconds) if seconds > 0 else None,
+        "runs": [{"params": r.params, "stats": asdict(r.stats)} for r in ranked],
+        "errors": errors,
+        "best": (
+            None
+            if best is None
+            else {"params": best.params, "t": grid.tolist(), "equity": best.equity.tolist()}
+        ),
+    }
+
+
+class BacktestRunner:
+    # One job at a time on a background thread; each job's parameter sweep is spread over
+    # a process pool that receives the price matrix once per worker.
+
+    def __init__(self, store: PriceStore, workers: int = 0) -> None:
+        self.store = store
+        self.workers = workers or os.cpu_count() or 1
+        self._executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="backtest")
+        # Identifies this process's jobs; the flock on its lock file marks it as alive.
+        self.owner = f"{socket.gethostname()}/{os.getpid()}/{uuid.uuid4().hex[:12]}"
+        self._lock_file = open(_lock_path(self.owner), "ab")
+        if fcntl is not None:
+            fcntl.flock(self._lock_file.fileno(), fcntl.LOCK_EX | fcntl.LOCK_NB)
+
+    def submit(self, job_id: str) -> None:
+        self._executor.submit(self._run, job_id)
+
+    def close(self) -> None:
+        # A sweep already running finishes; queued jobs are failed by the next worker
+        # to start once this process is gone.
+        self._executor.shutdown(wait=False, cancel_futures=True)
+        self._lock_file.close()
+
+    def _sweep(
+        self, prices: np.ndarray, payload: BacktestCreate
+    ) -> tuple[list[backtest.Result], list[str]]:
+        costs = backtest.Costs(payload.fee_bps, payload.slippage_bps)
+        per_year = payload.bars_per_year or bars_per_year(payload.interval)
+        combos = len(backtest.grid(payload.params))
+        workers = min(self.workers, combos)
+        if workers <= 1:
+            return backtest.sweep(prices, payload.strategy, payload.params, costs, per_year)
+        with backtest.make_pool(prices, workers) as pool:
+            return backtest.sweep(
+                prices,
+                payload.strategy,
+                payload.params,
+                costs,
+                per_year,
+                executor=pool,
+                parts=workers * 4,
+            )
+
+    def _run(self, job_id: str) -> None:
+        with SessionLocal() as db:
+            job = db.get(BacktestJob, job_id)
+            if job is None or job.status != BacktestStatus.QUEUED.value:
+                return
+            job.status = BacktestStatus.RUNNING.value
+            job.started_at = datetime.now(timezone.utc)
+            db.commit()
+            payload = BacktestCreate(**job.request)
+            try:
+                grid, prices = load_prices(self.store, payload)
+                started = time.perf_counter()
+                results, errors = self._sweep(prices, payload)
+                seconds = time.perf_counter() - started
+                if not results:
+                    raise ValueError("; ".join(errors) or "no parameter combinations")
+                job.result = _result(grid, payload.symbols, results, errors, seconds)
+                job.status = BacktestStatus.DONE.value
+                job.error = None
+                log_event(
+                    logger,
+                    "backtest_done",
+                    job_id=job_id,
+                    runs=len(results),
+                    bars=len(grid),
+                    seconds=round(seconds, 3),
+                )
+            except NoPriceHistory as e:
+                job.status = BacktestStatus.FAILED.value
+                job.error = f"no price history: {e}"
+            except Exception as e:
+                logger.exception("backtest %s failed", job_id)
+                job.status = BacktestStatus.FAILED.value
+                job.error = str(e)
+            job.finished_at = datetime.now(timezone.utc)
+            db.commit()
+
@@ -0,0 +1,198 @@
+from __future__ import annotations
+
+import threading
+import time
+from dataclasses import dataclass
+
+import numpy as np
+from sqlalchemy import select
+from sqlalchemy.orm import Session
+
+from engines.trading.prices import PriceStore
+from engines.trading.trades import as_utc
+from models.trade import Trade
+
+TRADING_DAYS = 252
+_EPS = 1e-9
+
+
+@dataclass(frozen=True)
+class Book:
+    # Open positions and FIFO lots as parallel arrays; index i of the per-symbol arrays
+    # is symbols[i], lot j belongs to symbols[lot_symbol[j]].
+    symbols: list[str]
+    qty: np.ndarray
+    cost: np.ndarray  # cost basis of the open lots
+    realized: np.ndarray
+    last_trade_price: np.ndarray
+    lot_symbol: np.ndarray
+    lot_qty: np.ndarray
+    lot_price: np.ndarray
+    lot_opened: np.ndarray  # epoch seconds
+
+
+@dataclass(frozen=True)
+class Valuation:
+    book: Book
+    price: np.ndarray
+    market_value: np.ndarray
+    unrealized: np.ndarray
+    weight: np.ndarray
+
+    @property
+    def total_value(self) -> float:
+        return float(self.market_value.sum())
+
+
+@dataclass(frozen=True)
+class Risk:
+    total_value: float
+    observations: int
+    confidence: float
+    volatility: float  # annualised, of portfolio returns
+    value_at_risk: float  # one-day historical VaR, in currency
+    symbols: list[str]
+    weight: np.ndarray
+    symbol_volatility: np.ndarray  # annualised, NaN without history
+
+
+def build_book(
+    symbols: np.ndarray, qty: np.ndarray, price: np.ndarray, executed_at: np.ndarray
+) -> Book:
+    # FIFO without a per-lot loop. Positions never go short (enforced when trades are
+    # recorded), so a symbol's sells always consume exactly the first S units it bought,
+    # whatever the interleaving. The cost of those units is read off the cumulative
+    # (quantity, cost) curve of its buys with one np.interp, for every symbol at once.
+    order = np.lexsort((executed_at, symbols))
+    symbols, qty, price, executed_at = symbols[order], qty[order], price[order], executed_at[order]
+    names, group = np.unique(symbols, return_inverse=True)
+    n = len(names)
+    is_buy = qty > 0
+    bought = np.bincount(group, np.where(is_buy, qty, 0), minlength=n)
+    sold = np.bincount(group, np.where(is_buy, 0, -qty), minlength=n)
+    proceeds = np.bincount(group, np.where(is_buy, 0, -qty * price), minlength=n)
+    buy_cost = np.bincount(group, np.where(is_buy, qty * price, 0), minlength=n)
+
+    buy_qty, buy_price = qty[is_buy], price[is_buy]
+    curve_qty = np.concatenate(([0.0], np.cumsum(buy_qty)))
+    curve_cost = np.concatenate(([0.0], np.cumsum(buy_qty * buy_price)))
+    group_start = np.concatenate(([0.0], np.cumsum(bought)[:-1]))
+    cost_start = np.concatenate(([0.0], np.cumsum(buy_cost)[:-1]))
+    consumed_to = np.minimum(group_start + sold, group_start + bought)
+    matched_cost = np.interp(consumed_to, curve_qty, curve_cost) - cost_start
+
+    # A buy lot is open for whatever part of it lies past its symbol's consumed prefix.
+    buy_group = group[is_buy]
+    lot_end = curve_qty[1:]
+    remaining = np.clip(lot_end - np.maximum(lot_end - buy_qty, consumed_to[buy_group]), 0, None)
+    open_lot = remaining > _EPS
+
+    last = np.concatenate((np.flatnonzero(np.diff(group)), [len(group) - 1])) if n else group
+    open_qty = bought - sold
+    open_qty[np.abs(open_qty) < _EPS] = 0.0
+    return Book(
+        symbols=names.tolist(),
+        qty=open_qty,
+        cost=np.where(open_qty > 0, buy_cost - matched_cost, 0.0),
+        realized=proceeds - matched_cost,
+        last_trade_price=price[last],
+        lot_symbol=buy_group[open_lot],
+        lot_qty=remaining[open_lot],
+        lot_price=buy_price[open_lot],
+        lot_opened=executed_at[is_buy][open_lot],
+    )
+
+
+def load_book(db: Session) -> Book:
+    stmt = select(Trade.symbol, Trade.qty, Trade.price, Trade.executed_at)
+    rows = db.execute(stmt).all()
+    symbols = np.array([r[0] for r in rows], dtype=str)
+    qty = np.fromiter((r[1] for r in rows), dtype=np.float64, count=len(rows))
+    price = np.fromiter((r[2] for r in rows), dtype=np.float64, count=len(rows))
+    executed_at = np.fromiter(
+        (as_utc(r[3]).timestamp() for r in rows), dtype=np.float64, count=len(rows)
+    )
+    return build_book(symbols, qty, price, executed_at.astype(np.int64))
+
+
+def value(book: Book, latest: np.ndarray) -> Valuation:
+    # latest: the store's price snapshot, aligned with book.symbols. Symbols without
+    # price history are marked at their last trade.
+    price = np.where(np.isnan(latest), book.last_trade_price, latest)
+    market_value = book.qty * price
+    total = market_value.sum()
+    return Valuation(
+        book=book,
+        price=price,
+        market_value=market_value,
+        unrealized=np.where(book.qty > 0, market_value - book.cost, 0.0),
+        weight=market_value / total if total else np.zeros_like(market_value),
+    )
+
+
+def risk(
+    valuation: Valuation,
+    store: PriceStore,
+    days: int = TRADING_DAYS,
+    confidence: float = 0.95,
+    now: float | None = None,
+) -> Risk:
+    # Historical simulation with today's holdings: replay the last `days` daily closes
+    # through the current quantities (one matrix-vector product), then read the
+    # one-day loss quantile and the volatility of the resulting return series.
+    book = valuation.book
+    held = np.flatnonzero(book.qty > 0)
+    symbols = [book.symbols[i] for i in held]
+    end = int(now if now is not None else time.time()) + 1
+    start = end - int(days * 7 / 5 + 7) * 86400  # calendar span holding `days` sessions
+    _, closes = store.closes(symbols, 86400, start, end)
+    closes = closes[-(days + 1) :]
+    no_history = held[np.isnan(closes).all(axis=0)]
+    # No history: hold the position at its current price, i.e. no P&L contribution.
+    closes = np.where(np.isnan(closes), valuation.price[held], closes)
+    with np.errstate(divide="ignore", invalid="ignore"):
+        log_returns = np.diff(np.log(closes), axis=0)
+        symbol_volatility = np.full(len(book.symbols), np.nan)
+        if len(log_returns) > 1:
+            symbol_volatility[held] = log_returns.std(axis=0, ddof=1) * np.sqrt(TRADING_DAYS)
+            symbol_volatility[no_history] = np.nan
+        values = closes @ book.qty[held]
+        returns = np.diff(values) / values[:-1]
+    returns = returns[np.isfinite(returns)]
+    total = valuation.total_value
+    volatility = float(returns.std(ddof=1) * np.sqrt(TRADING_DAYS)) if len(returns) > 1 else 0.0
+    var = float(max(0.0, -np.quantile(returns, 1 - confidence)) * total) if len(returns) else 0.0
+    return Risk(
+        total_value=total,
+        observations=len(returns),
+        confidence=confidence,
+        volatility=volatility,
+        value_at_risk=var,
+        symbols=book.symbols,
+        weight=valuation.weight,
+        symbol_volatility=symbol_volatility,
+    )
+
+
+class Portfolio:
+    # The in-memory book, rebuilt from the trades table only after a trade is recorded:
+    # by this process (invalidate) or by any process (a new shared book version).
+
+    def __init__(self) -> None:
+        self._lock = threading.Lock()
+        self._book: Book | None = None
+        self._version: int | None = None
+        self.build_seconds = 0.0
+
+    def invalidate(self) -> None:
+        with self._lock:
+            self._book = None
+
+    def book(self, db: Session, version: int | None = None) -> Book:
+        with self._lock:
+            if self._book is None or (version is not None and version != self._version):
+                started = time.perf_counter()
+                self._book = load_book(db)
+                self._version = version
+                self.build_seconds = time.perf_counter() - started
+            return self._book
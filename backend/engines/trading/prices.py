@@ -0,0 +1,308 @@
+from __future__ import annotations
+
+import contextlib
+import mmap
+import os
+import re
+import threading
+from collections import OrderedDict
+from collections.abc import Iterator, Mapping, Sequence
+from dataclasses import dataclass
+from pathlib import Path
+
+import numpy as np
+
+try:
+    import fcntl
+except ImportError:  # Windows: single-process deployments only
+    fcntl = None
+
+# One directory per symbol, one flat little-endian file per column. Row i of every
+# column is the same tick; the files are append-only and sorted by time.
+COLUMNS = {"ts": np.dtype("<i8"), "price": np.dtype("<f8"), "volume": np.dtype("<f8")}
+
+_SYMBOL = re.compile(r"^[A-Z0-9][A-Z0-9.\-_]{0,31}$")
+_INTERVAL = re.compile(r"^(\d+)([smhdw])$")
+_UNIT_SECONDS = {"s": 1, "m": 60, "h": 3600, "d": 86400, "w": 7 * 86400}
+
+
+class OutOfOrder(ValueError):
+    pass
+
+
+def normalize_symbol(symbol: str) -> str:
+    symbol = symbol.strip().upper()
+    if not _SYMBOL.match(symbol):
+        raise ValueError(f"invalid symbol {symbol!r}")
+    return symbol
+
+
+def parse_interval(interval: str) -> int:
+    # "1m", "15m", "4h", "1d" ... -> seconds
+    match = _INTERVAL.match(interval.strip().lower())
+    if not match or int(match.group(1)) == 0:
+        raise ValueError(f"invalid interval {interval!r}")
+    return int(match.group(1)) * _UNIT_SECONDS[match.group(2)]
+
+
+@dataclass(frozen=True)
+class Series:
+    ts: np.ndarray
+    price: np.ndarray
+    volume: np.ndarray
+
+
+@dataclass(frozen=True)
+class Bars:
+    ts: np.ndarray  # bucket start, epoch seconds
+    open: np.ndarray
+    high: np.ndarray
+    low: np.ndarray
+    close: np.ndarray
+    volume: np.ndarray
+
+
+def resample(series: Series, interval_seconds: int) -> Bars:
+    # Vectorised OHLCV: bucket boundaries come from one diff over the (sorted) bucket ids,
+    # then each aggregate is a single ufunc.reduceat over the contiguous runs.
+    n = len(series.ts)
+    if n == 0:
+        empty = np.empty(0)
+        return Bars(np.empty(0, dtype=np.int64), empty, empty, empty, empty, empty)
+    buckets = series.ts // interval_seconds * interval_seconds
+    ends = np.flatnonzero(buckets[1:] != buckets[:-1]) + 1
+    starts = np.concatenate(([0], ends))
+    lasts = np.concatenate((ends - 1, [n - 1]))
+    return Bars(
+        ts=buckets[starts],
+        open=series.price[starts],
+        high=np.maximum.reduceat(series.price, starts),
+        low=np.minimum.reduceat(series.price, starts),
+        close=series.price[lasts],
+        volume=np.add.reduceat(series.volume, starts),
+    )
+
+
+class _SymbolColumns:
+    # Read side is a set of read-only mappings, re-mapped only when the files have grown;
+    # nothing is parsed or copied until a query slices it.
+
+    def __init__(self, directory: Path) -> None:
+        self.directory = directory
+        self.length = 0
+        self._paths = {column: str(directory / f"{column}.bin") for column in COLUMNS}
+        self._maps: dict[str, np.ndarray] = {}
+        self._repair()
+
+    def _repair(self) -> None:
+        # A crash mid-append can leave the columns at different lengths; everything past
+        # the shortest one is an incomplete row and is cut off.
+        self.directory.mkdir(parents=True, exist_ok=True)
+        for path in self._paths.values():
+            open(path, "ab").close()
+        with self.locked():
+            for column, dtype in COLUMNS.items():
+                if os.stat(self._paths[column]).st_size != self.length * dtype.itemsize:
+                    os.truncate(self._paths[column], self.length * dtype.itemsize)
+        self._maps = {}
+
+    def refresh(self) -> int:
+        # Another process may have appended since; rows count once every column has them.
+        self.length = min(
+            os.stat(self._paths[c]).st_size // dtype.itemsize for c, dtype in COLUMNS.items()
+        )
+        return self.length
+
+    @contextlib.contextmanager
+    def locked(self) -> Iterator[None]:
+        # Appends from different worker processes must not interleave their columns.
+        with open(self._paths["ts"], "rb") as f:
+            if fcntl is not None:
+                fcntl.flock(f.fileno(), fcntl.LOCK_EX)
+            self.refresh()
+            yield
+
+    def release(self) -> None:
+        # Views already handed out keep their mapping alive until they are dropped.
+        self._maps = {}
+
+    def _mapped(self, column: str) -> np.ndarray:
+        dtype = COLUMNS[column]
+        if not self.length:
+            return np.empty(0, dtype=dtype)
+        with open(self._paths[column], "rb") as f:
+            mapping = mmap.mmap(f.fileno(), self.length * dtype.itemsize, access=mmap.ACCESS_READ)
+        return np.frombuffer(mapping, dtype=dtype, count=self.length)
+
+    def columns(self) -> dict[str, np.ndarray]:
+        if not self._maps or len(self._maps["ts"]) != self.length:
+            self._maps = {column: self._mapped(column) for column in COLUMNS}
+        return self._maps
+
+    def _read_last(self, column: str) -> float | int | None:
+        if not self.length:
+            return None
+        dtype = COLUMNS[column]
+        with open(self._paths[column], "rb") as f:
+            f.seek((self.length - 1) * dtype.itemsize)
+            return np.frombuffer(f.read(dtype.itemsize), dtype=dtype)[0].item()
+
+    def last_ts(self) -> int | None:
+        return self._read_last("ts")
+
+    def last_price(self) -> float | None:
+        return self._read_last("price")
+
+    def append(self, ts: np.ndarray, price: np.ndarray, volume: np.ndarray) -> None:
+        for column, values in (("ts", ts), ("price", price), ("volume", volume)):
+            with open(self._paths[column], "ab") as f:
+                f.write(values.astype(COLUMNS[column], copy=False).tobytes())
+                f.flush()
+                os.fsync(f.fileno())
+        self.length += len(ts)
+
+
+class PriceStore:
+    # Append-only per-symbol tick history on disk (memory-mapped), safe for concurrent
+    # readers and writers within one process. Every mapping holds file descriptors, so
+    # only the `max_mapped` most recently read symbols stay mapped.
+
+    def __init__(self, root: str | os.PathLike[str], max_mapped: int = 256) -> None:
+        self.root = Path(root)
+        self.max_mapped = max_mapped
+        self._lock = threading.Lock()
+        self._symbols: dict[str, _SymbolColumns] = {}
+        self._mapped: OrderedDict[str, None] = OrderedDict()
+        # Latest price per symbol (NaN: no history), kept current by append().
+        self._last: dict[str, float] = {}
+
+    def _columns(self, symbol: str, create: bool = False) -> _SymbolColumns | None:
+        columns = self._symbols.get(symbol)
+        if columns is None and (create or (self.root / symbol).is_dir()):
+            columns = self._symbols[symbol] = _SymbolColumns(self.root / symbol)
+        return columns
+
+    def symbols(self) -> list[str]:
+        if not self.root.is_dir():
+            return []
+        return sorted(p.name for p in self.root.iterdir() if p.is_dir() and _SYMBOL.match(p.name))
+
+    def _map(self, symbol: str, columns: _SymbolColumns) -> dict[str, np.ndarray]:
+        self._mapped[symbol] = None
+        self._mapped.move_to_end(symbol)
+        while len(self._mapped) > self.max_mapped:
+            evicted, _ = self._mapped.popitem(last=False)
+            self._symbols[evicted].release()
+        return columns.columns()
+
+    def append(
+        self,
+        symbol: str,
+        ts: np.ndarray,
+        price: np.ndarray,
+        volume: np.ndarray | None = None,
+    ) -> int:
+        symbol = normalize_symbol(symbol)
+        ts = np.asarray(ts, dtype=np.int64)
+        price = np.asarray(price, dtype=np.float64)
+        volume = np.zeros(len(ts)) if volume is None else np.asarray(volume, dtype=np.float64)
+        if not (len(ts) == len(price) == len(volume)):
+            raise ValueError("ts, price and volume must have the same length")
+        if len(ts) == 0:
+            return 0
+        if not np.isfinite(price).all() or not np.isfinite(volume).all():
+            raise ValueError("price and volume must be finite")
+        if len(ts) > 1 and (np.diff(ts) < 0).any():
+            order = np.argsort(ts, kind="stable")
+            ts, price, volume = ts[order], price[order], volume[order]
+        with self._lock:
+            columns = self._columns(symbol, create=True)
+            with columns.locked():
+                last = columns.last_ts()
+                if last is not None and ts[0] < last:
+                    raise OutOfOrder(f"{symbol} already has ticks up to {last}; got {int(ts[0])}")
+                columns.append(ts, price, volume)
+            self._last[symbol] = float(price[-1])
+        return len(ts)
+
+    def series(self, symbol: str, start: int | None = None, end: int | None = None) -> Series:
+        # Ticks with start <= ts < end, as zero-copy views into the mappings.
+        with self._lock:
+            symbol = normalize_symbol(symbol)
+            columns = self._columns(symbol)
+            if columns is not None:
+                columns.refresh()
+            data = self._map(symbol, columns) if columns is not None else None
+        if data is None:
+            return Series(np.empty(0, dtype=np.int64), np.empty(0), np.empty(0))
+        ts = data["ts"]
+        lo = 0 if start is None else int(np.searchsorted(ts, start, side="left"))
+        hi = len(ts) if end is None else int(np.searchsorted(ts, end, side="left"))
+        return Series(ts[lo:hi], data["price"][lo:hi], data["volume"][lo:hi])
+
+    def bars(
+        self, symbol: str, interval_seconds: int, start: int | None = None, end: int | None = None
+    ) -> Bars:
+        return resample(self.series(symbol, start, end), interval_seconds)
+
+    def last_price(self, symbol: str) -> float | None:
+        price = self.latest([normalize_symbol(symbol)])[0]
+        return None if np.isnan(price) else float(price)
+
+    def latest(self, symbols: Sequence[str]) -> np.ndarray:
+        # This process's latest prices: one float64 per symbol, NaN where there is no
+        # history. Served from memory; a symbol's file is only read (8 bytes) the first time,
+        # so appends made by other worker processes are not seen here (see MarketSnapshot).
+        out = np.empty(len(symbols))
+        with self._lock:
+            for i, symbol in enumerate(symbols):
+                price = self._last.get(symbol)
+                if price is None:
+                    columns = self._columns(symbol) if _SYMBOL.match(symbol) else None
+                    last = columns.last_price() if columns is not None else None
+                    price = self._last[symbol] = np.nan if last is None else last
+                out[i] = price
+        return out
+
+    def tails(self, known: Mapping[str, int]) -> list[tuple[str, int, int, float]]:
+        # (symbol, length, last ts, last price) for every symbol on disk whose length
+        # differs from `known`; reads two file sizes per symbol and 16 bytes per change.
+        out = []
+        for symbol in self.symbols():
+            with self._lock:
+                columns = self._columns(symbol)
+                length = columns.refresh() if columns is not None else 0
+                if not length or known.get(symbol) == length:
+                    continue
+                ts, price = columns.last_ts(), columns.last_price()
+                self._last[symbol] = price
+            out.append((symbol, length, ts, price))
+        return out
+
+    def closes(
+        self, symbols: Sequence[str], interval_seconds: int, start: int, end: int
+    ) -> tuple[np.ndarray, np.ndarray]:
+        # Closing prices of many symbols on one time grid: (bucket ts, matrix[t, symbol]).
+        # Buckets where nothing traded (weekends) are dropped, gaps are forward-filled, and
+        # a symbol is NaN until its first tick in the window.
+        grid = np.arange(start // interval_seconds * interval_seconds, end, interval_seconds)
+        matrix = np.full((len(grid), len(symbols)), np.nan)
+        for j, symbol in enumerate(symbols):
+            series = self.series(symbol, start, end)
+            buckets = series.ts // interval_seconds * interval_seconds
+            last = np.append(buckets[1:] != buckets[:-1], True) if len(buckets) else buckets > 0
+            matrix[np.searchsorted(grid, buckets[last]), j] = series.price[last]
+        traded = ~np.isnan(matrix).all(axis=1)
+        grid, matrix = grid[traded], matrix[traded]
+        rows = np.where(np.isnan(matrix), 0, np.arange(len(grid))[:, None])
+        np.maximum.accumulate(rows, axis=0, out=rows)
+        return grid, matrix[rows, np.arange(len(symbols))]
+
+    def stats(self) -> dict[str, int]:
+        with self._lock:
+            loaded = {s: c.length for s, c in self._symbols.items()}
+        return {
+            "symbols": len(self.symbols()),
+            "loaded": len(loaded),
+            "ticks": sum(loaded.values()),
+        }
@@ -0,0 +1,258 @@
+from __future__ import annotations
+
+import asyncio
+import os
+import tempfile
+import threading
+import time
+from collections.abc import Callable, Sequence
+from multiprocessing import resource_tracker, shared_memory
+from typing import IO, TypeVar
+
+import numpy as np
+from sqlalchemy.orm import Session
+from starlette.concurrency import run_in_threadpool
+
+from core.logging import get_logger, log_event
+from db.session import SessionLocal
+from engines.trading.prices import PriceStore
+from engines.trading.trades import trade_count
+
+try:
+    import fcntl
+except ImportError:  # Windows: single-process deployments only
+    fcntl = None
+
+logger = get_logger("trading.snapshot")
+
+T = TypeVar("T")
+
+# Segment layout: one header, then `capacity` slots. Slots are append-only within a
+# generation (a symbol keeps its slot), so readers cache symbol -> slot and only look
+# at new slots when `count` grows. `seq` is a seqlock: odd while the updater writes.
+_HEADER = np.dtype(
+    [
+        ("seq", "<u8"),
+        ("generation", "<u8"),
+        ("count", "<u8"),
+        ("book_version", "<u8"),
+        ("updated_at", "<f8"),
+    ]
+)
+_SLOT = np.dtype([("symbol", "S32"), ("ts", "<i8"), ("price", "<f8")])
+_RETIRED = 0  # generation of a segment the updater has abandoned; readers re-attach
+
+
+class TornRead(RuntimeError):
+    pass
+
+
+class MarketSnapshot:
+    # Latest price per symbol and the trades-table version, shared by every worker
+    # process through one shared-memory segment. Whichever process holds the flock is
+    # the single updater (refresh); the others only read, with no locks and no copies
+    # beyond the values asked for. Failover is the flock passing to another worker.
+
+    def __init__(self, store: PriceStore, name: str, capacity: int = 16_384) -> None:
+        self.store = store
+        self.name = name
+        self.capacity = capacity
+        self.size = _HEADER.itemsize + capacity * _SLOT.itemsize
+        self.leader = False
+        self._lock_path = os.path.join(tempfile.gettempdir(), f"{name}.lock")
+        self._lock_file: IO[bytes] | None = None
+        self._shm: shared_memory.SharedMemory | None = None
+        self._header: np.ndarray | None = None
+        self._slots: np.ndarray | None = None
+        self._mutex = threading.Lock()
+        # Reader side: slot of each symbol for the generation they were read from.
+        self._generation = -1
+        self._index: dict[str, int] = {}
+        # Updater side: slot and file length last published per symbol.
+        self._slot_of: dict[str, int] = {}
+        self._published: dict[str, int] = {}
+
+    def _map(self, shm: shared_memory.SharedMemory) -> None:
+        # The segment outlives any one worker: a retiring leader must not unlink it under
+        # the others, so it is kept out of multiprocessing's resource tracker.
+        resource_tracker.unregister(shm._name, "shared_memory")  # type: ignore[attr-defined]
+        self._shm = shm
+        self._header = np.ndarray((), dtype=_HEADER, buffer=shm.buf)
+        count = (shm.size - _HEADER.itemsize) // _SLOT.itemsize
+        self._slots = np.ndarray((count,), dtype=_SLOT, buffer=shm.buf, offset=_HEADER.itemsize)
+
+    def _unmap(self) -> None:
+        if self._shm is not None:
+            self._header = self._slots = None
+            self._shm.close()
+            self._shm = None
+
+    def _attach(self) -> bool:
+        try:
+            self._map(shared_memory.SharedMemory(self.name))
+        except FileNotFoundError:
+            return False
+        return True
+
+    def _create(self) -> None:
+        # Reuse a segment left by a previous leader when it is big enough; otherwise
+        # retire it so its readers move over, and start a new one.
+        previous = 0
+        if self._shm is None:
+            self._attach()
+        if self._shm is not None and self._shm.size < self.size:
+            self._header["generation"] = _RETIRED
+            resource_tracker.register(self._shm._name, "shared_memory")  # type: ignore[attr-defined]
+            self._shm.unlink()
+            self._unmap()
+        if self._shm is None:
+            self._map(shared_memory.SharedMemory(self.name, create=True, size=self.size))
+        else:
+            previous = int(self._header["generation"])
+        header = self._header
+        # Odd even if a crashed leader left it mid-write.
+        header["seq"] = int(header["seq"]) | 1
+        header["generation"] = previous + 1
+        header["count"] = 0
+        header["book_version"] = 0
+        header["seq"] += 1
+        self._slot_of, self._published = {}, {}
+
+    def elect(self) -> bool:
+        # Non-blocking: try to become the updater; otherwise make sure the segment is
+        # mapped for reading. Called once at startup and again on every tick.
+        with self._mutex:
+            if not self.leader:
+                if self._lock_file is None:
+                    self._lock_file = open(self._lock_path, "ab")
+                try:
+                    if fcntl is not None:
+                        fcntl.flock(self._lock_file.fileno(), fcntl.LOCK_EX | fcntl.LOCK_NB)
+                    self.leader = True
+                except BlockingIOError:
+                    pass
+                if self.leader:
+                    self._create()
+                    log_event(logger, "market_snapshot_leader", pid=os.getpid())
+            if self._shm is not None and int(self._header["generation"]) == _RETIRED:
+                self._unmap()
+            if self._shm is None:
+                self._attach()
+            return self.leader
+
+    def close(self) -> None:
+        with self._mutex:
+            self._unmap()
+            if self._lock_file is not None:
+                self._lock_file.close()  # releases the flock
+                self._lock_file = None
+            self.leader = False
+
+    def refresh(self, db: Session) -> int:
+        # Publishes every symbol whose history grew since the last refresh, plus the
+        # trades-table version. Only the leader writes, so one writer per seqlock.
+        if not self.leader or self._header is None:
+            return 0
+        tails = self.store.tails(self._published)
+        version = trade_count(db)
+        header, slots = self._header, self._slots
+        changed = full = 0
+        with self._mutex:
+            header["seq"] += 1
+            try:
+                for symbol, length, ts, price in tails:
+                    slot = self._slot_of.get(symbol)
+                    if slot is None:
+                        if len(self._slot_of) >= len(slots):
+                            full += 1
+                            continue
+                        slot = self._slot_of[symbol] = len(self._slot_of)
+                        slots[slot]["symbol"] = symbol.encode()
+                    slots[slot]["ts"] = ts
+                    slots[slot]["price"] = price
+                    self._published[symbol] = length
+                    changed += 1
+                header["count"] = len(self._slot_of)
+                header["book_version"] = version
+                header["updated_at"] = time.time()
+            finally:
+                header["seq"] += 1
+        if full:
+            log_event(logger, "market_snapshot_full", capacity=len(slots), skipped=full)
+        return changed
+
+    def _read(self, fn: Callable[[np.ndarray, np.ndarray], T]) -> T:
+        header = self._header
+        for _ in range(1000):
+            start = int(header["seq"])
+            if start % 2 == 0:
+                value = fn(header, self._slots)
+                if int(header["seq"]) == start:
+                    return value
+            time.sleep(0)
+        raise TornRead(self.name)
+
+    def _sync_index(self) -> None:
+        # New slots since the last read (or a new generation): extend symbol -> slot.
+        def read(header: np.ndarray, slots: np.ndarray) -> tuple[int, int, list[bytes]]:
+            generation, count = int(header["generation"]), int(header["count"])
+            known = len(self._index) if generation == self._generation else 0
+            return generation, count, slots["symbol"][known:count].tolist()
+
+        generation, count, names = self._read(read)
+        if generation != self._generation:
+            self._generation, self._index = generation, {}
+        start = count - len(names)
+        for offset, name in enumerate(names):
+            self._index[name.decode()] = start + offset
+
+    def latest(self, symbols: Sequence[str]) -> np.ndarray:
+        # Same contract as PriceStore.latest. Symbols not published yet (or every symbol,
+        # before the segment exists) fall back to this process's store.
+        with self._mutex:
+            if self._shm is None:
+                return self.store.latest(symbols)
+            self._sync_index()
+            slot = np.fromiter(
+                (self._index.get(s, -1) for s in symbols), dtype=np.int64, count=len(symbols)
+            )
+            generation = self._generation
+
+            def read(header: np.ndarray, slots: np.ndarray) -> np.ndarray:
+                if int(header["generation"]) != generation:
+                    raise TornRead(self.name)
+                return slots["price"][np.maximum(slot, 0)]
+
+            try:
+                out = self._read(read)
+            except TornRead:
+                return self.store.latest(symbols)
+        missing = np.flatnonzero(slot < 0)
+        if len(missing):
+            out[missing] = self.store.latest([symbols[i] for i in missing])
+        return out
+
+    def book_version(self) -> int | None:
+        # None: no shared segment, so only local invalidation applies.
+        with self._mutex:
+            if self._shm is None:
+                return None
+            try:
+                return self._read(lambda header, _: int(header["book_version"]))
+            except TornRead:
+                return None
+
+
+def _refresh_once(snapshot: MarketSnapshot) -> int:
+    with SessionLocal() as db:
+        return snapshot.refresh(db)
+
+
+async def run_market_loop(snapshot: MarketSnapshot, interval_seconds: float) -> None:
+    while True:
+        try:
+            if await run_in_threadpool(snapshot.elect):
+                await run_in_threadpool(_refresh_once, snapshot)
+        except Exception:
+            logger.exception("market snapshot refresh failed")
+        await asyncio.sleep(interval_seconds)
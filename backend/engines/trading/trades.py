@@ -0,0 +1,69 @@
+from __future__ import annotations
+
+from dataclasses import dataclass
+from datetime import datetime, timezone
+
+from sqlalchemy import func, select
+from sqlalchemy.orm import Session
+
+from models.trade import Trade
+
+
+class InsufficientPosition(ValueError):
+    pass
+
+
+@dataclass(frozen=True)
+class TradeCreate:
+    symbol: str
+    qty: float  # positive buy, negative sell
+    price: float
+    executed_at: datetime | None = None
+
+
+def list_trades(db: Session, symbol: str | None = None, limit: int = 100) -> list[Trade]:
+    stmt = select(Trade).order_by(Trade.executed_at.desc(), Trade.id).limit(limit)
+    if symbol is not None:
+        stmt = stmt.where(Trade.symbol == symbol)
+    return list(db.scalars(stmt).all())
+
+
+def trade_count(db: Session) -> int:
+    # Trades are append-only, so the row count versions the book.
+    return db.scalar(select(func.count()).select_from(Trade)) or 0
+
+
+def as_utc(at: datetime) -> datetime:
+    # SQLite hands timestamps back naive; they are stored as UTC.
+    return at.replace(tzinfo=timezone.utc) if at.tzinfo is None else at.astimezone(timezone.utc)
+
+
+def record_trade(db: Session, payload: TradeCreate) -> Trade:
+    executed_at = as_utc(payload.executed_at or datetime.now(timezone.utc))
+    if payload.qty < 0:
+        # The portfolio engine's FIFO relies on positions never going short, so a sell
+        # (possibly back-dated) must not take the running position below zero.
+        history = db.execute(
+            select(Trade.executed_at, Trade.qty)
+            .where(Trade.symbol == payload.symbol)
+            .with_for_update()
+        ).all()
+        timeline = sorted(
+            [(as_utc(at), qty) for at, qty in history] + [(executed_at, payload.qty)],
+            key=lambda t: t[0],
+        )
+        running = 0.0
+        for _, qty in timeline:
+            running += qty
+            if running < -1e-9:
+                raise InsufficientPosition(payload.symbol)
+    trade = Trade(
+        symbol=payload.symbol,
+        qty=payload.qty,
+        price=payload.price,
+        executed_at=executed_at,
+    )
+    db.add(trade)
+    db.commit()
+    db.refresh(trade)
+    return trade
@@ -1,24 +1,106 @@
 from __future__ import annotations
 
+import asyncio
+import contextlib
+from collections.abc import AsyncIterator
+from contextlib import asynccontextmanager
+
 from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
 from fastapi.responses import RedirectResponse  # Added this import
+from starlette.concurrency import run_in_threadpool
 
-from api.routers import ai, finance, health, productivity, trading
+from api.routers import ai, dashboard, finance, health, productivity, trading
 from core.config import settings
 from core.logging import configure_logging, get_logger, log_event
-from db.session import engine
+from db.session import SessionLocal, async_engine, engine
+from engines.ai.cache import ResponseCache
+from engines.ai.client import GeminiClient
+from engines.ai.context import ContextBuilder
+from engines.finance.ledger.scheduler import run_snapshot_loop
+from engines.productivity.events import bus
+from engines.trading import backtest_jobs
+from engines.trading.portfolio import Portfolio
+from engines.trading.prices import PriceStore
+from engines.trading.snapshot import MarketSnapshot, run_market_loop
 
 # Import models to register metadata for Alembic.
 from db.base import Base  # noqa: E402
+from models import account as _account  # noqa: F401,E402
+from models import backtest_job as _backtest_job  # noqa: F401,E402
+from models import balance_snapshot as _balance_snapshot  # noqa: F401,E402
+from models import category_rollup as _category_rollup  # noqa: F401,E402
+from models import counter as _counter  # noqa: F401,E402
 from models import project as _project  # noqa: F401,E402
+from models import project_task_count as _project_task_count  # noqa: F401,E402
 from models import task as _task  # noqa: F401,E402
+from models import tombstone as _tombstone  # noqa: F401,E402
+from models import trade as _trade  # noqa: F401,E402
+from models import transaction as _transaction  # noqa: F401,E402
 
 
 configure_logging(settings.log_level)
 logger = get_logger("app")
 
-app = FastAPI(title=settings.app_name)
+
+@asynccontextmanager
+async def lifespan(app: FastAPI) -> AsyncIterator[None]:
+    # Engine created on import; this is a hook for future bootstrap steps.
+    _ = engine
+    app.state.gemini = GeminiClient(settings)
+    app.state.ai_cache = ResponseCache(settings.ai_cache_max_entries, settings.ai_cache_ttl_seconds)
+    app.state.ai_context = ContextBuilder(
+        top_k=settings.ai_context_top_k,
+        token_budget=settings.ai_context_token_budget,
+    )
+    app.state.prices = PriceStore(settings.trading_price_dir)
+    app.state.portfolio = Portfolio()
+    app.state.backtests = backtest_jobs.BacktestRunner(
+        app.state.prices, settings.trading_backtest_workers
+    )
+    app.state.market = MarketSnapshot(
+        app.state.prices, settings.trading_snapshot_name, settings.trading_snapshot_capacity
+    )
+    bus.add_listener(app.state.ai_context.on_events)
+    with SessionLocal() as db:
+        await run_in_threadpool(app.state.ai_context.load, db)
+        await run_in_threadpool(backtest_jobs.fail_stale, db, app.state.backtests.owner)
+    snapshots = None
+    if settings.finance_snapshot_interval_seconds > 0:
+        snapshots = asyncio.create_task(
+            run_snapshot_loop(settings.finance_snapshot_interval_seconds)
+        )
+    market = None
+    if settings.trading_snapshot_interval_seconds > 0:
+        await run_in_threadpool(app.state.market.elect)
+        market = asyncio.create_task(
+            run_market_loop(app.state.market, settings.trading_snapshot_interval_seconds)
+        )
+    log_event(
+        logger,
+        "startup",
+        environment=settings.environment,
+        database_url=settings.database_url,
+        database_async=settings.database_async,
+    )
+    try:
+        yield
+    finally:
+        for task in (snapshots, market):
+            if task is not None:
+                task.cancel()
+                with contextlib.suppress(asyncio.CancelledError):
+                    await task
+        app.state.market.close()
+        bus.remove_listener(app.state.ai_context.on_events)
+        app.state.backtests.close()
+        await app.state.gemini.aclose()
+        if async_engine is not None:
+            await async_engine.dispose()
+        log_event(logger, "shutdown")
+
+
+app = FastAPI(title=settings.app_name, lifespan=lifespan)
 
 app.add_middleware(
     CORSMiddleware,
@@ -26,6 +108,7 @@ app.add_middleware(
     allow_credentials=settings.cors_allow_credentials,
     allow_methods=settings.cors_allow_methods,
     allow_headers=settings.cors_allow_headers,
+    expose_headers=settings.cors_expose_headers,
 )
 
 app.include_router(health.router)
@@ -33,21 +116,10 @@ app.include_router(finance.router)
 app.include_router(trading.router)
 app.include_router(ai.router)
 app.include_router(productivity.router)
+app.include_router(dashboard.router)
 
 
 # Added: Redirect root URL to documentation
 @app.get("/")
 def read_root():
     return RedirectResponse(url="/docs")
-
-
-@app.on_event("startup")
-def _startup() -> None:
-    # Engine created on import; this is a hook for future bootstrap steps.
-    _ = engine
-    log_event(logger, "startup", environment=settings.environment, database_url=settings.database_url)
-
-
-@app.on_event("shutdown")
-def _shutdown() -> None:
-    log_event(logger, "shutdown")
\ No newline at end of file
@@ -8,8 +8,17 @@ from sqlalchemy import engine_from_config, pool
 
 from core.config import settings
 from db.base import Base
+from models.account import Account  # noqa: F401
+from models.backtest_job import BacktestJob  # noqa: F401
+from models.balance_snapshot import BalanceSnapshot  # noqa: F401
+from models.category_rollup import CategoryRollup  # noqa: F401
+from models.counter import Counter  # noqa: F401
 from models.project import Project  # noqa: F401
+from models.project_task_count import ProjectTaskCount  # noqa: F401
 from models.task import Task  # noqa: F401
+from models.tombstone import Tombstone  # noqa: F401
+from models.trade import Trade  # noqa: F401
+from models.transaction import Transaction  # noqa: F401
 
 config = context.config
 
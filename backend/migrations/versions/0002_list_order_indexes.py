@@ -0,0 +1,28 @@
+"""composite indexes for list ordering
+
+Revision ID: 0002_list_order_indexes
+Revises: 0001_init_tasks_projects
+Create Date: 2026-10-18
+"""
+
+from __future__ import annotations
+
+from alembic import op
+
+
+revision = "0002_list_order_indexes"
+down_revision = "0001_init_tasks_projects"
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.create_index("ix_tasks_updated_at_created_at_id", "tasks", ["updated_at", "created_at", "id"])
+    op.create_index(
+        "ix_projects_updated_at_created_at_id", "projects", ["updated_at", "created_at", "id"]
+    )
+
+
+def downgrade() -> None:
+    op.drop_index("ix_projects_updated_at_created_at_id", table_name="projects")
+    op.drop_index("ix_tasks_updated_at_created_at_id", table_name="tasks")
@@ -0,0 +1,26 @@
+"""task board index
+
+Revision ID: 0003_task_board_index
+Revises: 0002_list_order_indexes
+Create Date: 2026-10-18
+"""
+
+from __future__ import annotations
+
+from alembic import op
+
+
+revision = "0003_task_board_index"
+down_revision = "0002_list_order_indexes"
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.create_index(
+        "ix_tasks_status_priority_updated_at_id", "tasks", ["status", "priority", "updated_at", "id"]
+    )
+
+
+def downgrade() -> None:
+    op.drop_index("ix_tasks_status_priority_updated_at_id", table_name="tasks")
@@ -0,0 +1,95 @@
+"""full-text search over tasks and projects
+
+Revision ID: 0004_full_text_search
+Revises: 0003_task_board_index
+Create Date: 2026-10-18
+"""
+
+from __future__ import annotations
+
+from alembic import op
+
+
+revision = "0004_full_text_search"
+down_revision = "0003_task_board_index"
+branch_labels = None
+depends_on = None
+
+
+# SQLite: external-content FTS5 tables keyed by the base table's rowid and kept in sync
+# by triggers. Postgres: a stored generated tsvector column with a GIN index.
+_SQLITE_FTS = {"tasks": ("title", "description"), "projects": ("name", "description")}
+
+_PG_VECTORS = {
+    "tasks": "setweight(to_tsvector('english', coalesce(title, '')), 'A') || "
+    "setweight(to_tsvector('english', coalesce(description, '')), 'B')",
+    "projects": "setweight(to_tsvector('english', coalesce(name, '')), 'A') || "
+    "setweight(to_tsvector('english', coalesce(description, '')), 'B')",
+}
+
+
+def _sqlite_upgrade() -> None:
+    for table, (col_a, col_b) in _SQLITE_FTS.items():
+        fts = f"{table}_fts"
+        op.execute(
+            f"CREATE VIRTUAL TABLE {fts} USING fts5("
+            f"{col_a}, {col_b}, content='{table}', content_rowid='rowid', "
+            "tokenize='unicode61 remove_diacritics 2')"
+        )
+        op.execute(
+            f"CREATE TRIGGER {fts}_ai AFTER INSERT ON {table} BEGIN "
+            f"INSERT INTO {fts}(rowid, {col_a}, {col_b}) "
+            f"VALUES (new.rowid, new.{col_a}, new.{col_b}); END"
+        )
+        op.execute(
+            f"CREATE TRIGGER {fts}_ad AFTER DELETE ON {table} BEGIN "
+            f"INSERT INTO {fts}({fts}, rowid, {col_a}, {col_b}) "
+            f"VALUES ('delete', old.rowid, old.{col_a}, old.{col_b}); END"
+        )
+        op.execute(
+            f"CREATE TRIGGER {fts}_au AFTER UPDATE OF {col_a}, {col_b} ON {table} BEGIN "
+            f"INSERT INTO {fts}({fts}, rowid, {col_a}, {col_b}) "
+            f"VALUES ('delete', old.rowid, old.{col_a}, old.{col_b}); "
+            f"INSERT INTO {fts}(rowid, {col_a}, {col_b}) "
+            f"VALUES (new.rowid, new.{col_a}, new.{col_b}); END"
+        )
+        op.execute(f"INSERT INTO {fts}({fts}) VALUES ('rebuild')")
+
+
+def _sqlite_downgrade() -> None:
+    for table in _SQLITE_FTS:
+        fts = f"{table}_fts"
+        for suffix in ("ai", "ad", "au"):
+            op.execute(f"DROP TRIGGER IF EXISTS {fts}_{suffix}")
+        op.execute(f"DROP TABLE IF EXISTS {fts}")
+
+
+def _pg_upgrade() -> None:
+    for table, expr in _PG_VECTORS.items():
+        op.execute(
+            f"ALTER TABLE {table} ADD COLUMN search_vector tsvector "
+            f"GENERATED ALWAYS AS ({expr}) STORED"
+        )
+        op.execute(f"CREATE INDEX ix_{table}_search_vector ON {table} USING gin (search_vector)")
+
+
+def _pg_downgrade() -> None:
+    for table in _PG_VECTORS:
+        op.execute(f"DROP INDEX IF EXISTS ix_{table}_search_vector")
+        op.execute(f"ALTER TABLE {table} DROP COLUMN IF EXISTS search_vector")
+
+
+def upgrade() -> None:
+    dialect = op.get_bind().dialect.name
+    if dialect == "sqlite":
+        _sqlite_upgrade()
+    elif dialect == "postgresql":
+        _pg_upgrade()
+
+
+def downgrade() -> None:
+    dialect = op.get_bind().dialect.name
+    if dialect == "sqlite":
+        _sqlite_downgrade()
+    elif dialect == "postgresql":
+        _pg_downgrade()
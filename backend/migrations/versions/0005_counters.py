@@ -0,0 +1,30 @@
+"""named counters (per-table versions)
+
+Revision ID: 0005_counters
+Revises: 0004_full_text_search
+Create Date: 2026-10-18
+"""
+
+from __future__ import annotations
+
+from alembic import op
+import sqlalchemy as sa
+
+
+revision = "0005_counters"
+down_revision = "0004_full_text_search"
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    counters = op.create_table(
+        "counters",
+        sa.Column("name", sa.String(length=64), primary_key=True),
+        sa.Column("value", sa.BigInteger(), nullable=False, server_default="0"),
+    )
+    op.bulk_insert(counters, [{"name": "tasks", "value": 0}, {"name": "projects", "value": 0}])
+
+
+def downgrade() -> None:
+    op.drop_table("counters")
@@ -0,0 +1,65 @@
+"""change sequence and tombstones for delta sync
+
+Revision ID: 0006_change_sequence
+Revises: 0005_counters
+Create Date: 2026-10-18
+"""
+
+from __future__ import annotations
+
+from alembic import op
+import sqlalchemy as sa
+
+
+revision = "0006_change_sequence"
+down_revision = "0005_counters"
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    for table in ("tasks", "projects"):
+        op.add_column(
+            table, sa.Column("change_seq", sa.BigInteger(), nullable=False, server_default="0")
+        )
+
+    # Give existing rows distinct sequence numbers so a first sync (since=0) returns them.
+    op.execute(
+        "UPDATE tasks SET change_seq = ranked.seq FROM ("
+        "SELECT id, row_number() OVER (ORDER BY created_at, id) AS seq FROM tasks"
+        ") AS ranked WHERE tasks.id = ranked.id"
+    )
+    op.execute(
+        "UPDATE projects SET change_seq = ranked.seq + (SELECT count(*) FROM tasks) FROM ("
+        "SELECT id, row_number() OVER (ORDER BY created_at, id) AS seq FROM projects"
+        ") AS ranked WHERE projects.id = ranked.id"
+    )
+    op.execute(
+        "INSERT INTO counters (name, value) "
+        "SELECT 'change_seq', (SELECT count(*) FROM tasks) + (SELECT count(*) FROM projects)"
+    )
+
+    op.create_index("ix_tasks_change_seq", "tasks", ["change_seq"])
+    op.create_index("ix_projects_change_seq", "projects", ["change_seq"])
+
+    op.create_table(
+        "tombstones",
+        sa.Column("id", sa.Integer(), primary_key=True, autoincrement=True),
+        sa.Column("entity", sa.String(length=16), nullable=False),
+        sa.Column("entity_id", sa.String(length=36), nullable=False),
+        sa.Column("change_seq", sa.BigInteger(), nullable=False),
+        sa.Column("deleted_at", sa.DateTime(timezone=True), server_default=sa.text("(CURRENT_TIMESTAMP)")),
+    )
+    op.create_index("ix_tombstones_change_seq", "tombstones", ["change_seq"])
+
+
+def downgrade() -> None:
+    op.drop_index("ix_tombstones_change_seq", table_name="tombstones")
+    op.drop_table("tombstones")
+    op.execute("DELETE FROM counters WHERE name = 'change_seq'")
+    op.drop_index("ix_projects_change_seq", table_name="projects")
+    op.drop_index("ix_tasks_change_seq", table_name="tasks")
+    with op.batch_alter_table("projects") as batch:
+        batch.drop_column("change_seq")
+    with op.batch_alter_table("tasks") as batch:
+        batch.drop_column("change_seq")
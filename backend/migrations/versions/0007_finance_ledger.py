@@ -0,0 +1,63 @@
+"""finance ledger: accounts, transactions, balance snapshots
+
+Revision ID: 0007_finance_ledger
+Revises: 0006_change_sequence
+Create Date: 2026-10-18
+"""
+
+from __future__ import annotations
+
+from alembic import op
+import sqlalchemy as sa
+
+
+revision = "0007_finance_ledger"
+down_revision = "0006_change_sequence"
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.create_table(
+        "accounts",
+        sa.Column("id", sa.String(length=36), primary_key=True),
+        sa.Column("name", sa.String(length=255), nullable=False),
+        sa.Column("kind", sa.String(length=32), nullable=False, server_default="cash"),
+        sa.Column("currency", sa.String(length=3), nullable=False, server_default="USD"),
+        sa.Column("balance_cents", sa.BigInteger(), nullable=False, server_default="0"),
+        sa.Column("created_at", sa.DateTime(timezone=True), server_default=sa.text("(CURRENT_TIMESTAMP)")),
+        sa.Column("updated_at", sa.DateTime(timezone=True), server_default=sa.text("(CURRENT_TIMESTAMP)")),
+    )
+
+    op.create_table(
+        "transactions",
+        sa.Column("id", sa.String(length=36), primary_key=True),
+        sa.Column("account_id", sa.String(length=36), nullable=False),
+        sa.Column("posted_on", sa.Date(), nullable=False),
+        sa.Column("amount_cents", sa.BigInteger(), nullable=False),
+        sa.Column("description", sa.String(length=500), nullable=True),
+        sa.Column("category", sa.String(length=64), nullable=True),
+        sa.Column("created_at", sa.DateTime(timezone=True), server_default=sa.text("(CURRENT_TIMESTAMP)")),
+        sa.Column("updated_at", sa.DateTime(timezone=True), server_default=sa.text("(CURRENT_TIMESTAMP)")),
+        sa.ForeignKeyConstraint(["account_id"], ["accounts.id"], ondelete="CASCADE"),
+    )
+    # as_of replays only the postings after the nearest snapshot, per account.
+    op.create_index(
+        "ix_transactions_account_id_posted_on", "transactions", ["account_id", "posted_on"]
+    )
+
+    op.create_table(
+        "balance_snapshots",
+        sa.Column("account_id", sa.String(length=36), nullable=False),
+        sa.Column("as_of", sa.Date(), nullable=False),
+        sa.Column("balance_cents", sa.BigInteger(), nullable=False),
+        sa.PrimaryKeyConstraint("account_id", "as_of"),
+        sa.ForeignKeyConstraint(["account_id"], ["accounts.id"], ondelete="CASCADE"),
+    )
+
+
+def downgrade() -> None:
+    op.drop_table("balance_snapshots")
+    op.drop_index("ix_transactions_account_id_posted_on", table_name="transactions")
+    op.drop_table("transactions")
+    op.drop_table("accounts")
@@ -0,0 +1,31 @@
+"""transaction import hash for statement deduplication
+
+Revision ID: 0008_transaction_import_hash
+Revises: 0007_finance_ledger
+Create Date: 2026-10-18
+"""
+
+from __future__ import annotations
+
+from alembic import op
+import sqlalchemy as sa
+
+
+revision = "0008_transaction_import_hash"
+down_revision = "0007_finance_ledger"
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.add_column("transactions", sa.Column("import_hash", sa.String(length=64), nullable=True))
+    # Manually entered transactions leave it NULL; NULLs never conflict.
+    op.create_index(
+        "ux_transactions_import_hash", "transactions", ["import_hash"], unique=True
+    )
+
+
+def downgrade() -> None:
+    op.drop_index("ux_transactions_import_hash", table_name="transactions")
+    with op.batch_alter_table("transactions") as batch:
+        batch.drop_column("import_hash")
@@ -0,0 +1,55 @@
+"""monthly per-account category rollups of the ledger
+
+Revision ID: 0009_category_rollups
+Revises: 0008_transaction_import_hash
+Create Date: 2026-10-18
+"""
+
+from __future__ import annotations
+
+from alembic import op
+import sqlalchemy as sa
+
+
+revision = "0009_category_rollups"
+down_revision = "0008_transaction_import_hash"
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.create_table(
+        "category_rollups",
+        sa.Column("account_id", sa.String(length=36), nullable=False),
+        sa.Column("category", sa.String(length=64), nullable=False),
+        sa.Column("month", sa.String(length=7), nullable=False),
+        sa.Column("inflow_cents", sa.BigInteger(), nullable=False, server_default="0"),
+        sa.Column("outflow_cents", sa.BigInteger(), nullable=False, server_default="0"),
+        sa.Column("txn_count", sa.Integer(), nullable=False, server_default="0"),
+        sa.PrimaryKeyConstraint("account_id", "category", "month"),
+        sa.ForeignKeyConstraint(["account_id"], ["accounts.id"], ondelete="CASCADE"),
+    )
+    # Range queries across accounts scan by month first.
+    op.create_index("ix_category_rollups_month", "category_rollups", ["month"])
+
+    if op.get_bind().dialect.name == "postgresql":
+        month = "to_char(posted_on, 'YYYY-MM')"
+    else:
+        month = "strftime('%Y-%m', posted_on)"
+    op.execute(
+        f"""
+        INSERT INTO category_rollups
+            (account_id, category, month, inflow_cents, outflow_cents, txn_count)
+        SELECT account_id, COALESCE(category, ''), {month},
+               SUM(CASE WHEN amount_cents > 0 THEN amount_cents ELSE 0 END),
+               SUM(CASE WHEN amount_cents < 0 THEN amount_cents ELSE 0 END),
+               COUNT(*)
+        FROM transactions
+        GROUP BY account_id, COALESCE(category, ''), {month}
+        """
+    )
+
+
+def downgrade() -> None:
+    op.drop_index("ix_category_rollups_month", table_name="category_rollups")
+    op.drop_table("category_rollups")
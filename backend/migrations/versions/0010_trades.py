@@ -0,0 +1,36 @@
+"""trades for the FIFO portfolio engine
+
+Revision ID: 0010_trades
+Revises: 0009_category_rollups
+Create Date: 2026-10-18
+"""
+
+from __future__ import annotations
+
+from alembic import op
+import sqlalchemy as sa
+
+
+revision = "0010_trades"
+down_revision = "0009_category_rollups"
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.create_table(
+        "trades",
+        sa.Column("id", sa.String(length=36), primary_key=True),
+        sa.Column("symbol", sa.String(length=32), nullable=False),
+        sa.Column("qty", sa.Float(), nullable=False),
+        sa.Column("price", sa.Float(), nullable=False),
+        sa.Column("executed_at", sa.DateTime(timezone=True), nullable=False),
+        sa.Column("created_at", sa.DateTime(timezone=True), server_default=sa.text("(CURRENT_TIMESTAMP)")),
+    )
+    # Lots are rebuilt per symbol in execution order.
+    op.create_index("ix_trades_symbol_executed_at", "trades", ["symbol", "executed_at"])
+
+
+def downgrade() -> None:
+    op.drop_index("ix_trades_symbol_executed_at", table_name="trades")
+    op.drop_table("trades")
@@ -0,0 +1,39 @@
+"""backtest jobs
+
+Revision ID: 0011_backtest_jobs
+Revises: 0010_trades
+Create Date: 2026-10-18
+"""
+
+from __future__ import annotations
+
+from alembic import op
+import sqlalchemy as sa
+
+
+revision = "0011_backtest_jobs"
+down_revision = "0010_trades"
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.create_table(
+        "backtest_jobs",
+        sa.Column("id", sa.String(length=36), primary_key=True),
+        sa.Column("strategy", sa.String(length=64), nullable=False),
+        sa.Column("status", sa.String(length=16), nullable=False),
+        sa.Column("request", sa.JSON(), nullable=False),
+        sa.Column("result", sa.JSON(), nullable=True),
+        sa.Column("error", sa.Text(), nullable=True),
+        sa.Column("created_at", sa.DateTime(timezone=True), server_default=sa.text("(CURRENT_TIMESTAMP)")),
+        sa.Column("started_at", sa.DateTime(timezone=True), nullable=True),
+        sa.Column("finished_at", sa.DateTime(timezone=True), nullable=True),
+    )
+    # Startup recovery looks up jobs left queued/running by a previous process.
+    op.create_index("ix_backtest_jobs_status", "backtest_jobs", ["status"])
+
+
+def downgrade() -> None:
+    op.drop_index("ix_backtest_jobs_status", table_name="backtest_jobs")
+    op.drop_table("backtest_jobs")
@@ -0,0 +1,43 @@
+"""per-project task counts by status
+
+Revision ID: 0012_project_task_counts
+Revises: 0011_backtest_jobs
+Create Date: 2026-10-18
+"""
+
+from __future__ import annotations
+
+from alembic import op
+import sqlalchemy as sa
+
+
+revision = "0012_project_task_counts"
+down_revision = "0011_backtest_jobs"
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    # The primary key (project_id, status) is the only index needed: stats for a page of
+    # projects are one IN lookup on its leading column.
+    op.create_table(
+        "project_task_counts",
+        sa.Column("project_id", sa.String(length=36), nullable=False),
+        sa.Column("status", sa.String(length=32), nullable=False),
+        sa.Column("task_count", sa.Integer(), nullable=False, server_default="0"),
+        sa.PrimaryKeyConstraint("project_id", "status"),
+        sa.ForeignKeyConstraint(["project_id"], ["projects.id"], ondelete="CASCADE"),
+    )
+    op.execute(
+        """
+        INSERT INTO project_task_counts (project_id, status, task_count)
+        SELECT project_id, status, COUNT(*)
+        FROM tasks
+        WHERE project_id IS NOT NULL
+        GROUP BY project_id, status
+        """
+    )
+
+
+def downgrade() -> None:
+    op.drop_table("project_task_counts")
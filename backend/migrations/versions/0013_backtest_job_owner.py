@@ -0,0 +1,28 @@
+"""backtest job owner
+
+Revision ID: 0013_backtest_job_owner
+Revises: 0012_project_task_counts
+Create Date: 2026-10-18
+"""
+
+from __future__ import annotations
+
+from alembic import op
+import sqlalchemy as sa
+
+
+revision = "0013_backtest_job_owner"
+down_revision = "0012_project_task_counts"
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    # The worker process a job was queued in; jobs created before this stay NULL and
+    # are treated as orphaned.
+    op.add_column("backtest_jobs", sa.Column("owner", sa.String(length=128), nullable=True))
+
+
+def downgrade() -> None:
+    with op.batch_alter_table("backtest_jobs") as batch:
+        batch.drop_column("owner")
@@ -0,0 +1,88 @@
+"""stable FTS5 keys for tasks and projects
+
+Revision ID: 0014_search_rowid
+Revises: 0013_backtest_job_owner
+Create Date: 2026-10-18
+"""
+
+from __future__ import annotations
+
+from alembic import op
+
+
+revision = "0014_search_rowid"
+down_revision = "0013_backtest_job_owner"
+branch_labels = None
+depends_on = None
+
+
+# SQLite only. The FTS5 tables from 0004 were keyed by the implicit rowid of tables whose
+# primary key is a string, and VACUUM may renumber such rowids, silently pointing index
+# entries at other rows. They are now keyed by a search_rowid column: plain data, so it
+# survives VACUUM and table copies. It is assigned by the insert trigger (max + 1) and
+# never changes afterwards.
+_SQLITE_FTS = {"tasks": ("title", "description"), "projects": ("name", "description")}
+
+
+def _drop_fts(table: str) -> None:
+    fts = f"{table}_fts"
+    for suffix in ("ai", "ad", "au"):
+        op.execute(f"DROP TRIGGER IF EXISTS {fts}_{suffix}")
+    op.execute(f"DROP TABLE IF EXISTS {fts}")
+
+
+def _create_fts(table: str, key: str) -> None:
+    col_a, col_b = _SQLITE_FTS[table]
+    fts = f"{table}_fts"
+    op.execute(
+        f"CREATE VIRTUAL TABLE {fts} USING fts5("
+        f"{col_a}, {col_b}, content='{table}', content_rowid='{key}', "
+        "tokenize='unicode61 remove_diacritics 2')"
+    )
+    if key == "rowid":
+        assign, new_key = "", "new.rowid"
+    else:
+        assign = (
+            f"UPDATE {table} SET {key} = (SELECT coalesce(max({key}), 0) + 1 FROM {table}) "
+            f"WHERE id = new.id AND {key} IS NULL; "
+        )
+        new_key = f"(SELECT {key} FROM {table} WHERE id = new.id)"
+    op.execute(
+        f"CREATE TRIGGER {fts}_ai AFTER INSERT ON {table} BEGIN {assign}"
+        f"INSERT INTO {fts}(rowid, {col_a}, {col_b}) "
+        f"VALUES ({new_key}, new.{col_a}, new.{col_b}); END"
+    )
+    op.execute(
+        f"CREATE TRIGGER {fts}_ad AFTER DELETE ON {table} BEGIN "
+        f"INSERT INTO {fts}({fts}, rowid, {col_a}, {col_b}) "
+        f"VALUES ('delete', old.{key}, old.{col_a}, old.{col_b}); END"
+    )
+    op.execute(
+        f"CREATE TRIGGER {fts}_au AFTER UPDATE OF {col_a}, {col_b} ON {table} BEGIN "
+        f"INSERT INTO {fts}({fts}, rowid, {col_a}, {col_b}) "
+        f"VALUES ('delete', old.{key}, old.{col_a}, old.{col_b}); "
+        f"INSERT INTO {fts}(rowid, {col_a}, {col_b}) "
+        f"VALUES (new.{key}, new.{col_a}, new.{col_b}); END"
+    )
+    op.execute(f"INSERT INTO {fts}({fts}) VALUES ('rebuild')")
+
+
+def upgrade() -> None:
+    if op.get_bind().dialect.name != "sqlite":
+        return
+    for table in _SQLITE_FTS:
+        _drop_fts(table)
+        op.execute(f"ALTER TABLE {table} ADD COLUMN search_rowid INTEGER")
+        op.execute(f"UPDATE {table} SET search_rowid = rowid")
+        op.execute(f"CREATE UNIQUE INDEX ix_{table}_search_rowid ON {table} (search_rowid)")
+        _create_fts(table, "search_rowid")
+
+
+def downgrade() -> None:
+    if op.get_bind().dialect.name != "sqlite":
+        return
+    for table in _SQLITE_FTS:
+        _drop_fts(table)
+        op.execute(f"DROP INDEX IF EXISTS ix_{table}_search_rowid")
+        op.execute(f"ALTER TABLE {table} DROP COLUMN search_rowid")
+        _create_fts(table, "rowid")
@@ -1,7 +1,30 @@
 from __future__ import annotations
 
+from models.account import Account, AccountKind
+from models.backtest_job import BacktestJob, BacktestStatus
+from models.balance_snapshot import BalanceSnapshot
+from models.category_rollup import CategoryRollup
+from models.counter import Counter
 from models.project import Project
+from models.project_task_count import ProjectTaskCount
 from models.task import Task
+from models.tombstone import Tombstone
+from models.trade import Trade
+from models.transaction import Transaction
 
-__all__ = ["Project", "Task"]
+__all__ = [
+    "Account",
+    "AccountKind",
+    "BacktestJob",
+    "BacktestStatus",
+    "BalanceSnapshot",
+    "CategoryRollup",
+    "Counter",
+    "Project",
+    "ProjectTaskCount",
+    "Task",
+    "Tombstone",
+    "Trade",
+    "Transaction",
+]
 
@@ -0,0 +1,36 @@
+from __future__ import annotations
+
+import uuid
+from datetime import datetime
+from enum import Enum
+
+from sqlalchemy import BigInteger, DateTime, String, func
+from sqlalchemy.orm import Mapped, mapped_column
+
+from db.base import Base
+
+
+class AccountKind(str, Enum):
+    CASH = "cash"
+    INVESTMENT = "investment"
+    CREDIT = "credit"
+    LOAN = "loan"
+    OTHER = "other"
+
+
+class Account(Base):
+    __tablename__ = "accounts"
+    __mapper_args__ = {"eager_defaults": True}
+
+    id: Mapped[str] = mapped_column(String(36), primary_key=True, default=lambda: str(uuid.uuid4()))
+    name: Mapped[str] = mapped_column(String(255), nullable=False)
+    kind: Mapped[str] = mapped_column(String(32), nullable=False, default=AccountKind.CASH.value)
+    currency: Mapped[str] = mapped_column(String(3), nullable=False, default="USD")
+    # Running sum of this account's transactions (minor units), updated in the same
+    # transaction as every posting. Liabilities carry negative balances.
+    balance_cents: Mapped[int] = mapped_column(BigInteger, nullable=False, default=0)
+
+    created_at: Mapped[datetime] = mapped_column(DateTime(timezone=True), server_default=func.now())
+    updated_at: Mapped[datetime] = mapped_column(
+        DateTime(timezone=True), server_default=func.now(), onupdate=func.now()
+    )
@@ -0,0 +1,19 @@
+from __future__ import annotations
+
+from datetime import date
+
+from sqlalchemy import BigInteger, Date, ForeignKey, String
+from sqlalchemy.orm import Mapped, mapped_column
+
+from db.base import Base
+
+
+class BalanceSnapshot(Base):
+    __tablename__ = "balance_snapshots"
+
+    account_id: Mapped[str] = mapped_column(
+        String(36), ForeignKey("accounts.id", ondelete="CASCADE"), primary_key=True
+    )
+    # Balance at the end of this day, i.e. including every posting dated on or before it.
+    as_of: Mapped[date] = mapped_column(Date, primary_key=True)
+    balance_cents: Mapped[int] = mapped_column(BigInteger, nullable=False)
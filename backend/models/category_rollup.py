@@ -0,0 +1,20 @@
+from __future__ import annotations
+
+from sqlalchemy import BigInteger, ForeignKey, Integer, String
+from sqlalchemy.orm import Mapped, mapped_column
+
+from db.base import Base
+
+
+class CategoryRollup(Base):
+    __tablename__ = "category_rollups"
+
+    account_id: Mapped[str] = mapped_column(
+        String(36), ForeignKey("accounts.id", ondelete="CASCADE"), primary_key=True
+    )
+    # Uncategorised transactions roll up under "" (primary key columns can't be NULL).
+    category: Mapped[str] = mapped_column(String(64), primary_key=True)
+    month: Mapped[str] = mapped_column(String(7), primary_key=True)  # "YYYY-MM"
+    inflow_cents: Mapped[int] = mapped_column(BigInteger, nullable=False, default=0)
+    outflow_cents: Mapped[int] = mapped_column(BigInteger, nullable=False, default=0)
+    txn_count: Mapped[int] = mapped_column(Integer, nullable=False, default=0)
@@ -4,7 +4,7 @@ import uuid
 from datetime import datetime
 from enum import Enum
 
-from sqlalchemy import DateTime, ForeignKey, Integer, String, func
+from sqlalchemy import BigInteger, DateTime, ForeignKey, Integer, String, func
 from sqlalchemy.orm import Mapped, mapped_column, relationship
 
 from db.base import Base
@@ -18,6 +18,8 @@ class TaskStatus(str, Enum):
 
 class Task(Base):
     __tablename__ = "tasks"
+    # Fetch server-generated timestamps with RETURNING at flush time.
+    __mapper_args__ = {"eager_defaults": True}
 
     id: Mapped[str] = mapped_column(String(36), primary_key=True, default=lambda: str(uuid.uuid4()))
     project_id: Mapped[str | None] = mapped_column(
@@ -28,6 +30,8 @@ class Task(Base):
     description: Mapped[str | None] = mapped_column(String(4000), nullable=True)
     status: Mapped[str] = mapped_column(String(32), nullable=False, default=TaskStatus.TODO.value)
     priority: Mapped[int] = mapped_column(Integer, nullable=False, default=0)
+    # Position in the global change sequence (see engines.productivity.versions.next_seq).
+    change_seq: Mapped[int] = mapped_column(BigInteger, nullable=False, default=0)
 
     created_at: Mapped[datetime] = mapped_column(DateTime(timezone=True), server_default=func.now())
     updated_at: Mapped[datetime] = mapped_column(
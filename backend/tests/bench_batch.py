@@ -0,0 +1,73 @@
+from __future__ import annotations
+
+import time
+
+from fastapi.testclient import TestClient
+
+from tests import harness
+
+# Per-row vs batch writes through the API, against a fresh SQLite database:
+#   python -m tests.bench_batch   (from backend/)
+# In-process (TestClient) rather than over a socket: small POSTs over loopback pick up
+# ~40 ms of Nagle/delayed-ACK stall each, which would swamp what is being measured.
+ROWS = 1000
+BATCH = 200
+
+
+def _rate(label: str, started: float) -> None:
+    elapsed = time.perf_counter() - started
+    print(f"{label:<24} {ROWS / elapsed:>9.0f} rows/s  ({elapsed:.2f} s for {ROWS})")
+
+
+def _per_row(http: TestClient) -> None:
+    started = time.perf_counter()
+    ids = [
+        http.post("/productivity/tasks", json={"title": f"row {n}"}).json()["id"]
+        for n in range(ROWS)
+    ]
+    _rate("per-row create", started)
+    started = time.perf_counter()
+    for task_id in ids:
+        http.patch(f"/productivity/tasks/{task_id}", json={"status": "done"})
+    _rate("per-row update", started)
+    started = time.perf_counter()
+    for task_id in ids:
+        http.delete(f"/productivity/tasks/{task_id}")
+    _rate("per-row delete", started)
+
+
+def _batched(http: TestClient) -> None:
+    chunks = range(0, ROWS, BATCH)
+    started = time.perf_counter()
+    ids = []
+    for start in chunks:
+        items = [{"title": f"batch {n}"} for n in range(start, start + BATCH)]
+        results = http.post("/productivity/tasks:batch", json={"items": items}).json()
+        ids.extend(r["id"] for r in results["results"])
+    _rate(f"batch create ({BATCH})", started)
+    started = time.perf_counter()
+    for start in chunks:
+        items = [{"id": i, "status": "done"} for i in ids[start : start + BATCH]]
+        http.patch("/productivity/tasks:batch", json={"items": items})
+    _rate(f"batch update ({BATCH})", started)
+    started = time.perf_counter()
+    for start in chunks:
+        batch = {"ids": ids[start : start + BATCH]}
+        http.request("DELETE", "/productivity/tasks:batch", json=batch)
+    _rate(f"batch delete ({BATCH})", started)
+
+
+def main() -> None:
+    harness.migrate()
+    from main import app
+
+    try:
+        with TestClient(app) as http:
+            _per_row(http)
+            _batched(http)
+    finally:
+        harness.cleanup()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,85 @@
+from __future__ import annotations
+
+import asyncio
+import statistics
+import time
+from collections import Counter
+
+import httpx
+
+from tests import harness
+
+# Latency of productivity reads under 200 concurrent clients, sync session (threadpool)
+# vs async session (DATABASE_ASYNC=true), each mode in its own uvicorn process:
+#   python -m tests.bench_db_modes   (from backend/)
+CLIENTS = 200
+REQUESTS_PER_CLIENT = 25
+TASKS = 2000
+PATHS = ("/productivity/tasks?limit=50", "/productivity/board?limit=20", "/productivity/projects")
+
+
+def _seed() -> None:
+    from fastapi.testclient import TestClient
+
+    from main import app
+
+    with TestClient(app) as http:
+        projects = [
+            http.post("/productivity/projects", json={"name": f"project {n}"}).json()["id"]
+            for n in range(20)
+        ]
+        for start in range(0, TASKS, 500):
+            items = [
+                {"title": f"task {n}", "project_id": projects[n % 20], "priority": n % 5}
+                for n in range(start, start + 500)
+            ]
+            http.post("/productivity/tasks:batch", json={"items": items})
+
+
+async def _client(
+    http: httpx.AsyncClient, n: int, latencies: list[float], errors: list[str]
+) -> None:
+    for i in range(REQUESTS_PER_CLIENT):
+        started = time.perf_counter()
+        try:
+            status = str((await http.get(PATHS[(n + i) % len(PATHS)])).status_code)
+        except httpx.TransportError as e:
+            status = type(e).__name__
+        latencies.append(time.perf_counter() - started)
+        if status != "200":
+            errors.append(status)
+
+
+async def _load(base_url: str) -> tuple[list[float], list[str], float]:
+    latencies: list[float] = []
+    errors: list[str] = []
+    limits = httpx.Limits(max_connections=CLIENTS, max_keepalive_connections=CLIENTS)
+    async with httpx.AsyncClient(base_url=base_url, limits=limits, timeout=120) as http:
+        await asyncio.gather(*(http.get("/health") for _ in range(CLIENTS)))  # warm up
+        started = time.perf_counter()
+        await asyncio.gather(*(_client(http, n, latencies, errors) for n in range(CLIENTS)))
+        return latencies, errors, time.perf_counter() - started
+
+
+def _report(mode: str, latencies: list[float], errors: list[str], elapsed: float) -> None:
+    ms = sorted(x * 1000 for x in latencies)
+    p50, p95, p99 = (ms[int(len(ms) * q) - 1] for q in (0.50, 0.95, 0.99))
+    print(
+        f"{mode:<6} {len(ms) / elapsed:>7.0f} req/s  p50 {p50:>7.1f} ms  p95 {p95:>7.1f} ms  "
+        f"p99 {p99:>7.1f} ms  mean {statistics.fmean(ms):>7.1f} ms  errors {dict(Counter(errors))}"
+    )
+
+
+def main() -> None:
+    harness.migrate()
+    try:
+        _seed()
+        for mode, flag in (("sync", "false"), ("async", "true")):
+            with harness.serve_process(DATABASE_ASYNC=flag) as base_url:
+                _report(mode, *asyncio.run(_load(base_url)))
+    finally:
+        harness.cleanup()
+
+
+if __name__ == "__main__":
+    main()
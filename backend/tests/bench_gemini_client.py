@@ -0,0 +1,69 @@
+from __future__ import annotations
+
+import asyncio
+import statistics
+import time
+
+from tests import harness
+from tests.fake_gemini import FakeGemini
+
+# Request latency through GeminiClient against tests/fake_gemini.py over loopback:
+# the shared pooled client (warm keep-alive connection) vs a new client per request
+# (client setup and TCP connect every time, what the code did before the lifespan client).
+#   python -m tests.bench_gemini_client   (from backend/)
+REQUESTS = 300
+BODY = {"contents": [{"parts": [{"text": "ping"}]}]}
+
+
+def _client():
+    from core.config import settings
+    from engines.ai.client import GeminiClient
+
+    return GeminiClient(settings)
+
+
+async def _warm() -> list[float]:
+    gemini = _client()
+    latencies = []
+    try:
+        await gemini.generate(BODY)
+        for _ in range(REQUESTS):
+            started = time.perf_counter()
+            await gemini.generate(BODY)
+            latencies.append(time.perf_counter() - started)
+    finally:
+        await gemini.aclose()
+    return latencies
+
+
+async def _cold() -> list[float]:
+    latencies = []
+    for _ in range(REQUESTS):
+        started = time.perf_counter()
+        gemini = _client()
+        try:
+            await gemini.generate(BODY)
+        finally:
+            await gemini.aclose()
+        latencies.append(time.perf_counter() - started)
+    return latencies
+
+
+def _report(label: str, latencies: list[float]) -> None:
+    ms = sorted(x * 1000 for x in latencies)
+    p50, p99 = ms[len(ms) // 2], ms[int(len(ms) * 0.99) - 1]
+    print(f"{label:<5} p50 {p50:6.2f} ms  p99 {p99:6.2f} ms  mean {statistics.fmean(ms):6.2f} ms")
+
+
+def main() -> None:
+    fake = FakeGemini()
+    try:
+        with harness.serve(fake.app, harness.GEMINI_SOCKET):
+            _report("cold", asyncio.run(_cold()))
+            _report("warm", asyncio.run(_warm()))
+    finally:
+        harness.cleanup()
+
+
+if __name__ == "__main__":
+    main()
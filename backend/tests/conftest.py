@@ -0,0 +1,34 @@
+from __future__ import annotations
+
+from collections.abc import Iterator
+
+import httpx
+import pytest
+
+from tests import harness
+from tests.fake_gemini import FakeGemini
+
+
+def pytest_sessionfinish(session: pytest.Session, exitstatus: int) -> None:
+    harness.cleanup()
+
+
+@pytest.fixture(scope="session")
+def fake_gemini() -> Iterator[FakeGemini]:
+    fake = FakeGemini()
+    with harness.serve(fake.app, harness.GEMINI_SOCKET):
+        yield fake
+
+
+@pytest.fixture(scope="session")
+def migrated() -> None:
+    harness.migrate()
+
+
+@pytest.fixture(scope="session")
+def client(migrated: None, fake_gemini: FakeGemini) -> Iterator[httpx.Client]:
+    from main import app  # after tests.harness has set up the environment
+
+    with harness.serve(app) as base_url:
+        with httpx.Client(base_url=base_url, timeout=10) as http:
+            yield http
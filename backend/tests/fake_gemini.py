@@ -0,0 +1,74 @@
+from __future__ import annotations
+
+import asyncio
+import json
+import threading
+from collections.abc import AsyncIterator
+from dataclasses import dataclass
+
+from fastapi import FastAPI
+from fastapi.responses import JSONResponse, StreamingResponse
+
+
+@dataclass(frozen=True)
+class Reply:
+    status: int = 200
+    chunks: tuple[str, ...] = ()
+    delay: float = 0.0  # before each chunk
+    drop_after: int | None = None  # chunks sent before the connection is cut
+
+
+class DroppedConnection(Exception):
+    pass
+
+
+def _payload(text: str) -> dict:
+    return {"candidates": [{"content": {"parts": [{"text": text}], "role": "model"}}]}
+
+
+class FakeGemini:
+    # Stands in for generativelanguage.googleapis.com: each request takes the next scripted
+    # Reply. Runs on the test server's event loop thread, so what the tests read is
+    # plain counters and threading events.
+
+    def __init__(self) -> None:
+        self.app = FastAPI()
+        self.app.post("/v1beta/models/{model}:generateContent", response_model=None)(self._generate)
+        self.app.post(
+            "/v1beta/models/{model}:streamGenerateContent", response_model=None
+        )(self._stream)
+        self.script()
+
+    def script(self, *replies: Reply) -> None:
+        self._replies = list(replies)
+        self.requests = 0
+        self.sent = 0
+        self.cancelled = threading.Event()
+
+    def _next(self) -> Reply:
+        self.requests += 1
+        return self._replies.pop(0) if self._replies else Reply(chunks=("ok",))
+
+    async def _generate(self, model: str) -> JSONResponse:
+        reply = self._next()
+        if reply.status != 200:
+            return JSONResponse({"error": {"code": reply.status}}, status_code=reply.status)
+        return JSONResponse(_payload("".join(reply.chunks)))
+
+    async def _stream(self, model: str, alt: str | None = None) -> JSONResponse | StreamingResponse:
+        reply = self._next()
+        if reply.status != 200:
+            return JSONResponse({"error": {"code": reply.status}}, status_code=reply.status)
+        return StreamingResponse(self._events(reply), media_type="text/event-stream")
+
+    async def _events(self, reply: Reply) -> AsyncIterator[str]:
+        try:
+            for n, text in enumerate(reply.chunks):
+                if n == reply.drop_after:
+                    raise DroppedConnection
+                await asyncio.sleep(reply.delay)
+                yield f"data: {json.dumps(_payload(text))}\r\n\r\n"
+                self.sent += 1
+        except (asyncio.CancelledError, GeneratorExit):
+            self.cancelled.set()
+            raise
@@ -0,0 +1,99 @@
+from __future__ import annotations
+
+import os
+import shutil
+import socket
+import subprocess
+import sys
+import tempfile
+import threading
+import time
+from collections.abc import Iterator
+from contextlib import contextmanager
+from pathlib import Path
+
+# Shared by the pytest suite and the benchmark scripts next to it. Settings and the
+# engine are read at import time, so this module has to be imported before anything
+# from the app: it points the app at a throwaway SQLite database and the fake Gemini.
+TMP = Path(tempfile.mkdtemp(prefix="command_centre_tests_"))
+GEMINI_SOCKET = socket.create_server(("127.0.0.1", 0))
+os.environ["DATABASE_URL"] = f"sqlite:///{TMP / 'test.db'}"
+os.environ["TRADING_PRICE_DIR"] = str(TMP / "prices")
+os.environ["FINANCE_SNAPSHOT_INTERVAL_SECONDS"] = "0"
+os.environ["TRADING_SNAPSHOT_INTERVAL_SECONDS"] = "0"
+os.environ["GOOGLE_API_KEY"] = "test-key"
+os.environ["GEMINI_BASE_URL"] = f"http://127.0.0.1:{GEMINI_SOCKET.getsockname()[1]}/v1beta"
+os.environ["GEMINI_BACKOFF_BASE"] = "0.01"
+
+import httpx  # noqa: E402
+import uvicorn  # noqa: E402
+from alembic import command  # noqa: E402
+from alembic.config import Config  # noqa: E402
+
+BACKEND = Path(__file__).resolve().parents[1]
+
+
+def migrate() -> None:
+    config = Config(str(BACKEND / "alembic.ini"))
+    config.set_main_option("script_location", str(BACKEND / "migrations"))
+    command.upgrade(config, "head")
+
+
+def cleanup() -> None:
+    shutil.rmtree(TMP, ignore_errors=True)
+
+
+@contextmanager
+def serve(app, sock: socket.socket | None = None) -> Iterator[str]:
+    # A real server on a background thread: unlike TestClient it streams response
+    # bodies and tells the app when the client goes away.
+    sock = sock or socket.create_server(("127.0.0.1", 0))
+    # uvicorn leaves Nagle on for sockets it is handed; its separate header and body writes
+    # would then wait out the client's delayed ACK (~40 ms) on every reused connection.
+    sock.setsockopt(socket.IPPROTO_TCP, socket.TCP_NODELAY, 1)
+    server = uvicorn.Server(uvicorn.Config(app, log_level="warning"))
+    thread = threading.Thread(target=server.run, kwargs={"sockets": [sock]}, daemon=True)
+    thread.start()
+    deadline = time.monotonic() + 10
+    while not server.started:
+        if not thread.is_alive() or time.monotonic() > deadline:
+            raise RuntimeError("test server did not start")
+        time.sleep(0.01)
+    try:
+        yield "http://{}:{}".format(*sock.getsockname())
+    finally:
+        server.should_exit = True
+        thread.join(10)
+
+
+@contextmanager
+def serve_process(**env: str) -> Iterator[str]:
+    # The app in a uvicorn process of its own, for settings that are fixed at import time
+    # (DATABASE_ASYNC=...). It shares this harness's database.
+    sock = socket.create_server(("127.0.0.1", 0))
+    port = sock.getsockname()[1]
+    sock.close()
+    command = [sys.executable, "-m", "uvicorn", "main:app", "--port", str(port)]
+    process = subprocess.Popen(
+        [*command, "--log-level", "warning", "--timeout-keep-alive", "120"],
+        cwd=BACKEND,
+        env={**os.environ, **env},
+        stdout=subprocess.DEVNULL,
+        stderr=subprocess.DEVNULL,
+    )
+    base_url = f"http://127.0.0.1:{port}"
+    try:
+        deadline = time.monotonic() + 30
+        while True:
+            try:
+                if httpx.get(f"{base_url}/health").status_code == 200:
+                    break
+            except httpx.TransportError:
+                pass
+            if process.poll() is not None or time.monotonic() > deadline:
+                raise RuntimeError("app server did not start")
+            time.sleep(0.1)
+        yield base_url
+    finally:
+        process.terminate()
+        process.wait(10)
@@ -0,0 +1,52 @@
+from __future__ import annotations
+
+import math
+
+import numpy as np
+import pytest
+
+from engines.trading.backtest import Costs, simulate
+
+# 10 bps per unit of turnover, no slippage.
+COSTS = Costs(fee_bps=10, slippage_bps=0)
+
+
+def test_buy_and_hold_pays_only_the_entry() -> None:
+    prices = np.array([[100.0], [110.0], [99.0]])
+    stats, equity = simulate(prices, np.ones((3, 1)), COSTS)
+
+    assert equity == pytest.approx([0.999, 1.0989, 0.98901])
+    assert stats.total_return == pytest.approx(-0.01099)
+    assert stats.max_drawdown == pytest.approx(0.1)
+    assert stats.turnover == pytest.approx(1.0)
+    assert stats.costs == pytest.approx(0.001)
+    assert stats.rebalances == 1
+    assert stats.exposure == pytest.approx(1.0)
+    assert stats.volatility == pytest.approx(math.sqrt(0.02) * math.sqrt(252))
+    assert stats.sharpe == pytest.approx(0.0, abs=1e-9)
+    assert stats.cagr == pytest.approx(0.98901 ** (252 / 2) - 1)
+
+
+def test_rebalancing_back_to_equal_weight_pays_for_the_drift() -> None:
+    # A gains 20%, B is flat: the 50/50 book drifts to 6/11 : 5/11, and trading back
+    # to 50/50 turns over 1/11 of equity.
+    prices = np.array([[100.0, 100.0], [120.0, 100.0]])
+    stats, equity = simulate(prices, np.full((2, 2), 0.5), COSTS)
+
+    assert equity == pytest.approx([0.999, 0.999 * (1.1 * (1 - 0.001 / 11))])
+    assert stats.total_return == pytest.approx(0.999 * 1.0999 - 1)
+    assert stats.turnover == pytest.approx(1 + 1 / 11)
+    assert stats.costs == pytest.approx(0.001 + 0.001 / 11 * 0.999 * 1.1)
+    assert stats.rebalances == 2
+
+
+def test_warm_up_bars_are_held_in_cash() -> None:
+    # NaN weights (e.g. before a moving average has a full window) mean flat.
+    prices = np.array([[100.0], [50.0], [60.0]])
+    weights = np.array([[np.nan], [1.0], [1.0]])
+    stats, equity = simulate(prices, weights, COSTS)
+
+    assert equity == pytest.approx([1.0, 0.999, 0.999 * 1.2])
+    assert stats.max_drawdown == pytest.approx(0.001)
+    assert stats.rebalances == 1
+    assert stats.exposure == pytest.approx(2 / 3)
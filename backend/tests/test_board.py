@@ -0,0 +1,20 @@
+from __future__ import annotations
+
+
+def test_unknown_status_is_rejected(client) -> None:
+    created = client.post("/productivity/tasks", json={"title": "x", "status": "nonsense"})
+    assert created.status_code == 422
+    task = client.post("/productivity/tasks", json={"title": "x"}).json()
+    updated = client.patch(f"/productivity/tasks/{task['id']}", json={"status": "nope"})
+    assert updated.status_code == 422
+    batch = {"items": [{"title": "y", "status": "nonsense"}]}
+    assert client.post("/productivity/tasks:batch", json=batch).status_code == 422
+
+
+def test_board_columns_cover_every_task(client) -> None:
+    for status in ("todo", "in_progress", "done"):
+        client.post("/productivity/tasks", json={"title": f"board {status}", "status": status})
+    board = client.get("/productivity/board").json()
+    totals = sum(column["total"] for column in board["columns"])
+    listed = client.get("/productivity/tasks", params={"limit": 500}).json()
+    assert totals == len(listed)
@@ -0,0 +1,59 @@
+from __future__ import annotations
+
+
+def _drain(client, since: int, limit: int = 500) -> tuple[list[dict], int]:
+    pages = []
+    while True:
+        page = client.get("/productivity/changes", params={"since": since, "limit": limit}).json()
+        pages.append(page)
+        since = page["next_since"]
+        if not page["has_more"]:
+            return pages, since
+
+
+def _cursor(client) -> int:
+    return _drain(client, 0)[1]
+
+
+def test_deletes_come_back_as_tombstones(client) -> None:
+    since = _cursor(client)
+    project = client.post("/productivity/projects", json={"name": "Changes project"}).json()
+    kept = client.post("/productivity/tasks", json={"title": "kept"}).json()
+    dropped = client.post("/productivity/tasks", json={"title": "dropped"}).json()
+    owned = client.post(
+        "/productivity/tasks", json={"title": "owned", "project_id": project["id"]}
+    ).json()
+    client.patch(f"/productivity/tasks/{kept['id']}", json={"title": "kept, renamed"})
+    client.delete(f"/productivity/tasks/{dropped['id']}")
+    client.delete(f"/productivity/projects/{project['id']}")
+
+    (page,), cursor = _drain(client, since)
+    assert [t["title"] for t in page["tasks"]] == ["kept, renamed"]
+    assert page["projects"] == []
+    assert {(d["entity"], d["id"]) for d in page["deleted"]} == {
+        ("task", dropped["id"]),
+        ("task", owned["id"]),
+        ("project", project["id"]),
+    }
+    assert cursor > since
+    assert _drain(client, cursor)[0] == [
+        {"tasks": [], "projects": [], "deleted": [], "next_since": cursor, "has_more": False}
+    ]
+
+
+def test_small_pages_replay_the_same_changes(client) -> None:
+    since = _cursor(client)
+    tasks = [
+        client.post("/productivity/tasks", json={"title": f"paged {n}"}).json() for n in range(3)
+    ]
+    client.delete(f"/productivity/tasks/{tasks[1]['id']}")
+
+    pages, cursor = _drain(client, since, limit=1)
+    assert cursor == _drain(client, since)[1]
+    assert [len(p["tasks"]) + len(p["deleted"]) for p in pages] == [1, 1, 1]
+    assert [p["has_more"] for p in pages] == [True, True, False]
+    changed = [(t["id"], "task") for p in pages for t in p["tasks"]]
+    changed += [(d["id"], "tombstone") for p in pages for d in p["deleted"]]
+    assert sorted(changed) == sorted(
+        [(tasks[0]["id"], "task"), (tasks[2]["id"], "task"), (tasks[1]["id"], "tombstone")]
+    )
@@ -0,0 +1,78 @@
+from __future__ import annotations
+
+import re
+from collections.abc import Iterator
+from contextlib import contextmanager
+
+import pytest
+from sqlalchemy import event
+
+from db.session import engine
+
+_ROW_READ = re.compile(r"\b(?:FROM|JOIN)\s+(tasks|projects)\b", re.IGNORECASE)
+
+
+@contextmanager
+def _selects() -> Iterator[list[str]]:
+    statements: list[str] = []
+
+    def record(conn, cursor, statement, parameters, context, executemany) -> None:
+        if statement.lstrip().upper().startswith("SELECT"):
+            statements.append(statement)
+
+    event.listen(engine, "before_cursor_execute", record)
+    try:
+        yield statements
+    finally:
+        event.remove(engine, "before_cursor_execute", record)
+
+
+def _row_reads(statements: list[str]) -> list[str]:
+    return [s for s in statements if _ROW_READ.search(s)]
+
+
+@pytest.fixture(scope="module")
+def seeded(client) -> dict[str, str]:
+    project = client.post("/productivity/projects", json={"name": "Etag project"}).json()
+    task = client.post(
+        "/productivity/tasks", json={"title": "Etag task", "project_id": project["id"]}
+    ).json()
+    return {"project": project["id"], "task": task["id"]}
+
+
+def _urls(seeded: dict[str, str]) -> list[str]:
+    return [
+        "/productivity/tasks",
+        "/productivity/projects",
+        "/productivity/board",
+        f"/productivity/tasks/{seeded['task']}",
+        f"/productivity/projects/{seeded['project']}",
+        f"/productivity/projects/{seeded['project']}/stats",
+    ]
+
+
+def test_not_modified_reads_no_rows(client, seeded) -> None:
+    for url in _urls(seeded):
+        with _selects() as statements:
+            first = client.get(url)
+        assert first.status_code == 200, url
+        assert _row_reads(statements), url
+
+        with _selects() as statements:
+            again = client.get(url, headers={"If-None-Match": first.headers["ETag"]})
+        assert again.status_code == 304, url
+        assert again.headers["ETag"] == first.headers["ETag"]
+        assert statements, url  # the version lookup itself
+        assert _row_reads(statements) == [], url
+
+
+def test_write_invalidates_etag(client, seeded) -> None:
+    url = "/productivity/tasks"
+    etag = client.get(url).headers["ETag"]
+    client.patch(f"/productivity/tasks/{seeded['task']}", json={"title": "Etag task, renamed"})
+
+    with _selects() as statements:
+        refreshed = client.get(url, headers={"If-None-Match": etag})
+    assert refreshed.status_code == 200
+    assert refreshed.headers["ETag"] != etag
+    assert _row_reads(statements)
@@ -0,0 +1,73 @@
+from __future__ import annotations
+
+import asyncio
+
+import httpx
+import pytest
+
+from core.config import settings
+from engines.ai.client import GeminiClient, GeminiError
+from tests.fake_gemini import FakeGemini, Reply
+
+BODY = {"contents": [{"parts": [{"text": "hi"}]}]}
+
+
+def _collect(chunks: list[str]) -> GeminiClient:
+    async def main() -> GeminiClient:
+        gemini = GeminiClient(settings)
+        try:
+            async for text in gemini.stream_generate(BODY):
+                chunks.append(text)
+        finally:
+            await gemini.aclose()
+        return gemini
+
+    return asyncio.run(main())
+
+
+def test_retries_a_failed_status_before_the_first_chunk(fake_gemini: FakeGemini) -> None:
+    fake_gemini.script(Reply(status=503), Reply(chunks=("Hel", "lo")))
+    chunks: list[str] = []
+    gemini = _collect(chunks)
+    assert chunks == ["Hel", "lo"]
+    assert fake_gemini.requests == 2
+    assert gemini.stats()["retries"] == 1
+
+
+def test_retries_a_dropped_connection_before_the_first_chunk(fake_gemini: FakeGemini) -> None:
+    fake_gemini.script(Reply(chunks=("lost",), drop_after=0), Reply(chunks=("Hello",)))
+    chunks: list[str] = []
+    _collect(chunks)
+    assert chunks == ["Hello"]
+    assert fake_gemini.requests == 2
+
+
+def test_does_not_retry_once_a_chunk_was_relayed(fake_gemini: FakeGemini) -> None:
+    fake_gemini.script(Reply(chunks=("Hel", "lo"), drop_after=1), Reply(chunks=("again",)))
+    chunks: list[str] = []
+    with pytest.raises(httpx.TransportError):
+        _collect(chunks)
+    assert chunks == ["Hel"]
+    assert fake_gemini.requests == 1
+
+
+def test_gives_up_after_max_retries(fake_gemini: FakeGemini) -> None:
+    fake_gemini.script(*[Reply(status=503)] * (settings.gemini_max_retries + 1))
+    with pytest.raises(GeminiError) as error:
+        _collect([])
+    assert error.value.status_code == 503
+    assert fake_gemini.requests == settings.gemini_max_retries + 1
+
+
+def test_client_disconnect_closes_the_upstream_stream(
+    client: httpx.Client, fake_gemini: FakeGemini
+) -> None:
+    chunks = tuple(f"word{n} " for n in range(50))
+    fake_gemini.script(Reply(chunks=chunks, delay=0.05))
+    with client.stream("POST", "/ai/chat/stream", json={"message": "tell me a story"}) as r:
+        assert r.status_code == 200
+        for line in r.iter_lines():
+            if line == "event: delta":
+                break
+    assert fake_gemini.cancelled.wait(5)
+    assert fake_gemini.sent < len(chunks)
@@ -0,0 +1,16 @@
+from __future__ import annotations
+
+import pytest
+
+
+@pytest.mark.parametrize("path", ["/productivity/tasks", "/productivity/projects"])
+@pytest.mark.parametrize(
+    "params", [{"limit": 0}, {"limit": 501}, {"limit": -1}, {"offset": -1}]
+)
+def test_out_of_range_paging_is_rejected(client, path: str, params: dict) -> None:
+    assert client.get(path, params=params).status_code == 422
+
+
+@pytest.mark.parametrize("path", ["/productivity/tasks", "/productivity/projects"])
+def test_largest_page_is_accepted(client, path: str) -> None:
+    assert client.get(path, params={"limit": 500}).status_code == 200
@@ -0,0 +1,87 @@
+from __future__ import annotations
+
+import json
+
+from sqlalchemy import text
+
+from db.session import engine
+
+
+def _check(client, account_id: str) -> dict:
+    return client.get("/finance/rollups/check", params={"account_id": account_id}).json()
+
+
+def _rollups(client, account_id: str) -> dict[tuple[str, str | None], tuple[float, float, int]]:
+    rows = client.get("/finance/rollups", params={"account_id": account_id}).json()
+    return {(r["month"], r["category"]): (r["inflow"], r["outflow"], r["count"]) for r in rows}
+
+
+def _post(client, account_id: str, posted_on: str, amount: str, category: str | None) -> dict:
+    payload = {
+        "account_id": account_id,
+        "posted_on": posted_on,
+        "amount": amount,
+        "category": category,
+    }
+    return client.post("/finance/transactions", json=payload).json()
+
+
+def test_rollups_match_the_ledger_after_every_write(client) -> None:
+    account = client.post(
+        "/finance/accounts",
+        json={"name": "Rollup checking", "opening_balance": "500.00", "opened_on": "2026-01-01"},
+    ).json()["id"]
+    rent = _post(client, account, "2026-01-03", "-1200.00", "rent")
+    food = _post(client, account, "2026-01-10", "-45.50", "food")
+    _post(client, account, "2026-01-20", "-14.50", "food")
+    _post(client, account, "2026-02-01", "3000.00", None)
+    assert _check(client, account)["ok"]
+
+    client.patch(
+        f"/finance/transactions/{food['id']}",
+        json={"posted_on": "2026-02-02", "amount": "-60.00", "category": "dining"},
+    )
+    client.delete(f"/finance/transactions/{rent['id']}")
+    statement = "date,amount,category\n2026-02-15,-20.00,food\n2026-02-16,15.00,food\n"
+    imported = client.post(
+        "/finance/import",
+        params={"account_id": account},
+        files={"file": ("statement.csv", statement, "text/csv")},
+    )
+    assert imported.status_code == 200
+    progress = json.loads(imported.text.splitlines()[-1])
+    assert (progress["done"], progress["inserted"], progress.get("error")) == (True, 2, None)
+
+    check = _check(client, account)
+    assert check == {"ok": True, "groups": 5, "drift": []}
+    assert _rollups(client, account) == {
+        ("2026-01", "opening"): (500.0, 0.0, 1),
+        ("2026-01", "food"): (0.0, -14.5, 1),
+        ("2026-02", None): (3000.0, 0.0, 1),
+        ("2026-02", "dining"): (0.0, -60.0, 1),
+        ("2026-02", "food"): (15.0, -20.0, 2),
+    }
+
+
+def test_check_reports_drift_until_rebuilt(client) -> None:
+    account = client.post(
+        "/finance/accounts",
+        json={"name": "Rollup drift", "opening_balance": "10.00", "opened_on": "2026-03-01"},
+    ).json()["id"]
+    with engine.begin() as conn:
+        conn.execute(
+            text("UPDATE category_rollups SET txn_count = txn_count + 1 WHERE account_id = :a"),
+            {"a": account},
+        )
+
+    check = _check(client, account)
+    assert not check["ok"]
+    [drift] = check["drift"]
+    assert (drift["month"], drift["expected"]["count"], drift["actual"]["count"]) == (
+        "2026-03",
+        1,
+        2,
+    )
+
+    client.post("/finance/rollups/rebuild", params={"account_id": account})
+    assert _check(client, account)["ok"]
@@ -0,0 +1,22 @@
+from __future__ import annotations
+
+import pytest
+
+from engines.productivity.search import service as search_service
+
+
+def test_matches_prefixes_while_typing(client) -> None:
+    task = client.post("/productivity/tasks", json={"title": "Planning the offsite"}).json()
+    for typed in ("plan", "planni", "offsite plan"):
+        hits = client.get("/productivity/search", params={"q": typed}).json()
+        assert task["id"] in [h["id"] for h in hits], typed
+
+
+def test_unsupported_database_is_501(client, monkeypatch: pytest.MonkeyPatch) -> None:
+    def unavailable(*args, **kwargs):
+        raise search_service.SearchUnavailable("full-text search is not available on 'mysql'")
+
+    monkeypatch.setattr(search_service, "search", unavailable)
+    response = client.get("/productivity/search", params={"q": "plan"})
+    assert response.status_code == 501
+    assert response.json()["detail"] == "search_unavailable"
@@ -0,0 +1,40 @@
+from __future__ import annotations
+
+
+def _assert_no_drift(client) -> None:
+    check = client.get("/productivity/stats/check").json()
+    assert check["ok"], check["drift"]
+    assert check["drift"] == []
+
+
+def _by_status(client, project_id: str) -> dict[str, int]:
+    stats = client.get(f"/productivity/projects/{project_id}/stats").json()
+    return {status: n for status, n in stats["by_status"].items() if n}
+
+
+def test_counters_follow_every_write_path(client) -> None:
+    a = client.post("/productivity/projects", json={"name": "Stats A"}).json()["id"]
+    b = client.post("/productivity/projects", json={"name": "Stats B"}).json()["id"]
+
+    one = client.post("/productivity/tasks", json={"title": "one", "project_id": a}).json()
+    batch = {"items": [{"title": f"b{n}", "project_id": a, "status": "done"} for n in range(3)]}
+    created = client.post("/productivity/tasks:batch", json=batch).json()["results"]
+    many = [r["id"] for r in created]
+    _assert_no_drift(client)
+    assert _by_status(client, a) == {"todo": 1, "done": 3}
+
+    client.patch(f"/productivity/tasks/{one['id']}", json={"status": "in_progress"})
+    moves = {"items": [{"id": many[0], "project_id": b}, {"id": many[1], "status": "todo"}]}
+    client.patch("/productivity/tasks:batch", json=moves)
+    _assert_no_drift(client)
+    assert _by_status(client, a) == {"in_progress": 1, "todo": 1, "done": 1}
+    assert _by_status(client, b) == {"done": 1}
+
+    client.delete(f"/productivity/tasks/{one['id']}")
+    client.request("DELETE", "/productivity/tasks:batch", json={"ids": [many[1], "missing"]})
+    _assert_no_drift(client)
+    assert _by_status(client, a) == {"done": 1}
+
+    client.delete(f"/productivity/projects/{b}")
+    _assert_no_drift(client)
+    assert client.get(f"/productivity/tasks/{many[0]}").status_code == 404
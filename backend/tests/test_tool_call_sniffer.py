@@ -0,0 +1,58 @@
+from __future__ import annotations
+
+import pytest
+
+from engines.ai.streaming import ToolCallSniffer
+
+TOOL_REPLIES = [
+    '{"tool": "create_task", "title": "Call Mom", "priority": 1}',
+    '  \n[{"tool": "create_task", "title": "Milk"}, {"tool": "complete_task", "title": "X"}]',
+    '```json\n{"tool": "create_task", "title": "Fenced"}\n```',
+]
+TEXT_REPLIES = [
+    "You have 3 open tasks.",
+    "  \n`code` is not a fence",
+    "``inline`` neither",
+]
+
+
+def _splits(reply: str) -> list[list[str]]:
+    # Every two-chunk split, plus one chunk per character.
+    return [[reply[:n], reply[n:]] for n in range(len(reply) + 1)] + [list(reply)]
+
+
+def _run(chunks: list[str]) -> tuple[list[str], ToolCallSniffer]:
+    sniffer = ToolCallSniffer()
+    return [sniffer.feed(chunk) for chunk in chunks], sniffer
+
+
+@pytest.mark.parametrize("reply", TOOL_REPLIES)
+def test_tool_payload_is_held_back_whatever_the_chunking(reply: str) -> None:
+    for chunks in _splits(reply):
+        relayed, sniffer = _run(chunks)
+        calls, rest = sniffer.finish()
+        assert relayed == [""] * len(chunks), chunks
+        assert calls and rest == "", chunks
+        assert sniffer.mode == "tool"
+
+
+@pytest.mark.parametrize("reply", TEXT_REPLIES)
+def test_text_is_relayed_whole_whatever_the_chunking(reply: str) -> None:
+    for chunks in _splits(reply):
+        relayed, sniffer = _run(chunks)
+        calls, rest = sniffer.finish()
+        assert calls == []
+        assert "".join(relayed) + rest == reply, chunks
+        assert sniffer.mode in ("text", None)
+
+
+def test_text_is_relayed_as_soon_as_it_is_recognised() -> None:
+    relayed, sniffer = _run(["  ", "\n", "Hel", "lo", " there"])
+    assert relayed == ["", "", "  \nHel", "lo", " there"]
+    assert sniffer.finish() == ([], "")
+
+
+def test_malformed_tool_json_falls_back_to_text() -> None:
+    relayed, sniffer = _run(['{"tool": "create_task", ', '"title": '])
+    assert relayed == ["", ""]
+    assert sniffer.finish() == ([], '{"tool": "create_task", "title": ')
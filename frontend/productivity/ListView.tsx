@@ -14,16 +14,27 @@ type Task = {
   updated_at: string | null;
 };
 
+type BoardColumn = {
+  status: string;
+  total: number;
+  tasks: Task[];
+};
+
 export function ListView() {
   const [tasks, setTasks] = useState<Task[]>([]);
+  const [hidden, setHidden] = useState(0);
   const [error, setError] = useState<string | null>(null);
 
+  // The board already holds the highest-priority tasks of every status, which is what
+  // this list shows; the rest are counted, not fetched.
   useEffect(() => {
     let cancelled = false;
     api
-      .get<Task[]>("/productivity/tasks")
+      .get<{ columns: BoardColumn[] }>("/productivity/board")
       .then((d) => {
-        if (!cancelled) setTasks(d);
+        if (cancelled) return;
+        setTasks(d.columns.flatMap((c) => c.tasks));
+        setHidden(d.columns.reduce((n, c) => n + c.total - c.tasks.length, 0));
       })
       .catch((e: unknown) => {
         if (!cancelled) setError(e instanceof Error ? e.message : "tasks_fetch_failed");
@@ -34,7 +45,10 @@ export function ListView() {
   }, []);
 
   const ordered = useMemo(() => {
-    return [...tasks].sort((a, b) => (b.priority ?? 0) - (a.priority ?? 0));
+    return [...tasks].sort(
+      (a, b) =>
+        (b.priority ?? 0) - (a.priority ?? 0) || (b.updated_at ?? "").localeCompare(a.updated_at ?? "")
+    );
   }, [tasks]);
 
   // New function to handle deletion
@@ -58,7 +72,7 @@ export function ListView() {
     <div className="rounded-xl border border-zinc-800 bg-zinc-950/40 p-4">
       <div className="flex items-center justify-between">
         <div className="text-sm font-medium text-zinc-200">Tasks — List</div>
-        <div className="text-xs text-zinc-500">/productivity/tasks</div>
+        <div className="text-xs text-zinc-500">/productivity/board</div>
       </div>
 
       {error ? <div className="mt-3 text-sm text-red-400">{error}</div> : null}
@@ -92,6 +106,7 @@ export function ListView() {
             </div>
           ))
         )}
+        {hidden > 0 ? <div className="text-[11px] text-zinc-600">+{hidden} more</div> : null}
       </div>
     </div>
   );
@@ -23,6 +23,8 @@ export function TimelineView() {
   const [tasks, setTasks] = useState<Task[]>([]);
   const [error, setError] = useState<string | null>(null);
 
+  // Most recently updated first is /productivity/tasks' own order; the board orders by
+  // priority, so it would not hold the latest changes.
   useEffect(() => {
     let cancelled = false;
     api
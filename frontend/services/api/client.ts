@@ -40,8 +40,59 @@ export class ApiClient {
     return this.request<T>(path, { ...init, method: "DELETE" });
   }
 
+  // POSTs `body` and calls `onEvent` for each Server-Sent Event as it arrives.
+  // Resolves when the stream ends; abort `init.signal` to cancel it.
+  async stream(
+    path: string,
+    body: any,
+    onEvent: (event: string, data: any) => void,
+    init?: RequestInit
+  ): Promise<void> {
+    const response = await fetch(this.url(path), {
+      ...init,
+      method: "POST",
+      body: JSON.stringify(body),
+      headers: {
+        "Content-Type": "application/json",
+        Accept: "text/event-stream",
+        ...this.headers,
+        ...init?.headers,
+      },
+    });
+
+    if (!response.ok || !response.body) {
+      const errorBody = await response.text();
+      throw new Error(errorBody || response.statusText);
+    }
+
+    const reader = response.body.getReader();
+    const decoder = new TextDecoder();
+    let buffer = "";
+    while (true) {
+      const { done, value } = await reader.read();
+      if (done) break;
+      buffer += decoder.decode(value, { stream: true });
+      let boundary: number;
+      while ((boundary = buffer.indexOf("\n\n")) !== -1) {
+        const frame = buffer.slice(0, boundary);
+        buffer = buffer.slice(boundary + 2);
+        let event = "message";
+        const data: string[] = [];
+        for (const line of frame.split("\n")) {
+          if (line.startsWith("event:")) event = line.slice(6).trim();
+          else if (line.startsWith("data:")) data.push(line.slice(5).trimStart());
+        }
+        if (data.length) onEvent(event, JSON.parse(data.join("\n")));
+      }
+    }
+  }
+
+  private url(path: string): string {
+    return `${this.baseUrl}${path.startsWith("/") ? "" : "/"}${path}`;
+  }
+
   private async request<T>(path: string, init: RequestInit): Promise<T> {
-    const url = `${this.baseUrl}${path.startsWith("/") ? "" : "/"}${path}`;
+    const url = this.url(path);
     
     const headers = {
       "Content-Type": "application/json",
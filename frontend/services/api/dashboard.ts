@@ -0,0 +1,68 @@
+import { api } from "@/services/api/client";
+
+export type FinanceSummary = {
+  cash: { currency: string; amount: number };
+  net_worth: { currency: string; amount: number };
+  updated_at: string | null;
+};
+
+export type Position = {
+  symbol: string;
+  qty: number;
+  avg_price: number;
+  last_price: number;
+  market_value: number;
+};
+
+export type Positions = {
+  total_value: number;
+  unrealized_pnl: number;
+  realized_pnl: number;
+  positions: Position[];
+};
+
+export type ProductivitySummary = {
+  tasks: Record<string, number>; // per status
+  total_tasks: number;
+  projects: number;
+};
+
+export type AIStatus = {
+  assistant: string;
+  model: string;
+  capabilities: string[];
+  tools: string[];
+};
+
+// A section that failed or timed out on the server is null and listed in `errors`.
+export type Dashboard = {
+  finance: FinanceSummary | null;
+  trading: Positions | null;
+  productivity: ProductivitySummary | null;
+  ai: AIStatus | null;
+  errors: Record<string, string>;
+  timings_ms: Record<string, number>;
+};
+
+let pending: Promise<Dashboard> | null = null;
+
+// Widgets mounting together share one /dashboard round trip instead of one request each.
+export function loadDashboard(): Promise<Dashboard> {
+  if (!pending) {
+    pending = api.get<Dashboard>("/dashboard").finally(() => {
+      pending = null;
+    });
+  }
+  return pending;
+}
+
+// One section of the dashboard, or its own endpoint when that section came back empty.
+export async function dashboardSection<K extends keyof Dashboard>(
+  key: K,
+  fallbackPath: string
+): Promise<NonNullable<Dashboard[K]>> {
+  const dashboard = await loadDashboard().catch(() => null);
+  const section = dashboard?.[key];
+  if (section) return section as NonNullable<Dashboard[K]>;
+  return api.get<NonNullable<Dashboard[K]>>(fallbackPath);
+}
@@ -2,6 +2,7 @@
 
 import { useEffect, useRef, useState } from "react";
 import { api } from "@/services/api/client";
+import { dashboardSection } from "@/services/api/dashboard";
 
 type Message = {
   role: "user" | "assistant";
@@ -13,7 +14,25 @@ export function AIWidget() {
   const [input, setInput] = useState("");
   const [loading, setLoading] = useState(false);
   const [isListening, setIsListening] = useState(false);
+  const [model, setModel] = useState<string | null>(null);
   const scrollRef = useRef<HTMLDivElement>(null);
+  const abortRef = useRef<AbortController | null>(null);
+
+  // Model name from the /dashboard payload (or /ai/status if that section failed)
+  useEffect(() => {
+    let cancelled = false;
+    dashboardSection("ai", "/ai/status")
+      .then((status) => {
+        if (!cancelled) setModel(status.model);
+      })
+      .catch(() => {});
+    return () => {
+      cancelled = true;
+    };
+  }, []);
+
+  // Cancel an in-flight stream when the widget unmounts
+  useEffect(() => () => abortRef.current?.abort(), []);
 
   // Auto-scroll to bottom of chat
   useEffect(() => {
@@ -31,11 +50,36 @@ export function AIWidget() {
     setMessages((prev) => [...prev, { role: "user", text: userMsg }]);
     setLoading(true);
 
+    // Stream the reply: tokens render as they arrive, tool results replace it at the end
+    const controller = new AbortController();
+    abortRef.current = controller;
+    let started = false;
+    const setReply = (update: (text: string) => string) => {
+      const first = !started;
+      started = true;
+      if (first) setLoading(false);
+      setMessages((prev) => {
+        if (first) return [...prev, { role: "assistant", text: update("") }];
+        const last = prev[prev.length - 1];
+        return [...prev.slice(0, -1), { ...last, text: update(last.text) }];
+      });
+    };
+
     try {
-      const res = await api.post<{ response: string }>("/ai/chat", { message: userMsg });
-      setMessages((prev) => [...prev, { role: "assistant", text: res.response }]);
+      await api.stream(
+        "/ai/chat/stream",
+        { message: userMsg },
+        (event, data) => {
+          if (event === "delta") setReply((text) => text + data.text);
+          else if (event === "done") setReply(() => data.response);
+          else if (event === "error") setReply(() => data.message);
+        },
+        { signal: controller.signal }
+      );
     } catch (err) {
-      setMessages((prev) => [...prev, { role: "assistant", text: "Error: Could not reach AI." }]);
+      if (!controller.signal.aborted) {
+        setReply(() => "Error: Could not reach AI.");
+      }
     } finally {
       setLoading(false);
     }
@@ -87,7 +131,7 @@ export function AIWidget() {
             {isListening ? "Listening..." : "Gemini Assistant"}
           </div>
         </div>
-        <div className="text-xs text-zinc-500">gemini-flash</div>
+        <div className="text-xs text-zinc-500">{model ?? "gemini"}</div>
       </div>
 
       {/* Chat History */}
@@ -2,13 +2,7 @@
 
 import { useEffect, useState } from "react";
 
-import { api } from "@/services/api/client";
-
-type FinanceSummary = {
-  cash: { currency: string; amount: number };
-  net_worth: { currency: string; amount: number };
-  updated_at: string | null;
-};
+import { dashboardSection, type FinanceSummary } from "@/services/api/dashboard";
 
 export function FinanceWidget() {
   const [data, setData] = useState<FinanceSummary | null>(null);
@@ -16,8 +10,7 @@ export function FinanceWidget() {
 
   useEffect(() => {
     let cancelled = false;
-    api
-      .get<FinanceSummary>("/finance/summary")
+    dashboardSection("finance", "/finance/summary")
       .then((d) => {
         if (!cancelled) setData(d);
       })
@@ -1,7 +1,8 @@
 "use client";
 
-import { useMemo, useState } from "react";
+import { useEffect, useMemo, useState } from "react";
 import { api } from "@/services/api/client";
+import { dashboardSection, type ProductivitySummary } from "@/services/api/dashboard";
 
 import { KanbanView } from "@/productivity/KanbanView";
 import { ListView } from "@/productivity/ListView";
@@ -14,12 +15,31 @@ export function ProductivityWidget() {
   
   // This key is our "Refresher". When we change it, the views reload their data!
   const [refreshKey, setRefreshKey] = useState(0);
+  const [summary, setSummary] = useState<ProductivitySummary | null>(null);
 
   // States for the "Create New Task" popup
   const [isModalOpen, setIsModalOpen] = useState(false);
   const [newTaskTitle, setNewTaskTitle] = useState("");
   const [isSaving, setIsSaving] = useState(false);
 
+  // Counts come with the first-paint /dashboard payload; after a change they are
+  // refetched on their own, since that shared payload is stale by then.
+  useEffect(() => {
+    let cancelled = false;
+    const load =
+      refreshKey === 0
+        ? dashboardSection("productivity", "/productivity/summary")
+        : api.get<ProductivitySummary>("/productivity/summary");
+    load
+      .then((data) => {
+        if (!cancelled) setSummary(data);
+      })
+      .catch(() => {});
+    return () => {
+      cancelled = true;
+    };
+  }, [refreshKey]);
+
   // Function to create the task
   async function handleCreateTask(e: React.FormEvent) {
     e.preventDefault(); // Stop page from refreshing
@@ -67,6 +87,11 @@ export function ProductivityWidget() {
         <div className="flex flex-wrap items-center justify-between gap-3">
           <div className="flex items-center gap-3">
             <div className="text-sm font-medium text-zinc-200">Productivity</div>
+            {summary ? (
+              <div className="text-xs text-zinc-500">
+                {summary.total_tasks - (summary.tasks.done ?? 0)} open · {summary.projects} projects
+              </div>
+            ) : null}
             
             {/* The New "Create Task" Button */}
             <button
@@ -3,49 +3,62 @@
 import { useEffect, useState } from "react";
 import { Area, AreaChart, ResponsiveContainer, Tooltip, YAxis } from "recharts";
 import { api } from "@/services/api/client";
-
-type Position = {
-  symbol: string;
-  qty: number;
-  avg_price: number;
-};
+import { dashboardSection, type Position } from "@/services/api/dashboard";
 
 type DataPoint = {
-  time: string;
+  time: number;
   value: number;
 };
 
+type Bars = {
+  symbol: string;
+  interval: string;
+  t: number[];
+  open: number[];
+  high: number[];
+  low: number[];
+  close: number[];
+  volume: number[];
+};
+
+const CHART_SYMBOL = "SPY";
+const CHART_INTERVAL = "5m";
+const CHART_REFRESH_MS = 60_000;
+
 export function TradingWidget() {
   const [positions, setPositions] = useState<Position[]>([]);
   const [chartData, setChartData] = useState<DataPoint[]>([]);
 
   // 1. Fetch the real positions from your Python Backend
   useEffect(() => {
-    api.get<{ positions: Position[] }>("/trading/positions").then((data) => {
+    dashboardSection("trading", "/trading/positions").then((data) => {
       setPositions(data.positions);
     });
   }, []);
 
-  // 2. Simulate a "Live Market" chart
-  // (In a real app, this would come from a database history)
+  // 2. Price history from the backend's bar store (close of each 5-minute bar),
+  // refreshed once a minute.
   useEffect(() => {
-    // Generate 20 fake data points that look like a stock chart
-    const initialData = Array.from({ length: 20 }).map((_, i) => ({
-      time: i.toString(),
-      value: 15000 + Math.random() * 500 - 250, // Fluctuate around $15k
-    }));
-    setChartData(initialData);
-
-    // Every 2 seconds, add a new point to make it move
-    const interval = setInterval(() => {
-      setChartData((current) => {
-        const lastValue = current[current.length - 1].value;
-        const newValue = lastValue + (Math.random() * 200 - 100); // Random move up/down
-        return [...current.slice(1), { time: Date.now().toString(), value: newValue }];
-      });
-    }, 2000);
-
-    return () => clearInterval(interval);
+    let cancelled = false;
+    const load = () => {
+      const params = new URLSearchParams({ symbol: CHART_SYMBOL, interval: CHART_INTERVAL });
+      api
+        .get<Bars>(`/trading/bars?${params}`)
+        .then((bars) => {
+          if (!cancelled) {
+            setChartData(bars.t.map((time, i) => ({ time, value: bars.close[i] })));
+          }
+        })
+        .catch(() => {
+          // Keep the last chart on a failed refresh.
+        });
+    };
+    load();
+    const interval = setInterval(load, CHART_REFRESH_MS);
+    return () => {
+      cancelled = true;
+      clearInterval(interval);
+    };
   }, []);
 
   return (